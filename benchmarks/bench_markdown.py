@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""HTML to Markdown converter benchmark"""
+
+import argparse
+import difflib
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scrapion.web_access import CONVERTERS, html_to_markdown  # noqa: E402
+
+
+DEFAULT_CORPUS = Path(__file__).resolve().parent / "corpus"
+
+_SECTION = """
+<div class="section" id="s{n}">
+  <h2>Section {n}: <a href="#s{n}">anchor</a></h2>
+  <p>Lorem ipsum <b>dolor</b> sit amet, <a href="https://example.com/{n}" title="Example">consectetur</a>
+  adipiscing elit, sed do <em>eiusmod</em> tempor incididunt ut labore et dolore magna_aliqua.
+  Ut enim ad minim veniam, quis <code>nostrud_exercitation()</code> ullamco laboris.</p>
+  <ul>
+    <li>First item with <i>emphasis</i></li>
+    <li>Second item
+      <ul><li>Nested one</li><li>Nested two</li></ul>
+    </li>
+  </ul>
+  <ol start="3"><li>three</li><li>four</li></ol>
+  <table>
+    <thead><tr><th>Name</th><th>Value</th><th>Notes</th></tr></thead>
+    <tbody>
+      <tr><td>alpha</td><td>{n}</td><td>first <b>row</b></td></tr>
+      <tr><td>beta</td><td>{m}</td><td>second row</td></tr>
+    </tbody>
+  </table>
+  <pre><code>def handler_{n}(request):
+    return render(request, "page.html", {{"n": {n}}})
+</code></pre>
+  <blockquote><p>Quoted text number {n}.</p></blockquote>
+  <img src="/img/{n}.png" alt="figure {n}"><br>
+  <script>window.dataLayer = window.dataLayer || []; dataLayer.push({{n: {n}}});</script>
+</div>
+"""
+
+
+def synthetic_page(size: int) -> str:
+    """
+    Build an HTML page of roughly `size` bytes from repeated sections
+
+    Args:
+        size: Target size in bytes
+
+    Returns:
+        HTML document
+    """
+    parts = ["<!DOCTYPE html><html><head><title>Synthetic page</title>"
+             "<style>body { font-family: sans-serif; }</style></head><body><main>"]
+    total = len(parts[0])
+    n = 0
+    while total < size:
+        section = _SECTION.format(n=n, m=n * 7)
+        parts.append(section)
+        total += len(section)
+        n += 1
+    parts.append("</main></body></html>")
+    return "".join(parts)
+
+
+def _normalize(markdown: str) -> list[str]:
+    """
+    Text lines of Markdown for output comparison
+
+    Blank lines are dropped and runs of whitespace collapsed: markdownify
+    keeps one newline per whitespace-only text node and trailing spaces,
+    so converters producing the same text differ in those bytes.
+    """
+    return [" ".join(line.split()) for line in markdown.splitlines() if line.strip()]
+
+
+def measure(html: str, converter: str, repeat: int) -> dict:
+    """
+    Time and memory profile of one conversion
+
+    Args:
+        html: Input document
+        converter: Converter name
+        repeat: Timed runs; the fastest is reported
+
+    Returns:
+        Dictionary with seconds, MB/s, peak traced memory and the output
+    """
+    size = len(html.encode("utf-8"))
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        markdown = html_to_markdown(html, converter)
+        best = min(best, time.perf_counter() - start)
+
+    # Separate run so tracing overhead does not skew the timing
+    tracemalloc.start()
+    html_to_markdown(html, converter)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "seconds": round(best, 4),
+        "mb_per_second": round(size / 1e6 / best, 2) if best else None,
+        "peak_memory_bytes": peak,
+        "output_bytes": len(markdown.encode("utf-8")),
+        "_markdown": markdown,
+    }
+
+
+def run_case(name: str, html: str, converters: list[str], repeat: int) -> dict:
+    """
+    Benchmark all converters on one document
+
+    With several converters the case also compares their normalized text
+    (see _normalize): "normalized_match" tells if it is identical and
+    "normalized_similarity" gives the share of matching lines (1.0 =
+    identical) of each converter against the first.
+    """
+    size = len(html.encode("utf-8"))
+    case = {"name": name, "input_bytes": size, "converters": {}}
+    outputs = {}
+    for converter in converters:
+        result = measure(html, converter, repeat)
+        outputs[converter] = _normalize(result.pop("_markdown"))
+        result["normalized_bytes"] = len("\n".join(outputs[converter]).encode("utf-8"))
+        case["converters"][converter] = result
+        print(
+            f"{name:<40} {converter:<12} {size / 1e6:8.2f} MB "
+            f"{result['seconds']:9.4f} s {result['peak_memory_bytes'] / 1e6:9.1f} MB peak",
+            file=sys.stderr,
+        )
+
+    if len(outputs) > 1:
+        first, *others = converters
+        case["normalized_match"] = all(outputs[other] == outputs[first] for other in others)
+        case["normalized_similarity"] = {
+            other: round(difflib.SequenceMatcher(None, outputs[first], outputs[other], autojunk=False).ratio(), 3)
+            for other in others
+        }
+    return case
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare HTML to Markdown converters")
+    parser.add_argument(
+        "--corpus",
+        default=str(DEFAULT_CORPUS),
+        help="Directory of saved .html pages (default: benchmarks/corpus)",
+    )
+    parser.add_argument(
+        "--sizes",
+        default="1,4",
+        help="Comma-separated synthetic page sizes in MB; empty to skip (default: 1,4)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case (default: 3)")
+    parser.add_argument(
+        "--converters",
+        default=",".join(CONVERTERS),
+        help=f"Comma-separated converters (default: {','.join(CONVERTERS)})",
+    )
+    parser.add_argument("--output", help="Write JSON results here instead of stdout")
+    args = parser.parse_args()
+
+    converters = [c for c in args.converters.split(",") if c]
+    cases = []
+
+    corpus = Path(args.corpus)
+    if corpus.is_dir():
+        for path in sorted(corpus.rglob("*.htm*")):
+            html = path.read_text(encoding="utf-8", errors="replace")
+            cases.append(run_case(str(path.relative_to(corpus)), html, converters, args.repeat))
+
+    for size in [float(s) for s in args.sizes.split(",") if s]:
+        html = synthetic_page(int(size * 1024 * 1024))
+        cases.append(run_case(f"synthetic-{size:g}MB", html, converters, args.repeat))
+
+    results = {
+        "python": sys.version.split()[0],
+        "repeat": args.repeat,
+        "cases": cases,
+    }
+    text = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
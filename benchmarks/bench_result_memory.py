@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""ScrapeResult memory benchmark"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scrapion.markdown_converter import html_to_markdown  # noqa: E402
+from scrapion.report_generator import ScrapeResult  # noqa: E402
+
+
+DEFAULT_CORPUS = Path(__file__).resolve().parent / "corpus"
+
+
+class PlainResult:
+    """The previous ScrapeResult layout: __dict__, str content, ISO timestamp"""
+
+    def __init__(self, url, status, accessible, content=None, source="unknown", tier=None,
+                 blocked_requests=None, cache=None, original_size=None, extracted_size=None):
+        self.url = url
+        self.status = status
+        self.accessible = accessible
+        self.content = content
+        self.source = source
+        self.tier = tier
+        self.blocked_requests = blocked_requests
+        self.cache = cache
+        self.original_size = original_size
+        self.extracted_size = extracted_size
+        self.timestamp = datetime.utcnow().isoformat()
+
+
+def sample_markdown(corpus: Path) -> str:
+    """Markdown of the corpus pages, used as realistic page content"""
+    pages = sorted(corpus.rglob("*.htm*")) if corpus.is_dir() else []
+    text = "\n\n".join(html_to_markdown(p.read_text(encoding="utf-8", errors="replace")) for p in pages)
+    return text or "Lorem ipsum dolor sit amet, consectetur adipiscing elit.\n" * 40
+
+
+def content_of(words: list[str], size: int, n: int) -> str:
+    """
+    Unique content of about `size` characters for result number `n`
+
+    Words from the sample are drawn at random, so the text compresses
+    about as well as real Markdown rather than like a repeated block.
+    """
+    if size == 0:
+        return None
+    rng = random.Random(n)
+    lines = []
+    total = 0
+    while total < size:
+        line = " ".join(rng.choices(words, k=12))
+        lines.append(line)
+        total += len(line) + 1
+    return "\n".join(lines)[:size]
+
+
+def measure(cls, words: list[str], size: int, count: int) -> dict:
+    """
+    Memory held by `count` results of class `cls` with `size`-character content
+
+    Each content string is created just before its result and only
+    referenced by it, as when results are built from scraped pages.
+    """
+    gc.collect()
+    tracemalloc.start()
+    build = 0.0
+    results = []
+    for n in range(count):
+        content = content_of(words, size, n)
+        start = time.perf_counter()
+        results.append(cls(
+            url=f"https://example.com/page/{n}",
+            status="success",
+            accessible=True,
+            content=content,
+            source="main_list",
+            tier="http",
+            cache="miss",
+        ))
+        build += time.perf_counter() - start
+        del content
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for result in results:
+        result.content
+    access = time.perf_counter() - start
+
+    case = {
+        "bytes_per_result": round(current / count),
+        "peak_bytes": peak,
+        "construct_us": round(build / count * 1e6, 1),
+        "content_access_us": round(access / count * 1e6, 1),
+    }
+    if cls is ScrapeResult:
+        case["storage"] = results[0].content_storage
+    del results
+    return case
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure per-result memory of ScrapeResult")
+    parser.add_argument(
+        "--corpus",
+        default=str(DEFAULT_CORPUS),
+        help="Directory of saved .html pages used as content (default: benchmarks/corpus)",
+    )
+    parser.add_argument(
+        "--sizes",
+        default="0,2000,20000,200000,2000000",
+        help="Comma-separated content sizes in characters (default: 0,2000,20000,200000,2000000)",
+    )
+    parser.add_argument(
+        "--budget",
+        type=int,
+        default=32 * 1024 * 1024,
+        help="Approximate content characters generated per case (default: 32M)",
+    )
+    parser.add_argument("--output", help="Write JSON results here instead of stdout")
+    args = parser.parse_args()
+
+    words = sample_markdown(Path(args.corpus)).split()
+    store = ScrapeResult.content_store
+    cases = []
+    for size in [int(s) for s in args.sizes.split(",") if s]:
+        count = max(10, min(10000, args.budget // max(size, 1)))
+        case = {
+            "content_chars": size,
+            "results": count,
+            "plain": measure(PlainResult, words, size, count),
+            "compact": measure(ScrapeResult, words, size, count),
+        }
+        plain, compact = case["plain"]["bytes_per_result"], case["compact"]["bytes_per_result"]
+        case["ratio"] = round(plain / compact, 2) if compact else None
+        cases.append(case)
+        print(
+            f"{size:>9} chars x {count:<6} plain {plain:>10} B  compact {compact:>9} B  "
+            f"({case['compact']['storage']}, {case['ratio']}x)",
+            file=sys.stderr,
+        )
+
+    results = {
+        "python": sys.version.split()[0],
+        "compress_threshold": store.compress_threshold,
+        "spill_threshold": store.spill_threshold,
+        "spilled_bytes": store.spilled_bytes,
+        "cases": cases,
+    }
+    text = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""Offline end-to-end benchmark suite"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fixture_site import RECORDED_RESULTS, FixtureSite, page_html  # noqa: E402
+from scrapion.orchestrator import Client  # noqa: E402
+from scrapion.scheduler import FetchScheduler  # noqa: E402
+from scrapion.search_engine import DuckDuckGoHtmlBackend, extract_results  # noqa: E402
+from scrapion.web_access import CONVERTERS, DEFAULT_CONVERTER, convert_page, sync_run  # noqa: E402
+
+
+DEFAULT_CORPUS = Path(__file__).resolve().parent / "corpus"
+CASES = ("conversion", "extract_results", "sync_run", "client_url", "client_query")
+
+
+class RecordedPage:
+    """Stands in for a Playwright page that has a results page loaded"""
+
+    def __init__(self, html: str):
+        self.html = html
+
+    async def content(self) -> str:
+        return self.html
+
+
+def percentile(values: list[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of sorted `values` (q in 0..100)"""
+    if not values:
+        return None
+    rank = max(1, min(len(values), int(round(q / 100 * len(values) + 0.5))))
+    return values[rank - 1]
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 3) if seconds is not None else None
+
+
+def summarize(name: str, latencies: list[float], errors: int, elapsed: float, **extra) -> dict:
+    """Latency percentiles (milliseconds) and throughput of one case"""
+    ordered = sorted(latencies)
+    case = {
+        "name": name,
+        "iterations": len(latencies) + errors,
+        "errors": errors,
+        "seconds": round(elapsed, 4),
+        "throughput_per_second": round(len(latencies) / elapsed, 2) if elapsed and latencies else None,
+        "latency_ms": {
+            "min": _ms(ordered[0] if ordered else None),
+            "p50": _ms(percentile(ordered, 50)),
+            "p95": _ms(percentile(ordered, 95)),
+            "p99": _ms(percentile(ordered, 99)),
+            "max": _ms(ordered[-1] if ordered else None),
+            "mean": _ms(sum(ordered) / len(ordered) if ordered else None),
+        },
+        **extra,
+    }
+    print(
+        f"{name:<40} {case['iterations']:>5} runs  p50 {case['latency_ms']['p50']} ms  "
+        f"p95 {case['latency_ms']['p95']} ms  {case['throughput_per_second']}/s  errors {errors}",
+        file=sys.stderr,
+    )
+    return case
+
+
+def timed(name: str, fn: Callable[[], object], iterations: int, warmup: int = 1, **extra) -> dict:
+    """
+    Run `fn` `iterations` times and summarize its latency
+
+    Exceptions count as errors and are not timed. Scrapion's progress
+    output is discarded while the case runs.
+    """
+    latencies = []
+    errors = 0
+    last_error = None
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(warmup):
+            with contextlib.suppress(Exception):
+                fn()
+        started = time.perf_counter()
+        for _ in range(iterations):
+            start = time.perf_counter()
+            try:
+                fn()
+            except Exception as e:
+                errors += 1
+                last_error = f"{e.__class__.__name__}: {e}"
+                continue
+            latencies.append(time.perf_counter() - start)
+        elapsed = time.perf_counter() - started
+    if last_error:
+        extra["last_error"] = last_error
+    return summarize(name, latencies, errors, elapsed, **extra)
+
+
+def bench_conversion(args, site: FixtureSite) -> list[dict]:
+    """convert_page() on the corpus and a fixture page, per converter"""
+    documents = {}
+    corpus = Path(args.corpus)
+    if corpus.is_dir():
+        for path in sorted(corpus.rglob("*.htm*")):
+            documents[str(path.relative_to(corpus))] = path.read_text(encoding="utf-8", errors="replace")
+    documents[f"fixture-{args.page_size}B"] = page_html(0, args.page_size, js=False)
+
+    cases = []
+    for converter in args.converters:
+        for extract_main in (True, False):
+            for name, html in documents.items():
+                label = f"conversion/{converter}{'+main' if extract_main else ''}/{name}"
+                case = timed(
+                    label,
+                    lambda: convert_page(html, converter, extract_main),
+                    args.iterations,
+                    input_bytes=len(html),
+                )
+                converted = case["iterations"] - case["errors"]
+                if case["seconds"]:
+                    case["mb_per_second"] = round(len(html) * converted / 1e6 / case["seconds"], 2)
+                cases.append(case)
+    return cases
+
+
+def bench_extract_results(args, site: FixtureSite) -> list[dict]:
+    """extract_results() on the recorded DuckDuckGo results page"""
+    page = RecordedPage(RECORDED_RESULTS.read_text(encoding="utf-8"))
+    loop = asyncio.new_event_loop()
+    try:
+        return [timed(
+            "extract_results/recorded",
+            lambda: loop.run_until_complete(extract_results(page, 1)),
+            args.iterations,
+            input_bytes=len(page.html),
+        )]
+    finally:
+        loop.close()
+
+
+def bench_sync_run(args, site: FixtureSite) -> list[dict]:
+    """web_access.sync_run() against fixture pages (a new event loop per call)"""
+    cases = [timed(
+        "sync_run/http",
+        lambda: sync_run(site.url(0), tier="auto"),
+        args.iterations,
+    )]
+    if args.browser:
+        cases.append(timed(
+            "sync_run/js",
+            lambda: sync_run(site.url(0, js=True), tier="auto"),
+            args.iterations,
+        ))
+    return cases
+
+
+def _client(args, **kwargs) -> Client:
+    # Every fixture page is on one host; pace it only when asked to
+    scheduler = FetchScheduler(rate=args.host_rate, per_host_concurrency=max(args.concurrency, 1))
+    return Client(skip_browser_check=True, converter=args.converters[0], scheduler=scheduler, **kwargs)
+
+
+def bench_client_url(args, site: FixtureSite) -> list[dict]:
+    """Client.run() in single-URL mode with one warm client"""
+    cases = []
+    variants = [("http", {})]
+    if args.browser:
+        variants.append(("js", {"js": True}))
+    for label, params in variants:
+        with _client(args) as client:
+            pages = iter(range(10 ** 9))
+            cases.append(timed(
+                f"client_url/{label}",
+                lambda: _expect_success(client.run(site.url(next(pages) % 50, **params))),
+                args.iterations,
+            ))
+    return cases
+
+
+def bench_client_query(args, site: FixtureSite) -> list[dict]:
+    """Client.run() in query mode: recorded results page, then fixture pages"""
+    cases = []
+    for concurrency in sorted({1, args.concurrency}):
+        backend = DuckDuckGoHtmlBackend(endpoint=site.search_endpoint, name="fixture")
+        with _client(args, search_backends=[backend], concurrency=concurrency) as client:
+            cases.append(timed(
+                f"client_query/concurrency-{concurrency}",
+                lambda: _expect_success(client.run("python asyncio")),
+                args.iterations,
+            ))
+    return cases
+
+
+def _expect_success(report) -> None:
+    if not report.successful_scrapes:
+        raise RuntimeError(f"no successful scrape for {report.query}")
+
+
+BENCHMARKS = {
+    "conversion": bench_conversion,
+    "extract_results": bench_extract_results,
+    "sync_run": bench_sync_run,
+    "client_url": bench_client_url,
+    "client_query": bench_client_query,
+}
+
+
+def git_revision() -> Optional[str]:
+    """Commit of the working tree, if it is a git checkout"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline_path: str) -> None:
+    """Print p50 and throughput changes against an earlier results file"""
+    baseline = {case["name"]: case for case in json.loads(Path(baseline_path).read_text())["cases"]}
+    print(f"\nCompared with {baseline_path}:", file=sys.stderr)
+    for case in results["cases"]:
+        before = baseline.get(case["name"])
+        if before is None or not before["latency_ms"]["p50"] or not case["latency_ms"]["p50"]:
+            continue
+        ratio = case["latency_ms"]["p50"] / before["latency_ms"]["p50"]
+        print(f"{case['name']:<40} p50 {before['latency_ms']['p50']} -> {case['latency_ms']['p50']} ms "
+              f"({ratio:.2f}x)", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scrapion offline against a local fixture site")
+    parser.add_argument(
+        "--cases",
+        default=",".join(CASES),
+        help=f"Comma-separated cases (default: {','.join(CASES)})",
+    )
+    parser.add_argument("--iterations", type=int, default=20, help="Timed runs per case (default: 20)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Fixture response delay in seconds (default: 0)")
+    parser.add_argument("--page-size", type=int, default=20000, help="Fixture article bytes (default: 20000)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Client concurrency in query mode (default: 4)")
+    parser.add_argument(
+        "--host-rate",
+        type=float,
+        default=0.0,
+        help="Client requests per second to the fixture host; 0 for no limit (default: 0)",
+    )
+    parser.add_argument(
+        "--converters",
+        default=DEFAULT_CONVERTER,
+        help=f"Comma-separated converters; the first is used by the clients (default: {DEFAULT_CONVERTER})",
+    )
+    parser.add_argument(
+        "--browser",
+        action="store_true",
+        help="Add JavaScript-rendered page cases (needs Playwright Firefox)",
+    )
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS), help="Saved .html pages for conversion")
+    parser.add_argument("--baseline", help="Earlier JSON results to compare against")
+    parser.add_argument("--output", help="Write JSON results here instead of stdout")
+    args = parser.parse_args()
+
+    cases = [c for c in args.cases.split(",") if c]
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(sorted(unknown))}")
+    args.converters = [c for c in args.converters.split(",") if c]
+    unknown = set(args.converters) - set(CONVERTERS)
+    if unknown:
+        parser.error(f"unknown converter(s): {', '.join(sorted(unknown))}")
+
+    results = {
+        "suite": "scrapion-offline",
+        "started_at": datetime.utcnow().isoformat(),
+        "git_revision": git_revision(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "settings": {
+            "iterations": args.iterations,
+            "latency": args.latency,
+            "page_size": args.page_size,
+            "concurrency": args.concurrency,
+            "host_rate": args.host_rate,
+            "converters": args.converters,
+            "browser": args.browser,
+        },
+        "cases": [],
+    }
+    with FixtureSite(latency=args.latency, page_size=args.page_size) as site:
+        for name in cases:
+            results["cases"].extend(BENCHMARKS[name](args, site))
+        results["fixture_requests"] = site.requests
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""Local fixture site for offline benchmarks"""
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+RECORDED_RESULTS = FIXTURES / "duckduckgo_results.html"
+
+# Result links of the recorded page: DuckDuckGo redirects and ad links
+_RESULT_LINK_RE = re.compile(r'href="(?:https:)?//duckduckgo\.com/(?:l/\?uddg=|y\.js\?)([^"&]*)[^"]*"')
+
+_WORDS = (
+    "scraper browser network latency markdown content page request response "
+    "cache search result parser event loop thread worker queue timeout render "
+    "document heading paragraph table list link anchor section article"
+).split()
+
+_BOILERPLATE = """
+<nav><ul>{links}</ul></nav>
+<aside><h3>Related</h3><ul>{links}</ul></aside>
+"""
+
+_FOOTER = "<footer><p>Fixture site footer, copyright notice and <a href='/'>home</a>.</p></footer>"
+
+
+def article_html(n: int, size: int) -> str:
+    """
+    Body of fixture page `n` with about `size` bytes of article markup
+
+    The article is surrounded by navigation, a sidebar and a footer, so
+    main-content extraction has boilerplate to drop.
+    """
+    links = "".join(f"<li><a href='/page/{(n + i) % 50}'>Page {(n + i) % 50}</a></li>" for i in range(1, 9))
+    parts = [f"<article><h1>Fixture page {n}</h1>"]
+    total = len(parts[0])
+    section = 0
+    while total < size:
+        words = [_WORDS[(n * 7 + section * 3 + i) % len(_WORDS)] for i in range(60)]
+        chunk = (
+            f"<h2>Section {section}</h2>"
+            f"<p>{' '.join(words[:30])} <a href='/page/{section % 50}'>more</a>.</p>"
+            f"<ul><li>{' '.join(words[30:40])}</li><li>{' '.join(words[40:50])}</li></ul>"
+            f"<p><b>{words[50]}</b> {' '.join(words[51:])}</p>"
+        )
+        parts.append(chunk)
+        total += len(chunk)
+        section += 1
+    parts.append("</article>")
+    return _BOILERPLATE.format(links=links) + "<main>" + "".join(parts) + "</main>" + _FOOTER
+
+
+def page_html(n: int, size: int, js: bool) -> str:
+    """
+    Full fixture page; with `js` the article is only added by a script
+
+    A JS page's static HTML is an empty shell that the HTTP tier
+    escalates to the browser.
+    """
+    body = article_html(n, size)
+    head = f"<head><meta charset='utf-8'><title>Fixture page {n}</title></head>"
+    if not js:
+        return f"<!DOCTYPE html><html>{head}<body>{body}</body></html>"
+    # "</" must not end the script element early
+    content = json.dumps(body).replace("</", "<\\/")
+    return (
+        f"<!DOCTYPE html><html>{head}<body><div id='root'></div>"
+        f"<script>document.getElementById('root').innerHTML = {content};</script></body></html>"
+    )
+
+
+class FixtureSite:
+    """
+    Threaded HTTP server with configurable fixture pages
+
+    Routes:
+
+    - /page/<n>: article page; query parameters size (bytes), latency
+      (seconds) and js (1 renders the article with JavaScript) override
+      the site defaults
+    - /html/: the recorded DuckDuckGo results page, with every result
+      link pointing to a /page/<n> of this site (offset by the s paging
+      parameter), so a query run never leaves the machine
+
+    Use as a context manager or call start()/stop().
+    """
+
+    def __init__(self, latency: float = 0.0, page_size: int = 20000, js: bool = False):
+        """
+        Initialize fixture site
+
+        Args:
+            latency: Seconds every response is delayed
+            page_size: Approximate article bytes per page
+            js: Render pages with JavaScript by default
+        """
+        self.latency = latency
+        self.page_size = page_size
+        self.js = js
+        self.requests = 0
+        self._recorded = RECORDED_RESULTS.read_text(encoding="utf-8")
+        self._server = None
+        self._thread = None
+
+    @property
+    def base(self) -> str:
+        """Base URL, e.g. http://127.0.0.1:8123"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, n: int = 0, **params) -> str:
+        """URL of fixture page `n`; params override size, latency and js"""
+        query = "&".join(f"{key}={int(value) if isinstance(value, bool) else value}" for key, value in params.items())
+        return f"{self.base}/page/{n}" + (f"?{query}" if query else "")
+
+    @property
+    def search_endpoint(self) -> str:
+        """Results URL for DuckDuckGoHtmlBackend"""
+        return f"{self.base}/html/"
+
+    def results_html(self, offset: int = 0) -> str:
+        """Recorded results page with its links rewritten to this site"""
+        targets = {}
+
+        def rewrite(match: re.Match) -> str:
+            n = targets.setdefault(unquote(match.group(1)), offset + len(targets))
+            return f'href="//duckduckgo.com/l/?uddg={quote(self.url(n), safe="")}"'
+
+        return _RESULT_LINK_RE.sub(rewrite, self._recorded)
+
+    def _respond(self, handler: BaseHTTPRequestHandler) -> None:
+        self.requests += 1
+        parts = urlsplit(handler.path)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+
+        latency = float(query.get("latency", self.latency))
+        if latency > 0:
+            time.sleep(latency)
+
+        status = 200
+        if parts.path.startswith("/page/") and parts.path[len("/page/"):].isdigit():
+            n = int(parts.path[len("/page/"):])
+            size = int(query.get("size", self.page_size))
+            js = query.get("js", "1" if self.js else "0") == "1"
+            body = page_html(n, size, js)
+        elif parts.path in ("/html", "/html/"):
+            body = self.results_html(offset=int(query.get("s", 0)))
+        else:
+            status, body = 404, "<html><body><p>Not found</p></body></html>"
+
+        data = body.encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "text/html; charset=utf-8")
+        handler.send_header("Content-Length", str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def start(self) -> "FixtureSite":
+        """Serve on a free port of 127.0.0.1 in a background thread"""
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                site._respond(self)
+
+            do_POST = do_GET
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Shut the server down"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FixtureSite":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve the benchmark fixture site")
+    parser.add_argument("--latency", type=float, default=0.0, help="Response delay in seconds")
+    parser.add_argument("--page-size", type=int, default=20000, help="Article bytes per page")
+    parser.add_argument("--js", action="store_true", help="Render pages with JavaScript")
+    args = parser.parse_args()
+
+    with FixtureSite(args.latency, args.page_size, args.js) as site:
+        print(f"Serving {site.base} (pages: {site.url(0)}, results: {site.search_endpoint})")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
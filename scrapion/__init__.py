@@ -7,7 +7,20 @@ A Python library for automated web scraping with intelligent fallback mechanisms
 from .input_handler import InputHandler, InputType
 from .list_manager import UrlListManager, UrlSource
 from .report_generator import Report, ScrapeResult
-from .orchestrator import Client
+from .report_sink import NdjsonReportSink, read_ndjson
+from .browser_pool import BrowserPool
+from .cache import PageCache, SearchCache
+from .crawler import Frontier
+from .host_stats import AdaptiveOrdering, HostStatsStore
+from .job_store import JobStore
+from .worker_pool import WorkerPool
+from .distributed import Coordinator
+from .orchestrator import AsyncClient, Client
+from .request_filter import RequestFilter
+from .scheduler import FetchScheduler
+from .search_profile import SearchProfile
+from .search_engine import DuckDuckGoBrowserBackend, DuckDuckGoHtmlBackend, SearchBackend
+from .tracing import Trace, add_hook, remove_hook
 
 # Backward compatibility alias
 Orchestrator = Client
@@ -15,6 +28,7 @@ Orchestrator = Client
 __version__ = "0.1.0"
 __all__ = [
     "Client",
+    "AsyncClient",
     "Orchestrator",  # Backward compatibility
     "InputHandler",
     "InputType",
@@ -22,4 +36,24 @@ __all__ = [
     "UrlSource",
     "Report",
     "ScrapeResult",
+    "NdjsonReportSink",
+    "read_ndjson",
+    "BrowserPool",
+    "RequestFilter",
+    "PageCache",
+    "SearchCache",
+    "HostStatsStore",
+    "AdaptiveOrdering",
+    "JobStore",
+    "WorkerPool",
+    "Coordinator",
+    "Frontier",
+    "FetchScheduler",
+    "SearchProfile",
+    "SearchBackend",
+    "DuckDuckGoBrowserBackend",
+    "DuckDuckGoHtmlBackend",
+    "Trace",
+    "add_hook",
+    "remove_hook",
 ]
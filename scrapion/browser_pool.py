@@ -0,0 +1,228 @@
+"""Shared browser pool module"""
+
+import asyncio
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from playwright.async_api import async_playwright
+
+from .tracing import record, span
+
+
+DEFAULT_LAUNCH_ARGS = [
+    "--no-sandbox",
+    "--disable-setuid-sandbox",
+    "--disable-dev-shm-usage",
+]
+
+
+class BrowserPool:
+    """
+    Pool of warm Firefox processes shared by search and scrape phases.
+
+    Browsers are launched lazily and kept alive between fetches. Each
+    acquisition gets a fresh browser context (isolated cookies/storage)
+    and a page on one of the pooled browsers, picked round-robin.
+
+    The pool is bound to the event loop it is started on.
+    """
+
+    def __init__(
+        self,
+        size: int = 1,
+        max_pages_per_browser: int = 4,
+        max_uses_per_browser: int = 100,
+        headless: bool = True,
+        launch_args: Optional[list[str]] = None,
+    ):
+        """
+        Initialize browser pool
+
+        Args:
+            size: Number of browser processes to keep warm
+            max_pages_per_browser: Concurrent pages allowed per browser
+            max_uses_per_browser: Contexts served before a browser is recycled
+            headless: Launch browsers headless
+            launch_args: Extra Firefox launch arguments
+        """
+        if size < 1:
+            raise ValueError("size must be at least 1")
+
+        self.size = size
+        self.max_pages_per_browser = max_pages_per_browser
+        self.max_uses_per_browser = max_uses_per_browser
+        self.headless = headless
+        self.launch_args = launch_args if launch_args is not None else DEFAULT_LAUNCH_ARGS
+
+        self._playwright = None
+        self._browsers = [None] * size
+        self._uses = [0] * size
+        self._active = [0] * size
+        # asyncio primitives are created on start() so they bind to the
+        # loop the pool actually runs on
+        self._locks = None
+        self._slots = None
+        self._start_lock = None
+        self._cursor = itertools.cycle(range(size))
+        self._closed = False
+
+    @property
+    def started(self) -> bool:
+        """Check if the Playwright driver is running"""
+        return self._playwright is not None
+
+    async def start(self) -> "BrowserPool":
+        """Start the Playwright driver (browsers launch on first use)"""
+        if self._start_lock is None:
+            self._locks = [asyncio.Lock() for _ in range(self.size)]
+            self._slots = asyncio.Semaphore(self.size * self.max_pages_per_browser)
+            self._start_lock = asyncio.Lock()
+
+        async with self._start_lock:
+            if self._closed:
+                raise RuntimeError("BrowserPool is closed")
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+        return self
+
+    async def _launch(self):
+        """Launch a new Firefox process"""
+        with span("browser_launch", pooled=True):
+            return await self._playwright.firefox.launch(
+                headless=self.headless,
+                args=self.launch_args,
+            )
+
+    async def _get_browser(self, index: int):
+        """
+        Return a healthy browser for slot `index`, relaunching if needed
+
+        A browser is replaced when it has disconnected (crash, OOM kill) or
+        has served `max_uses_per_browser` contexts and is currently idle.
+        """
+        async with self._locks[index]:
+            browser = self._browsers[index]
+            worn_out = self._uses[index] >= self.max_uses_per_browser and self._active[index] == 0
+
+            if browser is not None and (not browser.is_connected() or worn_out):
+                await self._close_browser(browser)
+                browser = None
+
+            if browser is None:
+                browser = await self._launch()
+                self._browsers[index] = browser
+                self._uses[index] = 0
+
+            self._uses[index] += 1
+            return browser
+
+    @staticmethod
+    async def _close_browser(browser) -> None:
+        """Close a browser, ignoring errors from dead processes"""
+        try:
+            await browser.close()
+        except Exception:
+            pass
+
+    @asynccontextmanager
+    async def context(self, **context_options):
+        """
+        Acquire a fresh browser context from the pool
+
+        Args:
+            **context_options: Options passed to `browser.new_context`
+
+        Yields:
+            Playwright BrowserContext, closed on exit
+        """
+        # Waiting for a slot, (re)launching a browser and opening the
+        # context are traced together as browser_acquire
+        started = time.perf_counter()
+        if not self.started:
+            await self.start()
+
+        async with self._slots:
+            index = next(self._cursor)
+            browser = await self._get_browser(index)
+            self._active[index] += 1
+            context = None
+            try:
+                context = await browser.new_context(**context_options)
+                record("browser_acquire", started, browser=index)
+                yield context
+            finally:
+                self._active[index] -= 1
+                if context is not None:
+                    try:
+                        await context.close()
+                    except Exception:
+                        pass
+
+    @asynccontextmanager
+    async def page(self, **context_options):
+        """
+        Acquire a fresh page in its own context
+
+        Args:
+            **context_options: Options passed to `browser.new_context`
+
+        Yields:
+            Playwright Page
+        """
+        async with self.context(**context_options) as context:
+            with span("page_open"):
+                page = await context.new_page()
+            yield page
+
+    async def health_check(self) -> dict:
+        """
+        Check pooled browsers and drop disconnected ones
+
+        Returns:
+            Dictionary with pool status counters
+        """
+        alive = 0
+        dropped = 0
+        if self._locks is None:
+            return {"size": self.size, "alive": 0, "dropped": 0, "active_pages": 0}
+
+        for index in range(self.size):
+            async with self._locks[index]:
+                browser = self._browsers[index]
+                if browser is None:
+                    continue
+                if browser.is_connected():
+                    alive += 1
+                else:
+                    await self._close_browser(browser)
+                    self._browsers[index] = None
+                    dropped += 1
+
+        return {
+            "size": self.size,
+            "alive": alive,
+            "dropped": dropped,
+            "active_pages": sum(self._active),
+        }
+
+    async def close(self) -> None:
+        """Close all browsers and stop the Playwright driver"""
+        self._closed = True
+        for index, browser in enumerate(self._browsers):
+            if browser is not None:
+                await self._close_browser(browser)
+                self._browsers[index] = None
+
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            finally:
+                self._playwright = None
+
+    async def __aenter__(self) -> "BrowserPool":
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
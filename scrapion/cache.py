@@ -0,0 +1,427 @@
+"""On-disk cache module"""
+
+import asyncio
+import functools
+import json
+import sqlite3
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from .url_utils import normalize_url
+
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "scrapion" / "cache.db"
+
+
+def _pack(text: Optional[str]) -> Optional[bytes]:
+    """Compress text for storage"""
+    if text is None:
+        return None
+    return zlib.compress(text.encode("utf-8"), 6)
+
+
+def _unpack(blob: Optional[bytes]) -> Optional[str]:
+    """Decompress stored text"""
+    if blob is None:
+        return None
+    return zlib.decompress(blob).decode("utf-8")
+
+
+class _SqliteStore:
+    """
+    SQLite-backed store shared by the caches
+
+    Uses WAL journaling and a busy timeout so several worker processes can
+    read and write the same cache file concurrently. Async code goes
+    through call(), which keeps the blocking SQLite work off the event loop.
+    """
+
+    SCHEMA = ""
+
+    def __init__(self, path=None, max_bytes: int = 512 * 1024 * 1024, ttl: float = 3600):
+        """
+        Initialize store
+
+        Args:
+            path: SQLite file path (default: ~/.cache/scrapion/cache.db)
+            max_bytes: Byte budget; least recently used entries are evicted above it
+            ttl: Default entry lifetime in seconds
+        """
+        self.path = Path(path) if path is not None else DEFAULT_CACHE_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        self._connect()
+
+    def _connect(self) -> None:
+        # Calls run on the store's own thread (see call()) or, in sync
+        # code, on the caller's; they are never concurrent
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scrapion-sqlite")
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+    def __getstate__(self) -> dict:
+        # Pickled (e.g. for a worker process) without the connection; the
+        # copy opens its own
+        state = self.__dict__.copy()
+        del state["_conn"], state["_executor"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._connect()
+
+    def _evict(self, table: str) -> int:
+        """
+        Evict least recently used rows until the table fits the byte budget
+
+        Must be called inside a write transaction.
+
+        Returns:
+            Number of evicted rows
+        """
+        total = self._conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {table}").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+
+        evicted = 0
+        rows = self._conn.execute(f"SELECT key, size FROM {table} ORDER BY last_access ASC")
+        doomed = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+            evicted += 1
+        self._conn.executemany(f"DELETE FROM {table} WHERE key = ?", doomed)
+        return evicted
+
+    async def call(self, func, *args, **kwargs):
+        """
+        Run a blocking method of this store on the store's thread
+
+        A write may wait up to 30 seconds for another process's lock; this
+        keeps that wait off the event loop. Calls run one at a time, in
+        order, so transactions on the shared connection never interleave.
+
+        Args:
+            func: Method of this store, or a callable using its connection
+            *args, **kwargs: Arguments for `func`
+
+        Returns:
+            What `func` returns
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    def close(self) -> None:
+        """Close the database connection"""
+        self._executor.shutdown(wait=True)
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class CacheEntry:
+    """Cached page"""
+
+    def __init__(
+        self,
+        url: str,
+        html: str,
+        markdown: Optional[str],
+        variant: str,
+        tier: Optional[str],
+        etag: Optional[str],
+        last_modified: Optional[str],
+        stored_at: float,
+        expires_at: float,
+    ):
+        self.url = url
+        self.html = html
+        self.markdown = markdown
+        self.variant = variant
+        self.tier = tier
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = stored_at
+        self.expires_at = expires_at
+
+    @property
+    def fresh(self) -> bool:
+        """Check if the entry is within its TTL"""
+        return time.time() < self.expires_at
+
+    @property
+    def revalidatable(self) -> bool:
+        """Check if the entry carries HTTP validators"""
+        return bool(self.etag or self.last_modified)
+
+    def validation_headers(self) -> dict:
+        """Conditional request headers for revalidation"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class PageCache(_SqliteStore):
+    """
+    Page content cache keyed by normalized URL
+
+    Stores raw HTML and the converted Markdown (zlib-compressed) with a
+    per-entry TTL and the ETag/Last-Modified validators of the response.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS pages (
+            key TEXT PRIMARY KEY,
+            url TEXT NOT NULL,
+            html BLOB NOT NULL,
+            markdown BLOB,
+            variant TEXT NOT NULL,
+            tier TEXT,
+            etag TEXT,
+            last_modified TEXT,
+            stored_at REAL NOT NULL,
+            expires_at REAL NOT NULL,
+            last_access REAL NOT NULL,
+            size INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS pages_last_access ON pages (last_access);
+    """
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """
+        Look up a page, fresh or stale
+
+        Args:
+            url: Page URL (normalized for the lookup)
+
+        Returns:
+            CacheEntry or None if the URL is not cached
+        """
+        key = normalize_url(url)
+        row = self._conn.execute(
+            "SELECT url, html, markdown, variant, tier, etag, last_modified, stored_at, expires_at "
+            "FROM pages WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        self._conn.execute("UPDATE pages SET last_access = ? WHERE key = ?", (time.time(), key))
+        return CacheEntry(
+            url=row[0],
+            html=_unpack(row[1]),
+            markdown=_unpack(row[2]),
+            variant=row[3],
+            tier=row[4],
+            etag=row[5],
+            last_modified=row[6],
+            stored_at=row[7],
+            expires_at=row[8],
+        )
+
+    def put(
+        self,
+        url: str,
+        html: str,
+        markdown: Optional[str],
+        variant: str = "",
+        tier: Optional[str] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        ttl: Optional[float] = None,
+    ) -> None:
+        """
+        Store a page and evict old entries above the byte budget
+
+        Args:
+            url: Page URL
+            html: Raw HTML
+            markdown: Converted Markdown
+            variant: Conversion settings the Markdown was produced with
+            tier: Fetch tier that served the page
+            etag: ETag response header
+            last_modified: Last-Modified response header
+            ttl: Lifetime in seconds (default: cache TTL)
+        """
+        now = time.time()
+        html_blob = _pack(html)
+        markdown_blob = _pack(markdown)
+        size = len(html_blob) + (len(markdown_blob) if markdown_blob else 0)
+
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages "
+                "(key, url, html, markdown, variant, tier, etag, last_modified, "
+                "stored_at, expires_at, last_access, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    normalize_url(url), url, html_blob, markdown_blob, variant, tier,
+                    etag, last_modified, now, now + (self.ttl if ttl is None else ttl), now, size,
+                ),
+            )
+            self._evict("pages")
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def refresh(self, url: str, ttl: Optional[float] = None) -> None:
+        """
+        Extend an entry's lifetime after a successful revalidation
+
+        Args:
+            url: Page URL
+            ttl: New lifetime in seconds (default: cache TTL)
+        """
+        now = time.time()
+        self._conn.execute(
+            "UPDATE pages SET expires_at = ?, last_access = ? WHERE key = ?",
+            (now + (self.ttl if ttl is None else ttl), now, normalize_url(url)),
+        )
+
+    def delete(self, url: str) -> None:
+        """Remove a page from the cache"""
+        self._conn.execute("DELETE FROM pages WHERE key = ?", (normalize_url(url),))
+
+    def stats(self) -> dict:
+        """Get cache statistics"""
+        count, size = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages"
+        ).fetchone()
+        return {"entries": count, "bytes": size, "max_bytes": self.max_bytes}
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a search query for cache lookups (case, whitespace)"""
+    return " ".join(query.lower().split())
+
+
+class SearchCache(_SqliteStore):
+    """
+    Search result cache keyed by normalized query and page count
+
+    Stores the structured result list (title, link, snippet, page_number,
+    position). Can share a file with PageCache.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS searches (
+            key TEXT PRIMARY KEY,
+            query TEXT NOT NULL,
+            pages INTEGER NOT NULL,
+            results BLOB NOT NULL,
+            stored_at REAL NOT NULL,
+            expires_at REAL NOT NULL,
+            last_access REAL NOT NULL,
+            size INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS searches_last_access ON searches (last_access);
+    """
+
+    def __init__(self, path=None, max_bytes: int = 32 * 1024 * 1024, ttl: float = 3600):
+        """
+        Initialize search cache
+
+        Args:
+            path: SQLite file path (default: ~/.cache/scrapion/cache.db)
+            max_bytes: Byte budget; least recently used entries are evicted above it
+            ttl: Default entry lifetime in seconds
+        """
+        super().__init__(path, max_bytes=max_bytes, ttl=ttl)
+
+    @staticmethod
+    def _key(query: str, pages: int, variant: str) -> str:
+        return f"{pages}:{variant}:{normalize_query(query)}"
+
+    def get(self, query: str, pages: int = 1, variant: str = "") -> Optional[list[dict]]:
+        """
+        Look up fresh results for a query
+
+        Args:
+            query: Search query (normalized for the lookup)
+            pages: Number of result pages the search covered
+            variant: Backends and profile the results came from; results
+                of another variant are not returned
+
+        Returns:
+            Result list, or None if missing or expired
+        """
+        key = self._key(query, pages, variant)
+        now = time.time()
+        row = self._conn.execute(
+            "SELECT results FROM searches WHERE key = ? AND expires_at > ?",
+            (key, now),
+        ).fetchone()
+        if row is None:
+            return None
+
+        self._conn.execute("UPDATE searches SET last_access = ? WHERE key = ?", (now, key))
+        return json.loads(_unpack(row[0]))
+
+    def put(
+        self,
+        query: str,
+        pages: int,
+        results: list[dict],
+        ttl: Optional[float] = None,
+        variant: str = "",
+    ) -> None:
+        """
+        Store results and evict old entries above the byte budget
+
+        Args:
+            query: Search query
+            pages: Number of result pages the search covered
+            results: Structured result list
+            ttl: Lifetime in seconds (default: cache TTL)
+            variant: Backends and profile the results came from (see get)
+        """
+        now = time.time()
+        blob = _pack(json.dumps(results, ensure_ascii=False))
+
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO searches "
+                "(key, query, pages, results, stored_at, expires_at, last_access, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self._key(query, pages, variant), query, pages, blob,
+                    now, now + (self.ttl if ttl is None else ttl), now, len(blob),
+                ),
+            )
+            self._evict("searches")
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def delete(self, query: str, pages: int = 1, variant: str = "") -> None:
+        """Remove a query from the cache"""
+        self._conn.execute("DELETE FROM searches WHERE key = ?", (self._key(query, pages, variant),))
+
+    def stats(self) -> dict:
+        """Get cache statistics"""
+        count, size = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM searches"
+        ).fetchone()
+        return {"entries": count, "bytes": size, "max_bytes": self.max_bytes}
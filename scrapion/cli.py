@@ -2,37 +2,545 @@
 """Simple CLI entry point for scrapion library"""
 
 import argparse
+import asyncio
+import contextlib
+import logging
+import os
 import sys
+from typing import Optional
+from .cache import PageCache, SearchCache
+from .distributed import DEFAULT_PORT, TASK_KINDS, Coordinator, parse_address
+from .host_stats import AdaptiveOrdering, HostStatsStore
+from .job_store import JobStore
 from .orchestrator import Client
+from .report_sink import COMPRESSIONS, NdjsonReportSink
+from .scheduler import FetchScheduler
+from .search_engine import DuckDuckGoBrowserBackend, DuckDuckGoHtmlBackend
+from .search_profile import DEFAULT_SEARCH_PROFILE, SEARCH_PROFILES
+from .tracing import logger as trace_logger
+from .web_access import CONVERTERS, DEFAULT_CONVERTER, READINESS_STRATEGIES
+
+
+def _add_client_arguments(parser: argparse.ArgumentParser) -> None:
+    """Options shared by every command that fetches pages"""
+    parser.add_argument(
+        "--wait-until",
+        default="load",
+        choices=list(READINESS_STRATEGIES),
+        help="Page readiness strategy (default: load)",
+    )
+    parser.add_argument("--wait-for-selector", help="CSS selector to wait for with --wait-until selector")
+    parser.add_argument(
+        "--converter",
+        default=DEFAULT_CONVERTER,
+        choices=list(CONVERTERS),
+        help=f"HTML to Markdown converter (default: {DEFAULT_CONVERTER})",
+    )
+    parser.add_argument(
+        "--search-profile",
+        default=DEFAULT_SEARCH_PROFILE,
+        choices=list(SEARCH_PROFILES),
+        help="'stealth' types queries with human-like pauses, 'fast' requests "
+             f"the results URL directly (default: {DEFAULT_SEARCH_PROFILE})",
+    )
+    parser.add_argument(
+        "--search-backend",
+        action="append",
+        choices=["browser", "html"],
+        help="Search backend; repeat to query several at once and merge their "
+             "results (default: browser)",
+    )
+    parser.add_argument(
+        "--search-endpoint",
+        help="Results URL for the html backend (default: DuckDuckGo HTML)",
+    )
+    parser.add_argument(
+        "--host-rate",
+        type=float,
+        default=2.0,
+        help="Requests per second sent to one host; 0 for no limit (default: 2)",
+    )
+    parser.add_argument(
+        "--host-concurrency",
+        type=int,
+        default=2,
+        help="Requests in flight per host (default: 2)",
+    )
+    parser.add_argument(
+        "--max-connections",
+        type=int,
+        default=16,
+        help="Requests in flight across all hosts (default: 16)",
+    )
+    parser.add_argument(
+        "--main-content",
+        action="store_true",
+        help="Convert only each page's main content, dropping navigation, "
+             "sidebars and footers (default: whole pages)",
+    )
+    parser.add_argument("--cache", help="Page and search cache file (SQLite); disabled when omitted")
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=3600,
+        help="Page cache entry lifetime in seconds (default: 3600)",
+    )
+    parser.add_argument(
+        "--search-cache-ttl",
+        type=float,
+        default=3600,
+        help="Search cache entry lifetime in seconds (default: 3600)",
+    )
+    parser.add_argument(
+        "--host-stats",
+        help="Record per-host success rate and latency in this file (SQLite; "
+             "may be the --cache file)",
+    )
+    parser.add_argument(
+        "--bypass-search-cache",
+        action="store_true",
+        help="Always run searches fresh (results are still cached)",
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Log the duration of every phase (launch, navigation, conversion, "
+             "search steps) to stderr",
+    )
+
+
+def _client_settings(parser: argparse.ArgumentParser, args) -> dict:
+    """
+    Validate the client options and build Client keyword arguments
+
+    Turns on tracing with --trace. The caller closes the returned
+    host_stats store, if any.
+    """
+    if args.wait_until == "selector" and not args.wait_for_selector:
+        parser.error("--wait-for-selector is required when --wait-until is 'selector'")
+    if args.host_rate < 0:
+        parser.error("--host-rate must not be negative")
+    if args.host_concurrency < 1 or args.max_connections < 1:
+        parser.error("--host-concurrency and --max-connections must be at least 1")
+
+    backends = []
+    for name in args.search_backend or ["browser"]:
+        if name == "browser":
+            backends.append(DuckDuckGoBrowserBackend(profile=args.search_profile))
+        elif args.search_endpoint:
+            backends.append(DuckDuckGoHtmlBackend(endpoint=args.search_endpoint))
+        else:
+            backends.append(DuckDuckGoHtmlBackend())
+
+    if args.trace:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter("[TRACE] %(message)s"))
+        trace_logger.addHandler(handler)
+        trace_logger.setLevel(logging.DEBUG)
+
+    return dict(
+        wait_until=args.wait_until,
+        wait_for_selector=args.wait_for_selector,
+        cache=PageCache(args.cache, ttl=args.cache_ttl) if args.cache else None,
+        search_cache=SearchCache(args.cache, ttl=args.search_cache_ttl) if args.cache else None,
+        bypass_search_cache=args.bypass_search_cache,
+        converter=args.converter,
+        extract_main_content=args.main_content,
+        search_profile=args.search_profile,
+        search_backends=backends,
+        scheduler=FetchScheduler(
+            rate=args.host_rate,
+            per_host_concurrency=args.host_concurrency,
+            global_concurrency=args.max_connections,
+        ),
+        host_stats=HostStatsStore(args.host_stats) if args.host_stats else None,
+    )
 
 
 def main():
+    # Commands are matched by name so a plain input keeps working; search
+    # for the words themselves with "scrapion -- coordinator"
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        COMMANDS[sys.argv[1]](sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(
         description="Web scraping automation system",
         prog="scrapion",
     )
 
-    parser.add_argument("input", help="Input URL or search query")
+    parser.add_argument("input", nargs="?", help="Input URL or search query")
     parser.add_argument(
         "--report",
-        required=True,
         choices=["stdio", "file"],
-        help="Report output destination",
+        help="Report output destination (required for a single input)",
     )
     parser.add_argument("--output", help="Output file path (required when --report file)")
+    parser.add_argument(
+        "--input-file",
+        help="File with one URL or search query per line ('-' for stdin); "
+             "writes one JSON report per line",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Run --input-file inputs on this many worker processes, each with "
+             "its own browser; --concurrency then applies per worker",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        action="store_true",
+        help="Record the --input-file batch as a job whose progress survives "
+             "crashes; its ID is printed for --resume",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="JOBID",
+        help="Continue a checkpointed batch job: only unfinished inputs are "
+             "processed and stored results are not fetched again; --output "
+             "and --ndjson are appended to",
+    )
+    parser.add_argument(
+        "--job-store",
+        help="Job database for --checkpoint and --resume (default: ~/.cache/scrapion/jobs.db)",
+    )
+    parser.add_argument(
+        "--ndjson",
+        help="Stream every result to this NDJSON file as it is scraped "
+             "(.gz/.zst extensions compress); --report becomes optional",
+    )
+    parser.add_argument(
+        "--compression",
+        default="auto",
+        choices=list(COMPRESSIONS),
+        help="Compression of the --ndjson file (default: from its extension)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Inputs processed at once with --input-file, or pages fetched at once "
+             "with --crawl (default: 4)",
+    )
+    parser.add_argument(
+        "--max-per-host",
+        type=int,
+        help="Keep at most this many search result links per host (default: unlimited)",
+    )
+    parser.add_argument(
+        "--adaptive-order",
+        action="store_true",
+        help="Try search results from historically fast, reliable hosts first "
+             "(needs --host-stats)",
+    )
+    parser.add_argument(
+        "--crawl",
+        action="store_true",
+        help="Treat the input as a seed URL and follow links from scraped pages",
+    )
+    parser.add_argument("--max-depth", type=int, default=2, help="Link hops followed with --crawl (default: 2)")
+    parser.add_argument("--max-pages", type=int, default=50, help="Pages fetched with --crawl (default: 50)")
+    parser.add_argument(
+        "--all-hosts",
+        action="store_true",
+        help="With --crawl, also follow links to other hosts",
+    )
+    _add_client_arguments(parser)
 
     args = parser.parse_args()
 
     # Validate arguments
+    if sum(bool(value) for value in (args.input, args.input_file, args.resume)) > 1:
+        parser.error("give only one of an input, --input-file or --resume")
+    if not args.input and not args.input_file and not args.resume:
+        parser.error("an input, --input-file or --resume is required")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.workers is not None and not (args.input_file or args.resume):
+        parser.error("--workers needs --input-file or --resume")
+    if args.checkpoint and not args.input_file:
+        parser.error("--checkpoint needs --input-file")
+    if args.input and not args.report and not args.ndjson:
+        parser.error("--report or --ndjson is required for a single input")
     if args.report == "file" and not args.output:
         parser.error("--output is required when --report is 'file'")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.max_per_host is not None and args.max_per_host < 1:
+        parser.error("--max-per-host must be at least 1")
+    if args.crawl and not args.input:
+        parser.error("--crawl needs a seed URL as input")
+    if args.adaptive_order and not args.host_stats:
+        parser.error("--adaptive-order requires --host-stats")
+    if args.crawl and (args.max_depth < 0 or args.max_pages < 1):
+        parser.error("--max-depth must not be negative and --max-pages must be at least 1")
+
+    settings = _client_settings(parser, args)
+    host_stats = settings["host_stats"]
+
+    jobs = JobStore(args.job_store) if args.checkpoint or args.resume else None
+    if args.resume and jobs.get_job(args.resume) is None:
+        parser.error(f"unknown job: {args.resume}")
+
+    sink = None
+    if args.ndjson:
+        sink = NdjsonReportSink(args.ndjson, compression=args.compression, append=bool(args.resume))
 
     # Run client
-    client = Client()
-    report = client.run(args.input)
+    try:
+        with Client(
+            **settings,
+            report_sink=sink,
+            max_urls_per_host=args.max_per_host,
+            url_order=AdaptiveOrdering(host_stats) if args.adaptive_order else None,
+        ) as client:
+            if args.input_file or args.resume:
+                run_batch(
+                    client,
+                    args.input_file,
+                    None if sink else args.output,
+                    args.concurrency,
+                    sink is None,
+                    jobs=jobs,
+                    job_id=args.resume,
+                    workers=args.workers,
+                )
+                return
+
+            if args.crawl:
+                client.crawl(
+                    args.input,
+                    max_depth=args.max_depth,
+                    max_pages=args.max_pages,
+                    same_host_only=not args.all_hosts,
+                    concurrency=args.concurrency,
+                )
+            else:
+                client.run(args.input)
+
+            # Output report
+            if args.report:
+                client.output_report(args.report, args.output)
+    finally:
+        if sink is not None:
+            sink.close()
+        if host_stats is not None:
+            host_stats.close()
+        if jobs is not None:
+            jobs.close()
+
+
+def run_batch(
+    client: Client,
+    input_file: Optional[str],
+    output_path,
+    concurrency: int,
+    write_reports: bool = True,
+    jobs: Optional[JobStore] = None,
+    job_id: Optional[str] = None,
+    workers: Optional[int] = None,
+) -> None:
+    """
+    Process every line of `input_file` and write one JSON report per line
+
+    Args:
+        client: Client whose browsers are shared by all inputs
+        input_file: Path to the input file, or '-' for stdin; None when
+            resuming a job
+        output_path: JSON lines destination; stdout when None
+        concurrency: Inputs processed at once
+        write_reports: Write the reports; False when the client streams
+            its results to an NDJSON sink instead
+        jobs: Optional JobStore; the inputs are recorded as a new job
+            (or `job_id` is resumed) and processed from there
+        job_id: Job to resume; the output file is appended to
+        workers: Optional number of worker processes (see Client.run_many)
+    """
+    inputs = None
+    if input_file is not None:
+        inputs = sys.stdin if input_file == "-" else open(input_file, "r", encoding="utf-8")
+    mode = "a" if job_id else "w"
+    out = open(output_path, mode, encoding="utf-8") if output_path else sys.stdout
+
+    try:
+        if jobs is not None and job_id is None:
+            job_id = jobs.create_job(inputs, settings={"input_file": input_file})
+            print(f"[JOB] Created job {job_id}; continue it with --resume {job_id}", file=sys.stderr)
+
+        if jobs is not None:
+            reports = client.run_job(jobs, job_id, concurrency=concurrency, workers=workers)
+        else:
+            reports = client.run_many(inputs, concurrency=concurrency, workers=workers)
+
+        # Progress messages go to stderr so stdout stays valid JSON lines
+        with contextlib.redirect_stdout(sys.stderr):
+            for report in reports:
+                if write_reports:
+                    out.write(report.to_json(indent=None) + "\n")
+                    out.flush()
+    finally:
+        if inputs is not None and inputs is not sys.stdin:
+            inputs.close()
+        if out is not sys.stdout:
+            out.close()
+
+
+def coordinator_main(argv: list[str]) -> None:
+    """scrapion coordinator: hand out the inputs of a file to remote workers"""
+    parser = argparse.ArgumentParser(
+        description="Hand out searches and scrapes to 'scrapion worker' processes "
+                    "and collect their results",
+        prog="scrapion coordinator",
+    )
+    parser.add_argument(
+        "--input-file",
+        required=True,
+        help="File with one URL or search query per line ('-' for stdin)",
+    )
+    parser.add_argument(
+        "--listen",
+        default=f"127.0.0.1:{DEFAULT_PORT}",
+        help=f"Address workers connect to (default: 127.0.0.1:{DEFAULT_PORT}; "
+             "use 0.0.0.0:PORT to accept other machines)",
+    )
+    parser.add_argument("--output", help="Write one JSON report per line to this file (default: stdout)")
+    parser.add_argument(
+        "--ndjson",
+        help="Stream every result to this NDJSON file as it arrives "
+             "(.gz/.zst extensions compress); reports are then not written",
+    )
+    parser.add_argument(
+        "--compression",
+        default="auto",
+        choices=list(COMPRESSIONS),
+        help="Compression of the --ndjson file (default: from its extension)",
+    )
+    parser.add_argument(
+        "--max-per-host",
+        type=int,
+        help="Keep at most this many search result links per host (default: unlimited)",
+    )
+    parser.add_argument(
+        "--lease",
+        type=float,
+        default=60.0,
+        help="Seconds without a heartbeat after which a worker's tasks are "
+             "given to others (default: 60)",
+    )
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=3,
+        help="Times a task is handed out before it is given up (default: 3)",
+    )
+    parser.add_argument(
+        "--token",
+        default=os.environ.get("SCRAPION_TOKEN"),
+        help="Shared secret workers must send to connect (default: $SCRAPION_TOKEN)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.max_per_host is not None and args.max_per_host < 1:
+        parser.error("--max-per-host must be at least 1")
+    if args.lease <= 0:
+        parser.error("--lease must be positive")
+    if args.max_attempts < 1:
+        parser.error("--max-attempts must be at least 1")
+    try:
+        host, port = parse_address(args.listen)
+    except ValueError as e:
+        parser.error(str(e))
+
+    sink = NdjsonReportSink(args.ndjson, compression=args.compression) if args.ndjson else None
+    coordinator = Coordinator(
+        host,
+        port,
+        lease_seconds=args.lease,
+        max_attempts=args.max_attempts,
+        max_urls_per_host=args.max_per_host,
+        report_sink=sink,
+        token=args.token,
+    )
+    inputs = sys.stdin if args.input_file == "-" else open(args.input_file, "r", encoding="utf-8")
+    out = None
+    if sink is None:
+        out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+
+    async def collect() -> None:
+        async for report in coordinator.run(inputs):
+            if out is not None:
+                out.write(report.to_json(indent=None) + "\n")
+                out.flush()
+
+    try:
+        # Progress messages go to stderr so stdout stays valid JSON lines
+        with contextlib.redirect_stdout(sys.stderr):
+            asyncio.run(collect())
+    finally:
+        if inputs is not sys.stdin:
+            inputs.close()
+        if out is not None and out is not sys.stdout:
+            out.close()
+        if sink is not None:
+            sink.close()
+
+
+def worker_main(argv: list[str]) -> None:
+    """scrapion worker: process tasks from a coordinator"""
+    parser = argparse.ArgumentParser(
+        description="Process searches and scrapes handed out by 'scrapion coordinator'",
+        prog="scrapion worker",
+    )
+    parser.add_argument("--connect", required=True, help="Coordinator address, host:port")
+    parser.add_argument(
+        "--capacity",
+        type=int,
+        default=4,
+        help="Tasks processed at once (default: 4)",
+    )
+    parser.add_argument(
+        "--role",
+        action="append",
+        choices=list(TASK_KINDS),
+        help="Only take this kind of task; repeat for both (default: both)",
+    )
+    parser.add_argument("--name", help="Name shown by the coordinator (default: host name)")
+    parser.add_argument(
+        "--token",
+        default=os.environ.get("SCRAPION_TOKEN"),
+        help="Shared secret of the coordinator (default: $SCRAPION_TOKEN)",
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=1,
+        help="Warm browser processes (default: 1)",
+    )
+    _add_client_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if args.capacity < 1 or args.pool_size < 1:
+        parser.error("--capacity and --pool-size must be at least 1")
+    try:
+        parse_address(args.connect)
+    except ValueError as e:
+        parser.error(str(e))
+    settings = _client_settings(parser, args)
+
+    try:
+        with Client(pool_size=args.pool_size, **settings) as client:
+            client.work_for(
+                args.connect, args.capacity, args.role or TASK_KINDS, args.name, args.token
+            )
+    finally:
+        if settings["host_stats"] is not None:
+            settings["host_stats"].close()
+
 
-    # Output report
-    client.output_report(args.report, args.output)
+COMMANDS = {
+    "coordinator": coordinator_main,
+    "worker": worker_main,
+}
 
 
 if __name__ == "__main__":
@@ -0,0 +1,378 @@
+"""Main-content extraction module"""
+
+import re
+from html import escape
+from html.parser import HTMLParser
+from typing import Iterator, Optional
+
+from .markdown_converter import convert_events
+
+
+# Subtrees that never hold main content
+_DROP_TAGS = frozenset((
+    "script", "style", "noscript", "template", "svg", "iframe", "canvas",
+    "nav", "aside", "footer", "button", "select", "dialog", "head",
+))
+# Dropped subtrees whose text still counts towards the page's original size
+_LAYOUT_TAGS = frozenset(("nav", "aside", "footer", "button", "select", "dialog"))
+_VOID_TAGS = frozenset((
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+))
+_IMPLICIT_CLOSE = {
+    "li": ("li",),
+    "p": ("p",),
+    "dt": ("dt", "dd"),
+    "dd": ("dt", "dd"),
+    "tr": ("td", "th", "tr"),
+    "td": ("td", "th"),
+    "th": ("td", "th"),
+}
+# Attributes the Markdown converters read; everything else is dropped
+_KEEP_ATTRS = frozenset(("href", "src", "alt", "title", "colspan", "start"))
+
+# Elements whose text is scored and credited to their ancestors
+_SCORED_TAGS = frozenset(("p", "pre", "td", "blockquote"))
+# Containers inside the main content that are dropped when they look like
+# boilerplate (link lists, share bars, cookie notices)
+_CLEANED_TAGS = frozenset(("div", "section", "header", "form", "ul", "ol", "dl", "span"))
+# Text-bearing siblings of the best container that are kept when dense enough
+_SIBLING_BLOCKS = frozenset(("p", "pre", "table", "blockquote", "ul", "ol"))
+_TAG_WEIGHTS = {
+    "article": 10, "main": 10,
+    "div": 5,
+    "pre": 3, "td": 3, "blockquote": 3,
+    "address": -3, "ol": -3, "ul": -3, "dl": -3, "dd": -3, "dt": -3, "li": -3, "form": -3,
+    "h1": -5, "h2": -5, "h3": -5, "h4": -5, "h5": -5, "h6": -5, "th": -5,
+}
+
+_POSITIVE_RE = re.compile(
+    r"article|body|content|entry|main|page|post|story|text|blog", re.I
+)
+_NEGATIVE_RE = re.compile(
+    r"banner|breadcrumb|combx|comment|consent|cookie|disqus|footer|gdpr|header|hidden|"
+    r"menu|modal|nav|newsletter|popup|promo|related|share|sidebar|social|sponsor|"
+    r"subscribe|tags|toolbar|widget|advert|\bads?\b",
+    re.I,
+)
+
+# Paragraphs shorter than this (in characters) are not scored
+MIN_PARAGRAPH_TEXT = 25
+# Extractions with less text than this fall back to the full page
+MIN_EXTRACTED_TEXT = 140
+
+
+class _Node:
+    """Element in the simplified document tree"""
+
+    __slots__ = ("tag", "attrs", "children", "parent", "text_length", "link_length", "score")
+
+    def __init__(self, tag: str, attrs: dict, parent: Optional["_Node"]):
+        self.tag = tag
+        self.attrs = attrs
+        self.children = []
+        self.parent = parent
+        self.text_length = 0
+        self.link_length = 0
+        self.score = None
+
+    def class_weight(self) -> int:
+        """+25/-25 for content-like or boilerplate-like class and id names"""
+        weight = 0
+        for name in (self.attrs.get("class"), self.attrs.get("id")):
+            if not name:
+                continue
+            if _NEGATIVE_RE.search(name):
+                weight -= 25
+            if _POSITIVE_RE.search(name):
+                weight += 25
+        return weight
+
+    @property
+    def link_density(self) -> float:
+        return self.link_length / self.text_length if self.text_length else 0.0
+
+
+class _TreeBuilder(HTMLParser):
+    """Builds a _Node tree, skipping subtrees that never hold content"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = _Node("root", {}, None)
+        self._current = self.root
+        self._skip = []
+        # Visible text inside dropped navigation/footer subtrees
+        self.dropped_text = 0
+
+    def handle_starttag(self, tag, attrs):
+        if self._skip:
+            if tag == self._skip[-1] and tag not in _VOID_TAGS:
+                self._skip.append(tag)
+            return
+        if tag in _DROP_TAGS:
+            self._skip.append(tag)
+            return
+
+        closes = _IMPLICIT_CLOSE.get(tag)
+        if closes and self._current.tag in closes:
+            self._current = self._current.parent
+            if tag == "tr" and self._current.tag == "tr":
+                self._current = self._current.parent
+
+        node = _Node(tag, {k: v for k, v in attrs if v is not None}, self._current)
+        self._current.children.append(node)
+        if tag not in _VOID_TAGS:
+            self._current = node
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in _VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self._skip:
+            if tag == self._skip[-1]:
+                self._skip.pop()
+            return
+
+        node = self._current
+        while node is not None and node.tag != tag:
+            node = node.parent
+        if node is not None and node is not self.root:
+            self._current = node.parent
+
+    def handle_data(self, data):
+        if not data:
+            return
+        if not self._skip:
+            self._current.children.append(data)
+        elif self._skip[0] in _LAYOUT_TAGS:
+            self.dropped_text += len(data.strip())
+
+
+def _walk(root: _Node) -> list[_Node]:
+    """Elements of the tree in document order (iterative, any depth)"""
+    order = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        stack.extend(child for child in reversed(node.children) if isinstance(child, _Node))
+    return order
+
+
+def _measure(nodes: list[_Node]) -> None:
+    """Compute text and link-text lengths bottom-up"""
+    for node in reversed(nodes):
+        text = 0
+        for child in node.children:
+            if isinstance(child, str):
+                text += len(child.strip())
+            else:
+                text += child.text_length
+        node.text_length = text
+        if node.tag == "a":
+            node.link_length = text
+        else:
+            node.link_length = sum(c.link_length for c in node.children if isinstance(c, _Node))
+
+
+def _text(node: _Node) -> str:
+    """Concatenated text of a subtree"""
+    parts = []
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            parts.append(item)
+        else:
+            stack.extend(reversed(item.children))
+    return "".join(parts)
+
+
+def _initial_score(node: _Node) -> float:
+    return _TAG_WEIGHTS.get(node.tag, 0) + node.class_weight()
+
+
+def _score(nodes: list[_Node]) -> list[_Node]:
+    """
+    Credit each paragraph's content score to its ancestors
+
+    The parent receives the full score, the grandparent half and further
+    ancestors a third per level. Returns the nodes that received credit.
+    """
+    candidates = []
+    for node in nodes:
+        if node.tag not in _SCORED_TAGS or node.text_length < MIN_PARAGRAPH_TEXT:
+            continue
+        text = _text(node)
+        score = 1 + text.count(",") + min(node.text_length // 100, 3)
+
+        ancestor = node.parent
+        level = 0
+        while ancestor is not None and ancestor.tag != "root" and level < 5:
+            if ancestor.score is None:
+                ancestor.score = _initial_score(ancestor)
+                candidates.append(ancestor)
+            divider = 1 if level == 0 else 2 if level == 1 else level * 3
+            ancestor.score += score / divider
+            ancestor = ancestor.parent
+            level += 1
+
+    for candidate in candidates:
+        candidate.score *= 1 - candidate.link_density
+    return candidates
+
+
+def _is_boilerplate(node: _Node) -> bool:
+    """Check if a container inside the main content should be dropped"""
+    if node.tag not in _CLEANED_TAGS:
+        return False
+    if node.class_weight() < 0:
+        return node.link_density > 0.2 or node.text_length < MIN_EXTRACTED_TEXT
+    if node.tag in ("ul", "ol", "div", "section") and node.text_length:
+        return node.link_density > 0.5 and node.text_length < 2 * MIN_EXTRACTED_TEXT
+    return False
+
+
+def _events(parts: list[_Node]) -> Iterator[tuple]:
+    """
+    Parser events for the cleaned subtrees, in document order
+
+    Yields ("start", tag, attrs), ("data", text) and ("end", tag) tuples;
+    boilerplate containers inside the parts are skipped.
+    """
+    stack = list(reversed(parts))
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            yield ("data", item)
+            continue
+        if isinstance(item, tuple):
+            yield item
+            continue
+        if item not in parts and _is_boilerplate(item):
+            continue
+
+        yield ("start", item.tag, [(k, v) for k, v in item.attrs.items() if k in _KEEP_ATTRS])
+        if item.tag not in _VOID_TAGS:
+            stack.append(("end", item.tag))
+            stack.extend(reversed(item.children))
+
+
+class MainContent:
+    """Main content of a page selected by find_main_content()"""
+
+    def __init__(self, parts: list, original_size: int):
+        self._parts = parts
+        self.original_size = original_size
+        self.extracted_size = sum(
+            len(event[1].strip()) for event in _events(parts) if event[0] == "data"
+        )
+
+    def replay(self, handler) -> None:
+        """
+        Feed the content to an HTMLParser-style handler without re-parsing
+
+        Args:
+            handler: Object with handle_starttag, handle_data and handle_endtag
+        """
+        for event in _events(self._parts):
+            kind = event[0]
+            if kind == "data":
+                handler.handle_data(event[1])
+            elif kind == "start":
+                handler.handle_starttag(event[1], event[2])
+            else:
+                handler.handle_endtag(event[1])
+
+    def to_html(self) -> str:
+        """Serialize the content as HTML"""
+        out = []
+        for event in _events(self._parts):
+            kind = event[0]
+            if kind == "data":
+                text = event[1]
+                out.append(escape(text, quote=False) if "&" in text or "<" in text or ">" in text else text)
+            elif kind == "start":
+                attrs = "".join(f' {name}="{escape(value)}"' for name, value in event[2])
+                out.append(f"<{event[1]}{attrs}>")
+            else:
+                out.append(f"</{event[1]}>")
+        return "".join(out)
+
+    def to_markdown(self) -> str:
+        """Convert the content with the built-in Markdown converter"""
+        return convert_events(self.replay)
+
+
+def find_main_content(html: str, min_text: int = MIN_EXTRACTED_TEXT) -> Optional[MainContent]:
+    """
+    Locate the main content of a page
+
+    Density-based boilerplate removal in the spirit of Readability: text
+    blocks are scored by length and punctuation, scores are credited to
+    their containers, containers are penalized for link density and
+    boilerplate-like class names, and the best container is kept together
+    with siblings that score close to it. Navigation, sidebars, footers,
+    scripts and forms are dropped.
+
+    Args:
+        html: Full page HTML
+        min_text: Minimum text length of a usable extraction
+
+    Returns:
+        MainContent, or None when no container stands out (callers should
+        then use the full page)
+    """
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+
+    nodes = _walk(builder.root)
+    _measure(nodes)
+    candidates = _score(nodes)
+    if not candidates:
+        return None
+
+    best = max(candidates, key=lambda n: n.score)
+    threshold = max(10.0, best.score * 0.2)
+
+    # Prefer the outermost wrapper that adds no text of its own
+    while best.parent is not None and best.parent.tag != "root" \
+            and best.parent.text_length <= best.text_length * 1.1:
+        best = best.parent
+
+    # Siblings that look like part of the same article
+    parts = []
+    for sibling in best.parent.children:
+        if not isinstance(sibling, _Node):
+            continue
+        if sibling is best:
+            parts.append(sibling)
+        elif sibling.score is not None and sibling.score >= threshold:
+            parts.append(sibling)
+        elif sibling.tag in _SIBLING_BLOCKS and sibling.text_length > 80 and sibling.link_density < 0.25:
+            parts.append(sibling)
+        elif sibling.tag == "h1" and sibling.link_density < 0.5:
+            parts.append(sibling)
+
+    if sum(part.text_length for part in parts) < min_text:
+        return None
+
+    return MainContent(parts, builder.root.text_length + builder.dropped_text)
+
+
+def extract_main_content(html: str, min_text: int = MIN_EXTRACTED_TEXT) -> Optional[str]:
+    """
+    Extract the main content of a page as HTML
+
+    Args:
+        html: Full page HTML
+        min_text: Minimum text length of a usable extraction
+
+    Returns:
+        HTML of the main content, or None when no container stands out
+    """
+    main = find_main_content(html, min_text)
+    return main.to_html() if main is not None else None
@@ -0,0 +1,201 @@
+"""Compact in-memory and spill-to-disk content storage module"""
+
+import tempfile
+import threading
+import zlib
+from typing import Optional, Union
+
+
+# Content shorter than this (in characters) is kept as a plain str
+DEFAULT_COMPRESS_THRESHOLD = 4 * 1024
+# Compressed content larger than this (in bytes) is written to disk
+DEFAULT_SPILL_THRESHOLD = 256 * 1024
+# Spill file size at which a new file is started
+DEFAULT_ROTATE_BYTES = 64 * 1024 * 1024
+
+
+class SpillFile:
+    """
+    Append-only temporary file holding spilled content blocks
+
+    The file is unlinked on creation, so the operating system reclaims it
+    when the process exits. Blocks are counted while they are referenced:
+    once the last one is released the file is truncated, or closed if it
+    was retired (see ContentStore rotate_bytes).
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self._file = tempfile.TemporaryFile(prefix="scrapion-spill-", dir=directory)
+        self._lock = threading.Lock()
+        self.size = 0
+        self.live_blocks = 0
+        self.live_bytes = 0
+        self.retired = False
+
+    def write(self, data: bytes) -> "SpilledBlock":
+        """Append a block and return a handle to it"""
+        with self._lock:
+            offset = self.size
+            self._file.seek(offset)
+            self._file.write(data)
+            self.size += len(data)
+            self.live_blocks += 1
+            self.live_bytes += len(data)
+        return SpilledBlock(self, offset, len(data))
+
+    def read(self, offset: int, length: int) -> bytes:
+        """Read a block written by write()"""
+        with self._lock:
+            self._file.flush()
+            self._file.seek(offset)
+            return self._file.read(length)
+
+    def release(self, length: int) -> None:
+        """Forget a block; called when its SpilledBlock is collected"""
+        with self._lock:
+            self.live_blocks -= 1
+            self.live_bytes -= length
+            if self.live_blocks or self._file.closed:
+                return
+            if self.retired:
+                self._file.close()
+            else:
+                # Nothing references the file any more: start over
+                self._file.truncate(0)
+                self.size = 0
+
+    def retire(self) -> None:
+        """Stop writing to the file; it closes when its last block is released"""
+        with self._lock:
+            self.retired = True
+            if not self.live_blocks:
+                self._file.close()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class SpilledBlock:
+    """Compressed content stored in a SpillFile, released when collected"""
+
+    __slots__ = ("spill", "offset", "length")
+
+    def __init__(self, spill: SpillFile, offset: int, length: int):
+        self.spill = spill
+        self.offset = offset
+        self.length = length
+
+    def read(self) -> bytes:
+        return self.spill.read(self.offset, self.length)
+
+    def __del__(self):
+        try:
+            self.spill.release(self.length)
+        except Exception:
+            # Interpreter shutdown or a closed store
+            pass
+
+
+# What a ContentStore hands back: the text itself, its zlib-compressed
+# UTF-8 bytes, or a SpilledBlock of compressed bytes on disk
+Stored = Union[str, bytes, SpilledBlock]
+
+
+class ContentStore:
+    """
+    Packs page content so that many results can be held cheaply
+
+    Short content stays a str. Longer content is zlib-compressed, and
+    compressed blocks above the spill threshold are moved to a temporary
+    file. Unpacking restores the exact original string.
+
+    Disk space follows the results that are still alive: a spill file is
+    truncated once none of its blocks is referenced, and after
+    `rotate_bytes` a new file is started so the old one can be deleted
+    when its last result is released.
+    """
+
+    def __init__(
+        self,
+        compress_threshold: Optional[int] = DEFAULT_COMPRESS_THRESHOLD,
+        spill_threshold: Optional[int] = DEFAULT_SPILL_THRESHOLD,
+        spill_dir: Optional[str] = None,
+        level: int = 1,
+        rotate_bytes: int = DEFAULT_ROTATE_BYTES,
+    ):
+        """
+        Initialize content store
+
+        Args:
+            compress_threshold: Characters above which content is compressed;
+                None keeps everything as plain strings
+            spill_threshold: Compressed bytes above which content goes to
+                disk; None keeps everything in memory
+            spill_dir: Directory for the spill file (system temp by default)
+            level: zlib compression level (1 fastest, 9 smallest)
+            rotate_bytes: Spill file size at which a new file is started
+        """
+        if rotate_bytes < 1:
+            raise ValueError("rotate_bytes must be at least 1")
+        self.compress_threshold = compress_threshold
+        self.spill_threshold = spill_threshold
+        self.spill_dir = spill_dir
+        self.level = level
+        self.rotate_bytes = rotate_bytes
+        self._spill = None
+        self._spill_lock = threading.Lock()
+
+    def _spill_file(self, length: int) -> SpillFile:
+        with self._spill_lock:
+            if self._spill is not None and self._spill.size and self._spill.size + length > self.rotate_bytes:
+                self._spill.retire()
+                self._spill = None
+            if self._spill is None:
+                self._spill = SpillFile(self.spill_dir)
+            return self._spill
+
+    def pack(self, text: Optional[str]) -> Optional[Stored]:
+        """Encode content for storage"""
+        if text is None or self.compress_threshold is None or len(text) <= self.compress_threshold:
+            return text
+
+        data = zlib.compress(text.encode("utf-8"), self.level)
+        if self.spill_threshold is not None and len(data) > self.spill_threshold:
+            return self._spill_file(len(data)).write(data)
+        return data
+
+    @staticmethod
+    def unpack(stored: Optional[Stored]) -> Optional[str]:
+        """Decode content produced by pack()"""
+        if stored is None or isinstance(stored, str):
+            return stored
+        if isinstance(stored, SpilledBlock):
+            stored = stored.read()
+        return zlib.decompress(stored).decode("utf-8")
+
+    @staticmethod
+    def kind(stored: Optional[Stored]) -> str:
+        """Storage of packed content: none, plain, compressed or spilled"""
+        if stored is None:
+            return "none"
+        if isinstance(stored, str):
+            return "plain"
+        if isinstance(stored, SpilledBlock):
+            return "spilled"
+        return "compressed"
+
+    @property
+    def spilled_bytes(self) -> int:
+        """Bytes of live results in the current spill file"""
+        return self._spill.live_bytes if self._spill is not None else 0
+
+    def close(self) -> None:
+        """Delete the spill file; spilled content becomes unreadable"""
+        with self._spill_lock:
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+
+
+# Store used by ScrapeResult unless configured otherwise
+default_store = ContentStore()
@@ -0,0 +1,217 @@
+"""Crawl frontier module"""
+
+import heapq
+import itertools
+import posixpath
+from collections import Counter
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+from .url_utils import get_host, normalize_url
+
+
+def _site(url: str) -> str:
+    """Host of a URL without a leading "www." """
+    host = get_host(url)
+    return host[4:] if host.startswith("www.") else host
+
+
+# Links to files that are never worth rendering as Markdown
+SKIPPED_EXTENSIONS = frozenset((
+    ".7z", ".avi", ".bmp", ".css", ".csv", ".dmg", ".doc", ".docx", ".exe", ".gif",
+    ".gz", ".ico", ".iso", ".jpeg", ".jpg", ".js", ".json", ".mov", ".mp3", ".mp4",
+    ".pdf", ".png", ".ppt", ".pptx", ".rar", ".svg", ".tar", ".tgz", ".wav", ".webm",
+    ".webp", ".woff", ".woff2", ".xls", ".xlsx", ".xml", ".zip",
+))
+
+# Orders frontier entries; lower values are fetched first
+Priority = Callable[[str, int], float]
+
+
+def depth_priority(url: str, depth: int) -> float:
+    """Breadth-first order: shallow pages first, then discovery order"""
+    return float(depth)
+
+
+class CrawlItem:
+    """URL waiting in the frontier"""
+
+    __slots__ = ("url", "depth", "parent", "priority")
+
+    def __init__(self, url: str, depth: int, parent: Optional[str], priority: float):
+        self.url = url
+        self.depth = depth
+        self.parent = parent
+        self.priority = priority
+
+
+class Frontier:
+    """
+    Priority queue of URLs to crawl with normalized-URL deduplication
+
+    Every URL is admitted at most once, compared by normalize_url(), so
+    links that only differ in fragment, parameter order or default port
+    are fetched once. pop() honours per-host concurrency and page limits:
+    hosts at their limit are skipped until release() is called.
+    """
+
+    def __init__(
+        self,
+        max_depth: int = 2,
+        max_pages: int = 50,
+        same_host_only: bool = True,
+        per_host_concurrency: int = 2,
+        max_pages_per_host: Optional[int] = None,
+        priority: Optional[Priority] = None,
+    ):
+        """
+        Initialize frontier
+
+        Args:
+            max_depth: Links deeper than this many hops from a seed are
+                dropped (0 crawls only the seeds)
+            max_pages: Pages handed out by pop() in total
+            same_host_only: Only admit links on the host of a seed or the
+                host it redirected to ("www." ignored)
+            per_host_concurrency: Pages of one host in flight at once
+            max_pages_per_host: Pages handed out per host; unlimited when None
+            priority: Callable (url, depth) -> float; lower is fetched
+                first (default: depth_priority)
+        """
+        if max_depth < 0:
+            raise ValueError("max_depth must not be negative")
+        if max_pages < 1:
+            raise ValueError("max_pages must be at least 1")
+        if per_host_concurrency < 1:
+            raise ValueError("per_host_concurrency must be at least 1")
+
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.same_host_only = same_host_only
+        self.per_host_concurrency = per_host_concurrency
+        self.max_pages_per_host = max_pages_per_host
+        self.priority = priority or depth_priority
+
+        self.hosts = set()
+        self.seen = set()
+        self.handed_out = 0
+        self.dropped = Counter()
+        self._heap = []
+        self._order = itertools.count()
+        self._active = Counter()
+        self._per_host = Counter()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    @property
+    def exhausted(self) -> bool:
+        """True when no more pages will be handed out"""
+        return self.handed_out >= self.max_pages or not self._heap
+
+    def add_seed(self, url: str) -> bool:
+        """Admit a start URL at depth 0; its host is always allowed"""
+        self.allow_host(url)
+        return self.add(url, 0)
+
+    def allow_host(self, url: str) -> None:
+        """
+        Allow links on the host of `url` with same_host_only
+
+        Hosts are compared without a leading "www.". Called for the final
+        URL of a seed that redirected to another host.
+        """
+        self.hosts.add(_site(url))
+
+    def add(self, url: str, depth: int, parent: Optional[str] = None) -> bool:
+        """
+        Admit a discovered URL unless it was seen or is out of scope
+
+        Args:
+            url: Absolute URL
+            depth: Hops from the seed
+            parent: URL of the page that linked to it
+
+        Returns:
+            True if the URL was queued
+        """
+        reason = self._rejection(url, depth)
+        if reason is not None:
+            self.dropped[reason] += 1
+            return False
+
+        self.seen.add(normalize_url(url))
+        priority = self.priority(url, depth)
+        heapq.heappush(self._heap, (priority, next(self._order), CrawlItem(url, depth, parent, priority)))
+        return True
+
+    def _rejection(self, url: str, depth: int) -> Optional[str]:
+        if depth > self.max_depth:
+            return "depth"
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            return "scheme"
+        if self.same_host_only and _site(url) not in self.hosts:
+            return "host"
+        if posixpath.splitext(parts.path.lower())[1] in SKIPPED_EXTENSIONS:
+            return "extension"
+        if normalize_url(url) in self.seen:
+            return "duplicate"
+        return None
+
+    def add_links(self, links: list[str], parent: CrawlItem) -> int:
+        """
+        Admit the links of a fetched page one hop deeper
+
+        Returns:
+            Number of links queued
+        """
+        if parent.depth >= self.max_depth:
+            self.dropped["depth"] += len(links)
+            return 0
+        return sum(self.add(link, parent.depth + 1, parent.url) for link in links)
+
+    def pop(self) -> Optional[CrawlItem]:
+        """
+        Take the best URL whose host is below its limits
+
+        Returns:
+            CrawlItem, or None when the page budget is used up or every
+            queued host is busy or at its page limit
+        """
+        if self.handed_out >= self.max_pages:
+            return None
+
+        deferred = []
+        item = None
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            host = get_host(entry[2].url)
+            if self.max_pages_per_host is not None and self._per_host[host] >= self.max_pages_per_host:
+                self.dropped["host_limit"] += 1
+                continue
+            if self._active[host] >= self.per_host_concurrency:
+                deferred.append(entry)
+                continue
+            item = entry[2]
+            self._active[host] += 1
+            self._per_host[host] += 1
+            self.handed_out += 1
+            break
+
+        for entry in deferred:
+            heapq.heappush(self._heap, entry)
+        return item
+
+    def release(self, item: CrawlItem) -> None:
+        """Mark a popped URL as finished so its host can take another"""
+        self._active[get_host(item.url)] -= 1
+
+    def get_stats(self) -> dict:
+        """Frontier counters"""
+        return {
+            "queued": len(self._heap),
+            "seen": len(self.seen),
+            "handed_out": self.handed_out,
+            "dropped": dict(self.dropped),
+        }
@@ -0,0 +1,722 @@
+"""Multi-node work distribution module"""
+
+import asyncio
+import itertools
+import hmac
+import ipaddress
+import json
+import socket
+from collections import deque
+from typing import AsyncIterator, Iterable, Optional
+
+from .host_stats import AdaptiveOrdering
+from .input_handler import InputHandler, InputType
+from .list_manager import OrderingPolicy, UrlListManager
+from .report_generator import Report, ScrapeResult
+from .report_sink import NdjsonReportSink
+from .tracing import Trace, span
+
+
+DEFAULT_PORT = 7450
+
+# Task kinds a worker can take; a worker may be limited to one of them
+TASK_KINDS = ("search", "scrape")
+
+# Longest protocol line; scrape results carry whole pages
+_MAX_MESSAGE = 64 * 1024 * 1024
+
+
+def parse_address(value: str, default_host: str = "127.0.0.1") -> tuple[str, int]:
+    """
+    Split a "host:port" address
+
+    Args:
+        value: "host:port", "host", ":port" or "[ipv6]:port"
+        default_host: Host used when the address has none
+
+    Returns:
+        Tuple of (host, port)
+    """
+    host, sep, port = value.rpartition(":")
+    if not sep or "]" in port:
+        host, port = value, ""
+    host = host.strip("[]") or default_host
+    if not port:
+        return host, DEFAULT_PORT
+    if not port.isdigit() or not 0 <= int(port) <= 65535:
+        raise ValueError(f"invalid port in address: {value!r}")
+    return host, int(port)
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _encode(message: dict) -> bytes:
+    return json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+class _Task:
+    """A search or scrape handed out to workers"""
+
+    __slots__ = ("id", "kind", "run", "query", "url", "source", "attempts", "worker", "deadline")
+
+    def __init__(self, task_id: int, kind: str, run: "_InputRun", query=None, url=None, source=None):
+        self.id = task_id
+        self.kind = kind
+        self.run = run
+        self.query = query
+        self.url = url
+        self.source = source
+        self.attempts = 0
+        self.worker = None
+        self.deadline = 0.0
+
+    def message(self) -> dict:
+        if self.kind == "search":
+            return {"type": "task", "id": self.id, "kind": "search", "query": self.query}
+        return {"type": "task", "id": self.id, "kind": "scrape", "url": self.url, "source": self.source}
+
+
+class _InputRun:
+    """Progress of one input on the coordinator"""
+
+    def __init__(self, report: Report, list_manager: Optional[UrlListManager] = None):
+        self.report = report
+        self.list_manager = list_manager
+        self.tasks = set()
+        self.successes = 0
+
+
+class _WorkerConnection:
+    """A connected worker and the tasks it holds"""
+
+    def __init__(self, worker_id: int, name: str, capacity: int, roles: tuple, writer):
+        self.worker_id = worker_id
+        self.name = name
+        self.capacity = capacity
+        self.roles = roles
+        self.writer = writer
+        self.tasks = set()
+        # Set when a lease runs out; the worker gets no new tasks until it
+        # is heard from again
+        self.stalled = False
+
+    def send(self, message: dict) -> None:
+        if not self.writer.is_closing():
+            self.writer.write(_encode(message))
+
+
+class Coordinator:
+    """
+    Hands out searches and scrapes to workers on other machines
+
+    Workers connect over TCP and exchange JSON lines (see run_worker).
+    The coordinator parses the inputs, sends each search query out as a
+    search task, splits the returned links into main and backup lists
+    and sends every URL out as its own scrape task, so the two phases of
+    one input can run on different workers. Results come back to the
+    coordinator, which assembles the reports and writes them to its sink.
+
+    Every task is leased to one worker at a time. Workers renew their
+    leases with heartbeats; a task whose lease expires or whose worker
+    disconnects is handed to another worker, up to `max_attempts` times.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        lease_seconds: float = 60.0,
+        max_attempts: int = 3,
+        concurrency: int = 1,
+        target_successes: int = 1,
+        max_urls_per_host: Optional[int] = None,
+        url_order: Optional[OrderingPolicy] = None,
+        report_sink: Optional[NdjsonReportSink] = None,
+        token: Optional[str] = None,
+    ):
+        """
+        Initialize coordinator
+
+        Args:
+            host: Interface to listen on ("0.0.0.0" for all)
+            port: TCP port; 0 picks a free one (see `port` after run starts)
+            lease_seconds: Seconds a task stays with a worker that sends
+                no heartbeat
+            max_attempts: Times a task is handed out before it is given up
+            concurrency: URLs of one input scraped at once (default: 1)
+            target_successes: Stop scraping an input once this many URLs
+                succeeded (default: 1)
+            max_urls_per_host: Keep at most this many search result links
+                per host in the main and backup lists (default: unlimited)
+            url_order: Optional policy reordering search result links
+                before the main and backup lists are split
+            report_sink: Optional NdjsonReportSink every result is written
+                to as it arrives
+            token: Shared secret workers must send to connect; without
+                one any client that reaches the port can take work, so
+                keep the default loopback `host` or a private network
+        """
+        if lease_seconds <= 0:
+            raise ValueError("lease_seconds must be positive")
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if target_successes < 1:
+            raise ValueError("target_successes must be at least 1")
+        if max_urls_per_host is not None and max_urls_per_host < 1:
+            raise ValueError("max_urls_per_host must be at least 1")
+
+        self.host = host
+        self.port = port
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.concurrency = concurrency
+        self.target_successes = target_successes
+        self.max_urls_per_host = max_urls_per_host
+        self.url_order = url_order
+        self.report_sink = report_sink
+        self.token = token
+
+        self.reassigned = 0
+        self._inputs = iter(())
+        self._exhausted = False
+        self._done = False
+        self._ready = deque()
+        self._tasks = {}
+        self._runs = set()
+        self._workers = {}
+        self._task_ids = itertools.count()
+        self._worker_ids = itertools.count()
+        self._reports = None
+
+    async def run(self, inputs: Iterable[str]) -> AsyncIterator[Report]:
+        """
+        Serve workers until every input has a report
+
+        Inputs are read lazily as workers have room, so `inputs` may be a
+        file object. Blank inputs are skipped.
+
+        Args:
+            inputs: URLs and/or search queries
+
+        Yields:
+            One Report per input, in completion order
+        """
+        self._inputs = iter(inputs)
+        self._reports = asyncio.Queue()
+        server = await asyncio.start_server(self._serve_worker, self.host, self.port, limit=_MAX_MESSAGE)
+        self.port = server.sockets[0].getsockname()[1]
+        print(f"[COORDINATOR] Listening on {self.host}:{self.port}")
+        if self.token is None and not _is_loopback(self.host):
+            print("[COORDINATOR] Warning: no token set; any client that reaches this port can connect")
+        reaper = asyncio.ensure_future(self._expire_leases())
+        try:
+            # Reads the first input, so an empty input list ends the run
+            # without waiting for a worker
+            self._schedule()
+            while True:
+                report = await self._reports.get()
+                if report is None:
+                    return
+                yield report
+        finally:
+            self._done = True
+            reaper.cancel()
+            for worker in list(self._workers.values()):
+                worker.send({"type": "shutdown"})
+                # Buffered messages are flushed before the socket closes
+                worker.writer.close()
+            server.close()
+            await server.wait_closed()
+            await asyncio.gather(reaper, return_exceptions=True)
+
+    def get_stats(self) -> dict:
+        """Coordinator counters"""
+        return {
+            "workers": len(self._workers),
+            "open_inputs": len(self._runs),
+            "ready_tasks": len(self._ready),
+            "leased_tasks": sum(len(worker.tasks) for worker in self._workers.values()),
+            "reassigned": self.reassigned,
+        }
+
+    async def _serve_worker(self, reader, writer) -> None:
+        """Talk to one connected worker until it disconnects"""
+        worker = None
+        try:
+            try:
+                hello = json.loads(await reader.readline() or b"null")
+            except ValueError:
+                hello = None
+            if not isinstance(hello, dict) or hello.get("type") != "hello":
+                writer.write(_encode({"type": "denied", "error": "expected a hello message"}))
+                return
+            if self.token is not None and not hmac.compare_digest(
+                str(hello.get("token") or "").encode(), self.token.encode()
+            ):
+                print("[COORDINATOR] Rejected a worker with a wrong token")
+                writer.write(_encode({"type": "denied", "error": "wrong token"}))
+                return
+            if self._done:
+                writer.write(_encode({"type": "shutdown"}))
+                return
+
+            roles = hello.get("roles", list(TASK_KINDS))
+            capacity = hello.get("capacity", 1)
+            if not isinstance(roles, list) or not isinstance(capacity, int):
+                writer.write(_encode({"type": "denied", "error": "roles must be a list, capacity an integer"}))
+                return
+            roles = tuple(role for role in roles if role in TASK_KINDS)
+            worker = _WorkerConnection(
+                next(self._worker_ids),
+                str(hello.get("name") or "worker"),
+                max(1, capacity),
+                roles or TASK_KINDS,
+                writer,
+            )
+            self._workers[worker.worker_id] = worker
+            worker.send({"type": "welcome", "worker_id": worker.worker_id, "lease": self.lease_seconds})
+            print(
+                f"[COORDINATOR] Worker {worker.name} connected "
+                f"(capacity {worker.capacity}, {', '.join(worker.roles)})"
+            )
+            self._schedule()
+
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                self._handle(worker, line)
+                await writer.drain()
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError) as e:
+            print(f"[COORDINATOR] Worker connection error: {e}")
+        finally:
+            if worker is not None:
+                self._drop_worker(worker)
+            writer.close()
+
+    def _handle(self, worker: _WorkerConnection, line: bytes) -> None:
+        """Process one message line from a worker; malformed ones are answered with "invalid" """
+        try:
+            message = json.loads(line)
+        except ValueError as e:
+            self._reject(worker, f"not JSON: {e}")
+            return
+        if not isinstance(message, dict):
+            self._reject(worker, "message must be an object")
+            return
+
+        if worker.stalled:
+            print(f"[COORDINATOR] Worker {worker.name} is responding again")
+            worker.stalled = False
+        kind = message.get("type")
+        if kind == "heartbeat":
+            deadline = asyncio.get_running_loop().time() + self.lease_seconds
+            for task_id in worker.tasks:
+                self._tasks[task_id].deadline = deadline
+            self._schedule()
+            return
+        if kind not in ("result", "error"):
+            self._reject(worker, f"unknown message type: {kind!r}")
+            return
+        task_id = message.get("id")
+        if not isinstance(task_id, int) or isinstance(task_id, bool):
+            self._reject(worker, f"{kind} message without a task id")
+            return
+
+        task = self._tasks.get(task_id)
+        if task is None or task.worker is not worker:
+            # Expired or cancelled while the worker was still on it
+            return
+        error = message.get("error")
+        if kind == "result":
+            try:
+                outcome = self._parse_result(task, message)
+            except (KeyError, TypeError, ValueError) as e:
+                self._reject(worker, f"invalid result for task {task_id}: {e!r}")
+                kind, error = "error", f"invalid result: {e!r}"
+
+        self._detach(task)
+        if kind == "error":
+            print(f"[COORDINATOR] Task {task.id} failed on {worker.name}: {error}")
+            self._retry(task)
+        elif task.kind == "search":
+            urls, timings = outcome
+            run = task.run
+            self._complete(task)
+            run.report.timings = timings
+            if isinstance(self.url_order, AdaptiveOrdering):
+                asyncio.ensure_future(self._order_search(run, urls))
+            else:
+                self._search_done(run, urls)
+        else:
+            self._scrape_done(task, outcome)
+        self._schedule()
+
+    def _parse_result(self, task: _Task, message: dict):
+        """
+        Check and decode the payload of a result message
+
+        Returns:
+            (urls, timings) for a search, a ScrapeResult for a scrape
+
+        Raises:
+            KeyError, TypeError or ValueError when the payload is malformed
+        """
+        if task.kind == "search":
+            urls = message["urls"]
+            timings = message.get("timings") or {}
+            if not isinstance(urls, list) or not all(isinstance(url, str) for url in urls):
+                raise TypeError("urls must be a list of strings")
+            if not isinstance(timings, dict):
+                raise TypeError("timings must be an object")
+            return urls, timings
+
+        data = message["result"]
+        if not isinstance(data, dict):
+            raise TypeError("result must be an object")
+        if not isinstance(data["url"], str) or not isinstance(data["accessible"], bool):
+            raise TypeError("result needs a url string and an accessible flag")
+        return ScrapeResult.from_dict(data, pack=self.report_sink is None)
+
+    @staticmethod
+    def _reject(worker: _WorkerConnection, error: str) -> None:
+        print(f"[COORDINATOR] Invalid message from {worker.name}: {error}")
+        worker.send({"type": "invalid", "error": error})
+
+    def _drop_worker(self, worker: _WorkerConnection) -> None:
+        """Forget a disconnected worker and hand its tasks to others"""
+        del self._workers[worker.worker_id]
+        if self._done:
+            return
+        print(f"[COORDINATOR] Worker {worker.name} disconnected, reassigning {len(worker.tasks)} task(s)")
+        for task_id in sorted(worker.tasks):
+            task = self._tasks[task_id]
+            self._detach(task)
+            self._retry(task)
+        self._schedule()
+
+    async def _expire_leases(self) -> None:
+        """Take tasks back from workers whose leases ran out"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(min(1.0, self.lease_seconds / 4))
+            now = loop.time()
+            expired = [task for task in self._tasks.values() if task.worker is not None and task.deadline <= now]
+            for task in expired:
+                print(f"[COORDINATOR] Lease of task {task.id} on {task.worker.name} expired")
+                task.worker.stalled = True
+                task.worker.send({"type": "cancel", "id": task.id})
+                self._detach(task)
+                self._retry(task)
+            if expired:
+                self._schedule()
+
+    def _schedule(self) -> None:
+        """Hand ready tasks to workers with free capacity, least loaded first"""
+        assigned = True
+        while assigned:
+            assigned = False
+            workers = sorted(self._workers.values(), key=lambda worker: len(worker.tasks) / worker.capacity)
+            for worker in workers:
+                if worker.stalled or len(worker.tasks) >= worker.capacity:
+                    continue
+                task = self._next_task(worker.roles)
+                if task is None:
+                    continue
+                task.worker = worker
+                task.attempts += 1
+                task.deadline = asyncio.get_running_loop().time() + self.lease_seconds
+                worker.tasks.add(task.id)
+                worker.send(task.message())
+                assigned = True
+        if not self._workers:
+            # Still read ahead, so a run without inputs ends
+            self._next_task(())
+
+    def _next_task(self, roles: tuple) -> Optional[_Task]:
+        """Take the first ready task of the given kinds, opening inputs as needed"""
+        while True:
+            for task in self._ready:
+                if task.kind in roles:
+                    self._ready.remove(task)
+                    return task
+            # Inputs are opened only when nothing at all is waiting, so a
+            # worker without a role does not pull in the whole input file
+            if self._ready or not self._open_next_input():
+                return None
+
+    def _open_next_input(self) -> bool:
+        """Start the next input; False once all inputs were read"""
+        if self._exhausted:
+            return False
+        for user_input in self._inputs:
+            if not user_input.strip():
+                continue
+            input_type, processed_input = InputHandler.parse_input(user_input)
+            if input_type == InputType.URL:
+                print(f"[COORDINATOR] Single URL: {processed_input}")
+                run = _InputRun(
+                    Report(processed_input, "single_url", 1, sink=self.report_sink),
+                    UrlListManager.from_single_url(processed_input),
+                )
+                self._runs.add(run)
+                self._fill(run)
+            else:
+                print(f"[COORDINATOR] Search: {processed_input}")
+                run = _InputRun(Report(processed_input, "multi_url", 10, sink=self.report_sink))
+                self._runs.add(run)
+                self._add_task(_Task(next(self._task_ids), "search", run, query=processed_input))
+            return True
+
+        self._exhausted = True
+        self._check_done()
+        return False
+
+    def _add_task(self, task: _Task) -> None:
+        self._tasks[task.id] = task
+        task.run.tasks.add(task.id)
+        self._ready.append(task)
+
+    def _detach(self, task: _Task) -> None:
+        """Take a task away from its worker"""
+        if task.worker is not None:
+            task.worker.tasks.discard(task.id)
+            task.worker = None
+
+    def _complete(self, task: _Task) -> None:
+        """Forget a finished task"""
+        self._detach(task)
+        del self._tasks[task.id]
+        task.run.tasks.discard(task.id)
+
+    def _retry(self, task: _Task) -> None:
+        """Queue a task taken back from a worker again, or give it up"""
+        if task.attempts < self.max_attempts:
+            self.reassigned += 1
+            # Ahead of new work, so old inputs finish first
+            self._ready.appendleft(task)
+            return
+
+        what = task.query if task.kind == "search" else task.url
+        print(f"[COORDINATOR] Giving up on {task.kind} {what} after {task.attempts} attempt(s)")
+        if task.kind == "search":
+            run = task.run
+            self._complete(task)
+            self._search_done(run, [])
+        else:
+            self._scrape_done(task, ScrapeResult(task.url, "failed", False, source=task.source))
+
+    async def _order_search(self, run: _InputRun, urls: list[str]) -> None:
+        """Read host stats for AdaptiveOrdering off the event loop, then split"""
+        try:
+            order = await self.url_order.load(urls)
+        except Exception as e:
+            print(f"[COORDINATOR] Could not read host stats, keeping search order: {e}")
+            order = list
+        if not self._done:
+            self._search_done(run, urls, order)
+            self._schedule()
+
+    def _search_done(self, run: _InputRun, urls: list[str], order: Optional[OrderingPolicy] = None) -> None:
+        """
+        Split the links found for an input and queue its scrapes
+
+        `order` overrides the coordinator's url_order, e.g. with host
+        stats already loaded.
+        """
+        query = run.report.query
+        if not urls:
+            print(f"[COORDINATOR] No search results for: {query}")
+            self._finish(run)
+            return
+
+        run.list_manager = UrlListManager.from_urls(urls, self.max_urls_per_host, order or self.url_order)
+        stats = run.list_manager.get_stats()
+        print(
+            f"[COORDINATOR] {query}: main list {stats['main_list_size']}, "
+            f"backup list {stats['backup_list_size']}"
+        )
+        self._fill(run)
+
+    def _scrape_done(self, task: _Task, result: ScrapeResult) -> None:
+        """Add a scrape result to its report and queue the next URL"""
+        run = task.run
+        self._complete(task)
+        run.report.add_result(result)
+        run.successes += result.accessible
+        print(f"[COORDINATOR] {result.status}: {result.url}")
+
+        if run.successes >= self.target_successes:
+            # Target reached: drop the input's other scrapes
+            for task_id in list(run.tasks):
+                other = self._tasks[task_id]
+                if other.worker is not None:
+                    other.worker.send({"type": "cancel", "id": task_id})
+                else:
+                    self._ready.remove(other)
+                self._complete(other)
+            self._finish(run)
+        else:
+            self._fill(run)
+
+    def _fill(self, run: _InputRun) -> None:
+        """Queue an input's next URLs, main list first; finish it when none are left"""
+        while len(run.tasks) < self.concurrency and run.successes < self.target_successes:
+            url, source = run.list_manager.get_next()
+            if not url:
+                break
+            self._add_task(_Task(next(self._task_ids), "scrape", run, url=url, source=source.value))
+        if not run.tasks:
+            self._finish(run)
+
+    def _finish(self, run: _InputRun) -> None:
+        self._runs.discard(run)
+        run.report.finish()
+        self._reports.put_nowait(run.report)
+        self._check_done()
+
+    def _check_done(self) -> None:
+        if self._exhausted and not self._runs and not self._done:
+            self._done = True
+            self._reports.put_nowait(None)
+
+
+async def _connect(host: str, port: int, timeout: float):
+    """Open a connection, retrying while the coordinator is not up yet"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        try:
+            return await asyncio.open_connection(host, port, limit=_MAX_MESSAGE)
+        except OSError:
+            if loop.time() >= deadline:
+                raise
+            await asyncio.sleep(1.0)
+
+
+async def run_worker(
+    client,
+    address: str,
+    capacity: int = 4,
+    roles: Iterable[str] = TASK_KINDS,
+    name: Optional[str] = None,
+    connect_timeout: float = 30.0,
+    token: Optional[str] = None,
+) -> int:
+    """
+    Process tasks from a coordinator until it shuts down
+
+    Searches and scrapes run on `client` with its own settings (fetch
+    tier, readiness, caches, scheduler, ...); their results are sent back
+    to the coordinator instead of being added to a report.
+
+    Args:
+        client: AsyncClient doing the work
+        address: Coordinator "host:port"
+        capacity: Tasks processed at once
+        roles: Task kinds to take, "search" and/or "scrape"
+        name: Name shown by the coordinator (default: host name)
+        connect_timeout: Seconds to keep retrying the first connection
+        token: Shared secret of the coordinator, if it has one
+
+    Returns:
+        Number of tasks received
+    """
+    roles = tuple(roles)
+    if capacity < 1:
+        raise ValueError("capacity must be at least 1")
+    if not roles or any(role not in TASK_KINDS for role in roles):
+        raise ValueError(f"roles must be taken from {', '.join(TASK_KINDS)}")
+
+    host, port = parse_address(address)
+    reader, writer = await _connect(host, port, connect_timeout)
+    lock = asyncio.Lock()
+    running = {}
+    received = 0
+
+    async def send(message: dict) -> None:
+        async with lock:
+            writer.write(_encode(message))
+            await writer.drain()
+
+    async def heartbeat(interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await send({"type": "heartbeat"})
+
+    async def execute(message: dict) -> None:
+        task_id = message["id"]
+        try:
+            if message["kind"] == "search":
+                trace = Trace(message["query"], hook=client.trace_hook)
+                with trace.activate(), span("total"), span("search"):
+                    urls = await client._search_and_extract_urls(message["query"])
+                reply = {"type": "result", "id": task_id, "urls": urls, "timings": trace.timings()}
+            else:
+                result = await client._scrape(message["url"], message.get("source", "unknown"))
+                reply = {"type": "result", "id": task_id, "result": result.to_dict()}
+        except Exception as e:
+            reply = {"type": "error", "id": task_id, "error": f"{e.__class__.__name__}: {e}"}
+        finally:
+            running.pop(task_id, None)
+        try:
+            await send(reply)
+        except ConnectionError:
+            # The coordinator is gone and reassigns the task by itself
+            pass
+
+    beat = None
+    try:
+        await send({
+            "type": "hello",
+            "name": name or socket.gethostname(),
+            "capacity": capacity,
+            "roles": list(roles),
+            "token": token,
+        })
+        welcome = json.loads(await reader.readline() or b"null")
+        if not isinstance(welcome, dict) or welcome.get("type") != "welcome":
+            if isinstance(welcome, dict) and welcome.get("type") == "denied":
+                print(f"[WORKER] Coordinator refused the connection: {welcome.get('error')}")
+            else:
+                print("[WORKER] Coordinator has no work")
+            return received
+        print(f"[WORKER] Connected to {host}:{port} as worker {welcome['worker_id']}")
+        beat = asyncio.ensure_future(heartbeat(welcome["lease"] / 3))
+
+        while True:
+            line = await reader.readline()
+            if not line:
+                print("[WORKER] Coordinator closed the connection")
+                break
+            message = json.loads(line)
+            if message["type"] == "task":
+                received += 1
+                running[message["id"]] = asyncio.ensure_future(execute(message))
+            elif message["type"] == "cancel":
+                task = running.pop(message["id"], None)
+                if task is not None:
+                    task.cancel()
+            elif message["type"] == "invalid":
+                print(f"[WORKER] Coordinator rejected a message: {message.get('error')}")
+            elif message["type"] == "shutdown":
+                print("[WORKER] Coordinator finished")
+                break
+    finally:
+        pending = list(running.values())
+        if beat is not None:
+            pending.append(beat)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        writer.close()
+    return received
@@ -0,0 +1,308 @@
+"""Per-host fetch statistics module"""
+
+import functools
+import time
+from typing import Callable, Iterable, Optional
+
+from .cache import _SqliteStore
+from .url_utils import canonicalize_url, get_host
+
+
+# Outcomes recorded per fetch
+OUTCOMES = ("success", "failure", "timeout", "blocked")
+
+# Failure messages that mean the site refused us rather than broke
+_BLOCK_MARKERS = ("status_401", "status_403", "status_429", "status_503", "challenge")
+
+
+def classify_error(error: BaseException) -> str:
+    """
+    Outcome of a failed fetch
+
+    Args:
+        error: Exception raised by fetch_page
+
+    Returns:
+        "timeout", "blocked" or "failure"
+    """
+    message = str(error)
+    if isinstance(error, TimeoutError) or "Timeout" in type(error).__name__ or "Timeout " in message:
+        return "timeout"
+    if any(marker in message for marker in _BLOCK_MARKERS):
+        return "blocked"
+    return "failure"
+
+
+def _percentile(values: list[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of values sorted ascending"""
+    if not values:
+        return None
+    index = min(len(values) - 1, max(0, int(round(fraction * len(values) + 0.5)) - 1))
+    return values[index]
+
+
+class HostStat:
+    """Summary of the recent fetches of one host"""
+
+    def __init__(self, host: str, outcomes: list[str], seconds: list[float], success_seconds: list[float]):
+        self.host = host
+        self.attempts = len(outcomes)
+        self.successes = outcomes.count("success")
+        self.timeouts = outcomes.count("timeout")
+        self.blocked = outcomes.count("blocked")
+        # Mean seconds per attempt, failures included: what trying this
+        # host costs on average
+        self.mean_seconds = sum(seconds) / len(seconds) if seconds else None
+        success_seconds = sorted(success_seconds)
+        self.p50 = _percentile(success_seconds, 0.5)
+        self.p90 = _percentile(success_seconds, 0.9)
+
+    @property
+    def success_rate(self) -> float:
+        return self.successes / self.attempts if self.attempts else 0.0
+
+    @property
+    def block_rate(self) -> float:
+        return self.blocked / self.attempts if self.attempts else 0.0
+
+    @property
+    def timeout_rate(self) -> float:
+        return self.timeouts / self.attempts if self.attempts else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "host": self.host,
+            "attempts": self.attempts,
+            "success_rate": round(self.success_rate, 3),
+            "block_rate": round(self.block_rate, 3),
+            "timeout_rate": round(self.timeout_rate, 3),
+            "mean_seconds": None if self.mean_seconds is None else round(self.mean_seconds, 3),
+            "p50_seconds": None if self.p50 is None else round(self.p50, 3),
+            "p90_seconds": None if self.p90 is None else round(self.p90, 3),
+        }
+
+
+class HostStatsStore(_SqliteStore):
+    """
+    Outcome and duration of recent fetches per host
+
+    Keeps the last `window` fetches of every host, so the statistics
+    follow hosts whose behaviour changes. Can share a file with the caches.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS host_fetches (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            host TEXT NOT NULL,
+            outcome TEXT NOT NULL,
+            seconds REAL NOT NULL,
+            tier TEXT,
+            fetched_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS host_fetches_host ON host_fetches (host, id);
+    """
+
+    def __init__(self, path=None, window: int = 100):
+        """
+        Initialize host statistics store
+
+        Args:
+            path: SQLite file path (default: ~/.cache/scrapion/cache.db)
+            window: Fetches kept per host
+        """
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        super().__init__(path)
+        self.window = window
+
+    def record(self, url: str, outcome: str, seconds: float, tier: Optional[str] = None) -> None:
+        """
+        Record a finished fetch and drop the host's fetches beyond the window
+
+        Args:
+            url: Fetched URL (only its host is stored)
+            outcome: One of OUTCOMES
+            seconds: Duration of the fetch
+            tier: Tier that served a successful fetch
+        """
+        if outcome not in OUTCOMES:
+            raise ValueError(f"outcome must be one of {', '.join(OUTCOMES)}, got {outcome!r}")
+        host = get_host(url)
+        if not host:
+            return
+
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute(
+                "INSERT INTO host_fetches (host, outcome, seconds, tier, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (host, outcome, seconds, tier, time.time()),
+            )
+            self._conn.execute(
+                "DELETE FROM host_fetches WHERE host = ? AND id <= ("
+                "SELECT id FROM host_fetches WHERE host = ? ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                (host, host, self.window),
+            )
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def get_many(self, hosts: Iterable[str]) -> dict[str, HostStat]:
+        """
+        Statistics of several hosts
+
+        Args:
+            hosts: Host names
+
+        Returns:
+            Dictionary of host -> HostStat; hosts without fetches are missing
+        """
+        hosts = sorted(set(hosts))
+        if not hosts:
+            return {}
+
+        rows = {}
+        placeholders = ", ".join("?" * len(hosts))
+        for host, outcome, seconds in self._conn.execute(
+            f"SELECT host, outcome, seconds FROM host_fetches WHERE host IN ({placeholders}) ORDER BY id",
+            hosts,
+        ):
+            rows.setdefault(host, []).append((outcome, seconds))
+
+        return {
+            host: HostStat(
+                host,
+                [outcome for outcome, _ in fetches],
+                [seconds for _, seconds in fetches],
+                [seconds for outcome, seconds in fetches if outcome == "success"],
+            )
+            for host, fetches in rows.items()
+        }
+
+    def get(self, host: str) -> Optional[HostStat]:
+        """Statistics of one host, or None if it was never fetched"""
+        return self.get_many([host]).get(host)
+
+    def stats(self) -> dict:
+        """Get store statistics"""
+        hosts, fetches = self._conn.execute(
+            "SELECT COUNT(DISTINCT host), COUNT(*) FROM host_fetches"
+        ).fetchone()
+        return {"hosts": hosts, "fetches": fetches, "window": self.window}
+
+
+class AdaptiveOrdering:
+    """
+    Reorders result links so the first success is likely to come sooner
+
+    Each link is scored by the expected seconds until a success from its
+    host, mean attempt duration / success rate, both smoothed towards a
+    prior so hosts with few fetches keep roughly their rank. The score is
+    multiplied by 1 + rank_penalty * rank so search rank still counts.
+    Hosts that blocked at least `demote_block_rate` of `min_samples` or
+    more fetches go to the end.
+
+    Use as the `url_order` of a client or UrlListManager. Calling it
+    reads the store directly; async code awaits load() instead, which
+    reads it on the store's thread.
+    """
+
+    def __init__(
+        self,
+        store: HostStatsStore,
+        prior_success_rate: float = 0.7,
+        prior_seconds: float = 5.0,
+        prior_weight: float = 2.0,
+        rank_penalty: float = 0.1,
+        min_samples: int = 3,
+        demote_block_rate: float = 0.5,
+    ):
+        """
+        Initialize adaptive ordering
+
+        Args:
+            store: HostStatsStore to read
+            prior_success_rate: Success rate assumed for unknown hosts
+            prior_seconds: Attempt duration assumed for unknown hosts
+            prior_weight: Fetches the prior counts as when smoothing
+            rank_penalty: Score increase per search rank position
+            min_samples: Fetches needed before a host can be demoted
+            demote_block_rate: Block rate at which a host is demoted
+        """
+        if not 0 < prior_success_rate <= 1:
+            raise ValueError("prior_success_rate must be in (0, 1]")
+        self.store = store
+        self.prior_success_rate = prior_success_rate
+        self.prior_seconds = prior_seconds
+        self.prior_weight = prior_weight
+        self.rank_penalty = rank_penalty
+        self.min_samples = min_samples
+        self.demote_block_rate = demote_block_rate
+
+    def expected_seconds(self, stat: Optional[HostStat]) -> float:
+        """Smoothed expected seconds until a success from the host"""
+        weight = self.prior_weight
+        if stat is None or not stat.attempts:
+            return self.prior_seconds / self.prior_success_rate
+        success_rate = (stat.successes + weight * self.prior_success_rate) / (stat.attempts + weight)
+        seconds = (stat.mean_seconds * stat.attempts + weight * self.prior_seconds) / (stat.attempts + weight)
+        return seconds / max(success_rate, 0.01)
+
+    def demoted(self, stat: Optional[HostStat]) -> bool:
+        """Check if a host blocks often enough to be tried last"""
+        return (
+            stat is not None
+            and stat.attempts >= self.min_samples
+            and stat.block_rate >= self.demote_block_rate
+        )
+
+    async def load(self, urls: Iterable[str]) -> Callable[[list[str]], list[str]]:
+        """
+        Read the stats of the links' hosts without blocking the event loop
+
+        Args:
+            urls: Links as found in search results
+
+        Returns:
+            Ordering policy using the stats read (see order())
+        """
+        hosts = set()
+        for url in urls:
+            try:
+                hosts.add(get_host(canonicalize_url(url)))
+            except ValueError:
+                continue
+        stats = await self.store.call(self.store.get_many, hosts)
+        return functools.partial(self.order, stats=stats)
+
+    def __call__(self, urls: list[str]) -> list[str]:
+        """
+        Order links by score, demoted hosts last, reading the store
+
+        Args:
+            urls: Links in search rank order
+
+        Returns:
+            The same links, reordered
+        """
+        return self.order(urls, self.store.get_many(get_host(url) for url in urls))
+
+    def order(self, urls: list[str], stats: dict[str, HostStat]) -> list[str]:
+        """
+        Order links by score, demoted hosts last
+
+        Args:
+            urls: Links in search rank order
+            stats: HostStatsStore.get_many() of the links' hosts
+
+        Returns:
+            The same links, reordered
+        """
+
+        def key(item):
+            rank, url = item
+            stat = stats.get(get_host(url))
+            score = self.expected_seconds(stat) * (1 + self.rank_penalty * rank)
+            return (self.demoted(stat), score, rank)
+
+        return [url for _, url in sorted(enumerate(urls), key=key)]
@@ -0,0 +1,241 @@
+"""Resumable batch job module"""
+
+import json
+import time
+import uuid
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .cache import _SqliteStore, _pack, _unpack
+from .report_generator import Report, ScrapeResult
+from .url_utils import normalize_url
+
+
+DEFAULT_JOB_PATH = Path.home() / ".cache" / "scrapion" / "jobs.db"
+
+# Input states; everything but "done" is picked up again on resume
+INPUT_STATES = ("pending", "running", "done", "failed")
+
+
+class JobStore(_SqliteStore):
+    """
+    Durable record of batch jobs
+
+    Stores every input of a job with its state, the search links found
+    for it and every URL attempt with its full result (zlib-compressed),
+    each committed as soon as it happens. A crashed or killed batch run
+    can be resumed from the last finished URL.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            settings TEXT NOT NULL,
+            created_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS job_inputs (
+            job_id TEXT NOT NULL,
+            idx INTEGER NOT NULL,
+            input TEXT NOT NULL,
+            state TEXT NOT NULL,
+            urls TEXT,
+            summary TEXT,
+            error TEXT,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (job_id, idx)
+        );
+        CREATE INDEX IF NOT EXISTS job_inputs_state ON job_inputs (job_id, state);
+        CREATE TABLE IF NOT EXISTS job_attempts (
+            job_id TEXT NOT NULL,
+            idx INTEGER NOT NULL,
+            key TEXT NOT NULL,
+            url TEXT NOT NULL,
+            status TEXT NOT NULL,
+            result BLOB NOT NULL,
+            attempted_at REAL NOT NULL,
+            PRIMARY KEY (job_id, idx, key)
+        );
+    """
+
+    def __init__(self, path=None):
+        """
+        Initialize job store
+
+        Args:
+            path: SQLite file path (default: ~/.cache/scrapion/jobs.db)
+        """
+        super().__init__(path if path is not None else DEFAULT_JOB_PATH)
+
+    def create_job(self, inputs: Iterable[str], settings: Optional[dict] = None) -> str:
+        """
+        Record a new job and all of its inputs
+
+        Args:
+            inputs: URLs and/or search queries; blank lines are skipped
+            settings: Optional JSON-serializable run settings kept with the job
+
+        Returns:
+            Job ID
+        """
+        job_id = uuid.uuid4().hex[:12]
+        now = time.time()
+        rows = (
+            (job_id, index, user_input.strip(), "pending", now)
+            for index, user_input in enumerate(inputs)
+            if user_input.strip()
+        )
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute(
+                "INSERT INTO jobs (id, settings, created_at) VALUES (?, ?, ?)",
+                (job_id, json.dumps(settings or {}), now),
+            )
+            self._conn.executemany(
+                "INSERT INTO job_inputs (job_id, idx, input, state, updated_at) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        return job_id
+
+    def get_job(self, job_id: str) -> Optional[dict]:
+        """
+        Look up a job
+
+        Returns:
+            Dictionary with id, settings, created_at and the number of
+            inputs per state, or None if the job does not exist
+        """
+        row = self._conn.execute(
+            "SELECT id, settings, created_at FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        states = dict.fromkeys(INPUT_STATES, 0)
+        states.update(self._conn.execute(
+            "SELECT state, COUNT(*) FROM job_inputs WHERE job_id = ? GROUP BY state", (job_id,)
+        ).fetchall())
+        return {"id": row[0], "settings": json.loads(row[1]), "created_at": row[2], "inputs": states}
+
+    def unfinished(self, job_id: str) -> list[tuple[int, str]]:
+        """
+        Inputs of a job that have not finished
+
+        Returns:
+            (index, input) pairs in input order: pending inputs, inputs
+            that were running when the job stopped and failed inputs
+        """
+        return self._conn.execute(
+            "SELECT idx, input FROM job_inputs WHERE job_id = ? AND state != 'done' ORDER BY idx",
+            (job_id,),
+        ).fetchall()
+
+    def checkpoint(self, job_id: str, index: int) -> "Checkpoint":
+        """Progress of one input, loaded from the store"""
+        return Checkpoint(self, job_id, index)
+
+    def finish_input(self, job_id: str, index: int, report: Report) -> None:
+        """Mark an input as done, keeping the report summary"""
+        summary = {
+            "query": report.query,
+            "mode": report.mode,
+            "successful_scrapes": report.successful_scrapes,
+            "failed_scrapes": report.failed_scrapes,
+            "failed_urls": report.failed_urls,
+        }
+        self._set_state(job_id, index, "done", summary=json.dumps(summary))
+
+    def fail_input(self, job_id: str, index: int, error: str) -> None:
+        """Mark an input as failed; it is retried on resume"""
+        self._set_state(job_id, index, "failed", error=error)
+
+    def _set_state(self, job_id: str, index: int, state: str, **columns) -> None:
+        assignments = "".join(f", {name} = ?" for name in columns)
+        self._conn.execute(
+            f"UPDATE job_inputs SET state = ?, updated_at = ?{assignments} WHERE job_id = ? AND idx = ?",
+            (state, time.time(), *columns.values(), job_id, index),
+        )
+
+    def stats(self) -> dict:
+        """Get store statistics"""
+        jobs, inputs, attempts = self._conn.execute(
+            "SELECT (SELECT COUNT(*) FROM jobs), (SELECT COUNT(*) FROM job_inputs), "
+            "(SELECT COUNT(*) FROM job_attempts)"
+        ).fetchone()
+        return {"jobs": jobs, "inputs": inputs, "attempts": attempts}
+
+
+class Checkpoint:
+    """
+    Stored progress of one job input
+
+    The scraping loop asks restore() before fetching a URL and calls
+    save() for every finished attempt; a URL with a stored success is
+    never fetched again for this input, while failed ones are retried.
+    """
+
+    def __init__(self, store: JobStore, job_id: str, index: int):
+        self.store = store
+        self.job_id = job_id
+        self.index = index
+
+        row = store._conn.execute(
+            "SELECT urls FROM job_inputs WHERE job_id = ? AND idx = ?", (job_id, index)
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"job {job_id} has no input {index}")
+        self._urls = json.loads(row[0]) if row[0] else None
+        self._results = {
+            key: blob
+            for key, blob in store._conn.execute(
+                "SELECT key, result FROM job_attempts WHERE job_id = ? AND idx = ?", (job_id, index)
+            )
+        }
+
+    @property
+    def restorable(self) -> int:
+        """Number of stored attempts"""
+        return len(self._results)
+
+    def start(self) -> None:
+        """Mark the input as running"""
+        self.store._set_state(self.job_id, self.index, "running")
+
+    def search_urls(self) -> Optional[list[str]]:
+        """Result links stored by an earlier run, or None"""
+        return self._urls
+
+    def save_search_urls(self, urls: list[str]) -> None:
+        """Store the result links so a resumed run tries the same URLs"""
+        self._urls = list(urls)
+        self.store._set_state(self.job_id, self.index, "running", urls=json.dumps(self._urls))
+
+    def restore(self, url: str) -> Optional[ScrapeResult]:
+        """Stored successful result of an earlier attempt at `url`, or None"""
+        blob = self._results.get(normalize_url(url))
+        if blob is None:
+            return None
+        result = ScrapeResult.from_dict(json.loads(_unpack(blob)))
+        # A failed attempt (timeout, block, ...) is tried again on resume
+        return result if result.accessible else None
+
+    def save(self, result: ScrapeResult) -> None:
+        """Store a finished attempt"""
+        key = normalize_url(result.url)
+        blob = _pack(json.dumps(result.to_dict(), ensure_ascii=False))
+        self.store._conn.execute(
+            "INSERT OR REPLACE INTO job_attempts (job_id, idx, key, url, status, result, attempted_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (self.job_id, self.index, key, result.url, result.status, blob, time.time()),
+        )
+        self._results[key] = blob
+
+    def finish(self, report: Report) -> None:
+        """Mark the input as done, keeping the report summary"""
+        self.store.finish_input(self.job_id, self.index, report)
+
+    def fail(self, error: BaseException) -> None:
+        """Mark the input as failed; it is retried on resume"""
+        self.store.fail_input(self.job_id, self.index, f"{error.__class__.__name__}: {error}")
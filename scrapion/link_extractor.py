@@ -0,0 +1,89 @@
+"""Link extraction module"""
+
+from html.parser import HTMLParser
+from typing import Iterable
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+
+# Script that reads resolved link targets from a loaded browser page
+DOM_LINKS_SCRIPT = "anchors => anchors.map(a => a.href)"
+
+
+class _LinkParser(HTMLParser):
+    """Collects <a href> and <area href> values and the <base href>"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.base = None
+        self.hrefs = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("a", "area"):
+            for name, value in attrs:
+                if name == "href" and value:
+                    self.hrefs.append(value)
+        elif tag == "base" and self.base is None:
+            for name, value in attrs:
+                if name == "href" and value:
+                    self.base = value
+
+
+def clean_links(urls: Iterable[str]) -> list[str]:
+    """
+    Keep http(s) links without their fragment, first occurrence only
+
+    Args:
+        urls: Absolute URLs in document order
+
+    Returns:
+        Deduplicated URLs in document order
+    """
+    links = []
+    seen = set()
+    for url in urls:
+        try:
+            parts = urlsplit(url.strip())
+        except ValueError:
+            # Malformed link, e.g. an unclosed IPv6 bracket
+            continue
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            continue
+        url = urlunsplit((parts.scheme, parts.netloc, parts.path, parts.query, ""))
+        if url not in seen:
+            seen.add(url)
+            links.append(url)
+    return links
+
+
+def extract_links(html: str, base_url: str) -> list[str]:
+    """
+    Absolute link targets of an HTML document
+
+    Used for pages without a live DOM (HTTP tier, cache hits); browser
+    pages read their links from the DOM instead (DOM_LINKS_SCRIPT).
+
+    Args:
+        html: HTML document
+        base_url: URL the document was served from
+
+    Returns:
+        Deduplicated http(s) URLs in document order, fragments removed
+    """
+    parser = _LinkParser()
+    parser.feed(html)
+    parser.close()
+    base = base_url
+    if parser.base:
+        try:
+            base = urljoin(base_url, parser.base)
+        except ValueError:
+            pass
+
+    urls = []
+    for href in parser.hrefs:
+        try:
+            urls.append(urljoin(base, href))
+        except ValueError:
+            # One malformed href must not fail the whole page
+            continue
+    return clean_links(urls)
@@ -1,7 +1,11 @@
 """URL list management module"""
 
+from collections import Counter
 from enum import Enum
-from typing import Optional
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+from .url_utils import canonicalize_url, normalize_url
 
 
 class UrlSource(Enum):
@@ -9,34 +13,121 @@ class UrlSource(Enum):
     MAIN_LIST = "main_list"
     BACKUP_LIST = "backup_list"
     SINGLE_URL = "single_url"
+    CRAWL_SEED = "crawl_seed"
+    CRAWL = "crawl"
+
+
+# Reorders normalized result links before they are split into the main and
+# backup lists (see host_stats.AdaptiveOrdering)
+OrderingPolicy = Callable[[list[str]], list[str]]
+
+
+def _site(host: str) -> str:
+    """Host without a leading "www." """
+    return host[4:] if host.startswith("www.") else host
+
+
+def target_key(url: str) -> str:
+    """
+    Key under which links to the same page compare equal
+
+    Ignores the scheme, a leading "www.", a trailing slash and the order
+    of query parameters.
+    """
+    parts = urlsplit(normalize_url(url))
+    path = parts.path.rstrip("/") or "/"
+    return f"{_site(parts.netloc)}{path}?{parts.query}"
+
+
+def normalize_urls(urls: list[str], max_per_host: Optional[int] = None) -> tuple[list[str], Counter]:
+    """
+    Canonicalize, deduplicate and optionally cap result links per host
+
+    Args:
+        urls: Links in result order
+        max_per_host: Keep at most this many links per host ("www."
+            ignored); unlimited when None
+
+    Returns:
+        Tuple of (canonical URLs in result order, counters of dropped
+        links by reason: invalid, duplicate, host_cap)
+    """
+    kept = []
+    dropped = Counter()
+    seen = set()
+    per_host = Counter()
+    for url in urls:
+        try:
+            url = canonicalize_url(url)
+            parts = urlsplit(url)
+        except ValueError:
+            dropped["invalid"] += 1
+            continue
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            dropped["invalid"] += 1
+            continue
+
+        key = target_key(url)
+        if key in seen:
+            dropped["duplicate"] += 1
+            continue
+        seen.add(key)
+
+        site = _site(parts.hostname)
+        if max_per_host is not None and per_host[site] >= max_per_host:
+            dropped["host_cap"] += 1
+            continue
+        per_host[site] += 1
+        kept.append(url)
+    return kept, dropped
 
 
 class UrlListManager:
     """Manages main (1-5) and backup (6-10) URL lists"""
 
-    def __init__(self, urls: list[str] = None, single_url: Optional[str] = None):
+    def __init__(
+        self,
+        urls: list[str] = None,
+        single_url: Optional[str] = None,
+        max_per_host: Optional[int] = None,
+        order: Optional[OrderingPolicy] = None,
+    ):
         """
         Initialize list manager
 
         Args:
-            urls: List of URLs to split (max 10)
+            urls: Search result links; normalized (see normalize_urls)
+                before the first 10 are split
             single_url: If provided, use single URL mode
+            max_per_host: Keep at most this many result links per host
+            order: Optional policy reordering the normalized links before
+                the split; links it moves past the tenth are not tried
         """
         self.main_list = []
         self.backup_list = []
         self.main_index = 0
         self.backup_index = 0
         self.single_url = single_url
+        self.input_size = 0
+        self.dropped = Counter()
 
         if urls:
+            self.input_size = len(urls)
+            urls, self.dropped = normalize_urls(urls, max_per_host)
+            if order is not None:
+                urls = order(urls)
             self._split_lists(urls)
         elif single_url:
             self.main_list = [single_url]
 
     @staticmethod
-    def from_urls(urls: list[str]) -> "UrlListManager":
+    def from_urls(
+        urls: list[str],
+        max_per_host: Optional[int] = None,
+        order: Optional[OrderingPolicy] = None,
+    ) -> "UrlListManager":
         """Create manager from URL list (search results)"""
-        return UrlListManager(urls=urls)
+        return UrlListManager(urls=urls, max_per_host=max_per_host, order=order)
 
     @staticmethod
     def from_single_url(url: str) -> "UrlListManager":
@@ -83,6 +174,23 @@ class UrlListManager:
             return url
         return None
 
+    def get_next(self) -> tuple[Optional[str], Optional[UrlSource]]:
+        """
+        Get next URL, promoting backup URLs once main list is exhausted
+
+        Returns:
+            Tuple of (url, source), or (None, None) if both lists are exhausted
+        """
+        url = self.get_next_from_main()
+        if url:
+            return url, UrlSource.SINGLE_URL if self.single_url else UrlSource.MAIN_LIST
+
+        url = self.get_next_from_backup()
+        if url:
+            return url, UrlSource.BACKUP_LIST
+
+        return None, None
+
     def is_from_list(self, url: str) -> bool:
         """
         Check if URL is from list (not single URL mode)
@@ -108,6 +216,8 @@ class UrlListManager:
     def get_stats(self) -> dict:
         """Get list statistics"""
         return {
+            "input_size": self.input_size,
+            "dropped": dict(self.dropped),
             "main_list_size": len(self.main_list),
             "backup_list_size": len(self.backup_list),
             "main_remaining": len(self.main_list) - self.main_index,
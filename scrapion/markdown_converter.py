@@ -0,0 +1,430 @@
+"""Streaming HTML to Markdown conversion module"""
+
+import re
+from html.parser import HTMLParser
+from typing import Callable, Optional
+
+
+# Separators emitted while converting and resolved into newlines by _resolve.
+# A run of separators collapses to the widest one, like adjacent block
+# margins. Text nodes never contain them (see _CONTROL_RE).
+_BLOCK = "\x00"       # blank line
+_LINE = "\x04"        # single newline
+_LINE_BREAK = "\x01"  # <br>
+
+_CONTROL_RE = re.compile(r"[\x00-\x04]")
+_NEWLINE_WS_RE = re.compile(r"[\t \r\n]*[\r\n][\t \r\n]*")
+_WS_RE = re.compile(r"[\t \f\v]+")
+_SEPARATOR_RUN_RE = re.compile(r"[ \t\n]*([\x00\x04][ \t\n\x00\x04]*)")
+_LINE_BREAK_RE = re.compile(r"[ \t]*\x01[ \t]*")
+_BACKTICKS_RE = re.compile(r"`+")
+
+_SKIP_TAGS = frozenset(("script", "style", "template"))
+_VOID_TAGS = frozenset((
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+))
+# Elements rendered as paragraphs separated by blank lines
+_BLOCK_TAGS = frozenset(("p", "div", "article", "section", "dl", "figcaption"))
+_HEADINGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+_INLINE_MARKS = {"b": "**", "strong": "**", "em": "*", "i": "*", "del": "~~", "s": "~~", "q": '"'}
+_CODE_TAGS = frozenset(("code", "kbd", "samp"))
+_LIST_BULLETS = "*+-"
+
+# Opening one of these implicitly closes the listed open elements
+_IMPLICIT_CLOSE = {
+    "li": ("li",),
+    "p": ("p",),
+    "dt": ("dt", "dd"),
+    "dd": ("dt", "dd"),
+    "tr": ("td", "th", "tr"),
+    "td": ("td", "th"),
+    "th": ("td", "th"),
+    "option": ("option",),
+}
+# Opening one of these closes an open <p>
+_CLOSES_PARAGRAPH = _BLOCK_TAGS | frozenset(_HEADINGS) | frozenset(
+    ("ul", "ol", "table", "pre", "blockquote", "hr", "dd", "dt")
+)
+
+
+class _Frame:
+    """Open element on the conversion stack"""
+
+    __slots__ = ("tag", "start", "attrs", "count", "cells")
+
+    def __init__(self, tag: str, start: int, attrs: Optional[dict] = None):
+        self.tag = tag
+        self.start = start
+        self.attrs = attrs
+        self.count = 0
+        self.cells = None
+
+
+def _resolve(text: str) -> str:
+    """Turn separators into newlines"""
+    text = _LINE_BREAK_RE.sub("  \n", text)
+    return _SEPARATOR_RUN_RE.sub(lambda m: "\n\n" if _BLOCK in m.group(1) else "\n", text)
+
+
+def _escape(text: str) -> str:
+    """Escape Markdown emphasis characters in text"""
+    return text.replace("*", "\\*").replace("_", "\\_")
+
+
+def _chomp(text: str) -> tuple[str, str, str]:
+    """Move surrounding whitespace of inline content outside the markup"""
+    prefix = " " if text[:1] == " " else ""
+    suffix = " " if text[-1:] == " " else ""
+    return prefix, text.strip(), suffix
+
+
+def _indent(text: str, first: str, rest: str) -> str:
+    """Prefix the first line with `first` and other non-empty lines with `rest`"""
+    lines = text.split("\n")
+    return first + lines[0] + "".join("\n" + rest + line if line else "\n" for line in lines[1:])
+
+
+def _colspan(attrs: Optional[dict]) -> int:
+    value = (attrs or {}).get("colspan") or ""
+    return max(1, min(1000, int(value))) if value.isdigit() else 1
+
+
+class _MarkdownParser(HTMLParser):
+    """
+    Single-pass converter
+
+    Text is appended to a flat chunk list as it streams in. Elements that
+    rewrite their content (links, headings, list items, cells, quotes) note
+    where their content starts and replace that tail of the list when they
+    close; other elements only emit separators, so most of a page is copied
+    a small, fixed number of times regardless of its size.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._out = []
+        self._stack = []
+        self._last = "\n"
+        self._skip = 0
+        self._pre = 0
+        self._code = 0
+        self._inline = 0
+
+    # Output helpers
+
+    def _emit(self, text: str) -> None:
+        if text:
+            self._out.append(text)
+            self._last = text[-1]
+
+    def _take(self, frame: _Frame) -> str:
+        """Remove and return everything emitted since `frame` opened"""
+        inner = "".join(self._out[frame.start:])
+        del self._out[frame.start:]
+        self._last = self._out[-1][-1] if self._out else "\n"
+        return inner
+
+    def _nearest(self, *tags: str) -> Optional[_Frame]:
+        for frame in reversed(self._stack):
+            if frame.tag in tags:
+                return frame
+        return None
+
+    # Parser callbacks
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip += 1
+            return
+        if self._skip:
+            return
+
+        if self._pre:
+            if tag == "pre":
+                self._pre += 1
+            elif tag == "br":
+                self._emit("\n")
+            elif tag in _BLOCK_TAGS:
+                self._stack.append(_Frame(tag, len(self._out)))
+            return
+
+        closes = _IMPLICIT_CLOSE.get(tag)
+        if closes:
+            while self._stack and self._stack[-1].tag in closes:
+                self._close(self._stack.pop())
+        if tag in _CLOSES_PARAGRAPH and self._stack and self._stack[-1].tag == "p":
+            self._close(self._stack.pop())
+
+        if tag in _VOID_TAGS:
+            self._void(tag, dict(attrs))
+            return
+        if self._code and (tag in _INLINE_MARKS or tag in _CODE_TAGS or tag == "a"):
+            # Code spans keep their text unformatted
+            return
+
+        frame = _Frame(tag, len(self._out), dict(attrs) if attrs else None)
+        self._open(frame)
+        self._stack.append(frame)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in _VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            if self._skip:
+                self._skip -= 1
+            return
+        if self._skip or tag in _VOID_TAGS:
+            return
+        if self._pre and tag != "pre" and tag not in _BLOCK_TAGS:
+            return
+        if tag == "pre" and self._pre > 1:
+            self._pre -= 1
+            return
+
+        # Close up to the matching element; stray end tags are ignored
+        for index in range(len(self._stack) - 1, -1, -1):
+            if self._stack[index].tag == tag:
+                while len(self._stack) > index:
+                    self._close(self._stack.pop())
+                return
+
+    def handle_data(self, data):
+        if self._skip or not data:
+            return
+        data = _CONTROL_RE.sub("", data)
+
+        if self._pre:
+            self._emit(data)
+            return
+
+        text = _WS_RE.sub(" ", _NEWLINE_WS_RE.sub("\n", data))
+        if self._last in " \n\x00\x01\x04":
+            text = text.lstrip(" \n")
+        if text:
+            self._emit(text if self._code else _escape(text))
+
+    def close(self):
+        super().close()
+        while self._stack:
+            self._close(self._stack.pop())
+
+    def result(self) -> str:
+        return _resolve("".join(self._out)).strip()
+
+    # Element handling
+
+    def _void(self, tag: str, attrs: dict) -> None:
+        if tag == "br":
+            self._emit(" " if self._inline else _LINE_BREAK)
+        elif tag == "hr":
+            self._emit(_BLOCK + "---" + _BLOCK)
+        elif tag == "img":
+            alt = attrs.get("alt") or ""
+            if self._inline:
+                self._emit(alt)
+                return
+            src = attrs.get("src") or ""
+            title = attrs.get("title") or ""
+            title_part = ' "%s"' % title.replace('"', r'\"') if title else ""
+            self._emit(f"![{alt}]({src}{title_part})")
+
+    def _open(self, frame: _Frame) -> None:
+        tag = frame.tag
+        if tag in _BLOCK_TAGS:
+            # Inside headings and table cells blocks collapse to spaces
+            self._emit(" " if self._inline else _BLOCK)
+            frame.start = len(self._out)
+        elif tag == "pre":
+            self._pre += 1
+        elif tag in _CODE_TAGS:
+            self._code += 1
+        elif tag in _HEADINGS or tag in ("td", "th"):
+            self._inline += 1
+        elif tag == "tr":
+            frame.cells = []
+            section = self._nearest("thead", "tbody", "tfoot", "table")
+            frame.count = int(section is not None and section.tag == "thead")
+
+    def _close(self, frame: _Frame) -> None:
+        tag = frame.tag
+
+        if tag in _BLOCK_TAGS:
+            if self._pre:
+                # Blocks inside preformatted text become literal blank lines
+                text = self._take(frame).strip()
+                if text:
+                    self._emit(f"\n\n{text}\n\n")
+            else:
+                self._emit(" " if self._inline else _BLOCK)
+
+        elif tag == "pre":
+            self._pre -= 1
+            code = self._take(frame).strip("\n")
+            if code:
+                self._emit(_BLOCK + "```\n" + code + "\n```" + _BLOCK)
+
+        elif tag in _CODE_TAGS:
+            self._code -= 1
+            prefix, code, suffix = _chomp(self._take(frame))
+            if code:
+                longest = max((len(run) for run in _BACKTICKS_RE.findall(code)), default=0)
+                fence = "`" * (longest + 1)
+                if longest:
+                    code = f" {code} "
+                self._emit(f"{prefix}{fence}{code}{fence}{suffix}")
+
+        elif tag in _INLINE_MARKS:
+            prefix, text, suffix = _chomp(_resolve(self._take(frame)))
+            mark = _INLINE_MARKS[tag]
+            if text:
+                self._emit(f"{prefix}{mark}{text}{mark}{suffix}")
+
+        elif tag == "a":
+            self._close_link(frame)
+
+        elif tag in _HEADINGS:
+            self._inline -= 1
+            text = " ".join(_resolve(self._take(frame)).split())
+            if self._inline:
+                self._emit(text)
+            elif text:
+                self._emit(_BLOCK + "#" * _HEADINGS[tag] + " " + text + _BLOCK)
+
+        elif tag == "li":
+            self._close_list_item(frame)
+
+        elif tag in ("ul", "ol"):
+            separator = _LINE if self._nearest("li") else _BLOCK
+            self._emit(separator + self._take(frame) + separator)
+
+        elif tag == "blockquote":
+            text = _resolve(self._take(frame)).strip(" \t\r\n")
+            if self._inline:
+                self._emit(f" {text} ")
+            elif text:
+                quoted = "\n".join("> " + line if line else ">" for line in text.split("\n"))
+                self._emit(_LINE + quoted + _BLOCK)
+
+        elif tag == "dt":
+            text = " ".join(_resolve(self._take(frame)).split())
+            self._emit(f" {text} " if self._inline else _BLOCK + text + _LINE)
+
+        elif tag == "dd":
+            text = _resolve(self._take(frame)).strip()
+            if self._inline:
+                self._emit(f" {text} ")
+            elif text:
+                self._emit(_indent(text, ":   ", "    ") + _LINE)
+
+        elif tag in ("td", "th"):
+            self._inline -= 1
+            text = _resolve(self._take(frame)).strip().replace("\n", " ")
+            row = self._nearest("tr")
+            if row is not None:
+                row.cells.append((text, _colspan(frame.attrs), tag == "th"))
+            else:
+                self._emit(text)
+
+        elif tag == "tr":
+            self._close_row(frame)
+
+        elif tag == "table":
+            text = _resolve(self._take(frame)).strip()
+            if text:
+                self._emit(_BLOCK + text + _BLOCK)
+
+    def _close_link(self, frame: _Frame) -> None:
+        prefix, text, suffix = _chomp(_resolve(self._take(frame)))
+        if not text:
+            return
+        attrs = frame.attrs or {}
+        href = attrs.get("href")
+        title = attrs.get("title")
+        if not href:
+            self._emit(text)
+        elif text.replace(r"\_", "_") == href and not title:
+            self._emit(f"<{href}>")
+        else:
+            title_part = ' "%s"' % title.replace('"', r'\"') if title else ""
+            self._emit(f"{prefix}[{text}]({href}{title_part}){suffix}")
+
+    def _close_list_item(self, frame: _Frame) -> None:
+        text = _resolve(self._take(frame)).strip()
+        if not text:
+            self._emit(_LINE)
+            return
+
+        parent = self._nearest("ul", "ol")
+        if parent is not None and parent.tag == "ol":
+            start = (parent.attrs or {}).get("start") or ""
+            bullet = f"{(int(start) if start.isnumeric() else 1) + parent.count}. "
+            parent.count += 1
+        else:
+            depth = sum(1 for f in self._stack if f.tag == "ul") - 1
+            bullet = _LIST_BULLETS[depth % len(_LIST_BULLETS)] + " "
+
+        self._emit(_indent(text, bullet, " " * len(bullet)) + _LINE)
+
+    def _close_row(self, frame: _Frame) -> None:
+        self._take(frame)
+        cells = frame.cells
+        if not cells:
+            return
+
+        table = self._nearest("table")
+        first = table is not None and table.count == 0
+        if table is not None:
+            table.count += 1
+
+        width = sum(span for _, span, _ in cells)
+        row = "|" + "".join(f" {text}" + " |" * span for text, span, _ in cells)
+        rule = "| " + " | ".join(["---"] * width) + " |"
+
+        if first and (frame.count or all(is_th for _, _, is_th in cells)):
+            self._emit(row + "\n" + rule + "\n")
+        elif first:
+            self._emit("| " + " | ".join([""] * width) + " |\n" + rule + "\n" + row + "\n")
+        else:
+            self._emit(row + "\n")
+
+
+def html_to_markdown(html: str) -> str:
+    """
+    Convert HTML to Markdown with ATX headings
+
+    Produces the same Markdown as markdownify(html, heading_style="ATX")
+    for common page structure (headings, emphasis, links, images, lists,
+    code blocks, quotes, tables) in a single streaming pass, without
+    building a document tree.
+
+    Args:
+        html: HTML document or fragment
+
+    Returns:
+        Markdown string
+    """
+    parser = _MarkdownParser()
+    parser.feed(html)
+    parser.close()
+    return parser.result()
+
+
+def convert_events(replay: Callable[[HTMLParser], None]) -> str:
+    """
+    Convert an already parsed document to Markdown
+
+    Args:
+        replay: Callable that feeds the document to the given parser
+            through handle_starttag, handle_data and handle_endtag
+
+    Returns:
+        Markdown string
+    """
+    parser = _MarkdownParser()
+    replay(parser)
+    parser.close()
+    return parser.result()
@@ -1,54 +1,395 @@
 """Main orchestration module following CONCEPT.md workflow"""
 
 import asyncio
-import json
 import os
-from typing import Optional
+import time
+from typing import AsyncIterator, Iterable, Iterator, Optional, Union
 
 from .input_handler import InputHandler, InputType
-from .list_manager import UrlListManager, UrlSource
-from .report_generator import Report
-from .search_engine import search_initiate_nomarkdown
-from .web_access import sync_run
+from .list_manager import OrderingPolicy, UrlListManager, UrlSource
+from .report_generator import Report, ScrapeResult
+from .report_sink import NdjsonReportSink
+from .browser_pool import BrowserPool
+from .cache import PageCache, SearchCache
+from .crawler import CrawlItem, Frontier, Priority
+from .distributed import TASK_KINDS, run_worker
+from .host_stats import AdaptiveOrdering, HostStatsStore, classify_error
+from .job_store import Checkpoint, JobStore
+from .worker_pool import WorkerPool
+from .request_filter import RequestFilter
+from .scheduler import FetchScheduler
+from .search_engine import DuckDuckGoBrowserBackend, DuckDuckGoHtmlBackend, SearchBackend, search_backends
+from .search_profile import DEFAULT_SEARCH_PROFILE, SearchProfile, get_profile
+from .tracing import Trace, TraceHook, record, span
+from .web_access import CONVERTERS, DEFAULT_CONVERTER, FETCH_TIERS, HttpFetcher, fetch_page, _check_readiness
 from ._browser_check import ensure_firefox_available
 
 
-class Client:
-    """Main scraping client following CONCEPT.md flow"""
+class AsyncClient:
+    """
+    Asyncio scraping client following CONCEPT.md flow
+
+    Runs entirely on the caller's event loop, so it can be used from
+    aiohttp/FastAPI services and multiplex many runs on one loop.
+    """
 
-    def __init__(self, skip_browser_check: bool = False):
+    def __init__(
+        self,
+        skip_browser_check: bool = False,
+        pool_size: int = 1,
+        wait_until: str = "load",
+        wait_for_selector: Optional[str] = None,
+        concurrency: int = 1,
+        target_successes: int = 1,
+        fetch_tier: str = "auto",
+        block_requests: bool = True,
+        request_filter: Optional[RequestFilter] = None,
+        cache: Optional[PageCache] = None,
+        search_cache: Optional[SearchCache] = None,
+        bypass_search_cache: bool = False,
+        converter: str = DEFAULT_CONVERTER,
+        extract_main_content: bool = False,
+        search_profile: Union[str, SearchProfile] = DEFAULT_SEARCH_PROFILE,
+        search_backends: Optional[list[SearchBackend]] = None,
+        report_sink: Optional[NdjsonReportSink] = None,
+        trace_hook: Optional[TraceHook] = None,
+        max_urls_per_host: Optional[int] = None,
+        scheduler: Optional[FetchScheduler] = None,
+        host_stats: Optional[HostStatsStore] = None,
+        url_order: Optional[OrderingPolicy] = None,
+    ):
         """
-        Initialize Scrapion client
+        Initialize Scrapion async client
 
         Args:
             skip_browser_check: If True, skip Firefox browser check (default: False)
+            pool_size: Number of warm browser processes shared by the
+                search and scrape phases (default: 1)
+            wait_until: Page readiness strategy: "domcontentloaded", "load",
+                "networkidle" or "selector" (default: "load")
+            wait_for_selector: CSS selector to wait for when wait_until is "selector"
+            concurrency: Maximum URLs scraped at once (default: 1)
+            target_successes: Stop scraping once this many URLs succeeded (default: 1)
+            fetch_tier: "auto" (plain HTTP first, browser when rendering is
+                needed), "http" or "browser" (default: "auto")
+            block_requests: Block images, media, fonts, stylesheets and
+                trackers in the browser (default: True)
+            request_filter: Custom RequestFilter; overrides the default
+                filter used when block_requests is True
+            cache: Optional PageCache shared by all runs of this client
+            search_cache: Optional SearchCache for search results
+            bypass_search_cache: Always search fresh (results are still cached)
+            converter: HTML to Markdown converter, "builtin" (streaming,
+                default) or "markdownify"
+            extract_main_content: Convert only each page's main content,
+                dropping navigation, sidebars and footers (default: False,
+                the whole page is converted)
+            search_profile: "stealth" (types the query with human-like
+                pauses, default), "fast" (requests the results URL
+                directly, no pauses) or a custom SearchProfile
+            search_backends: Search backends queried concurrently, their
+                results merged and deduplicated (default: the browser
+                DuckDuckGo backend with search_profile)
+            report_sink: Optional NdjsonReportSink; every result is written
+                to it as soon as it is scraped instead of being kept in the
+                Report. The caller closes the sink.
+            trace_hook: Optional callback receiving one event dictionary
+                per timed phase (see tracing.add_hook); timings are also
+                logged to the "scrapion.trace" logger at DEBUG level
+            max_urls_per_host: Keep at most this many search result links
+                per host in the main and backup lists (default: unlimited)
+            scheduler: FetchScheduler pacing every search and page request
+                per host (default: a FetchScheduler with its default limits)
+            host_stats: Optional HostStatsStore; the outcome and duration
+                of every fetch are recorded in it
+            url_order: Optional policy reordering search result links
+                before the main and backup lists are split, e.g.
+                host_stats.AdaptiveOrdering(store)
         """
+        _check_readiness(wait_until, wait_for_selector)
+        if fetch_tier not in FETCH_TIERS:
+            raise ValueError(f"fetch_tier must be one of {', '.join(FETCH_TIERS)}")
+        if converter not in CONVERTERS:
+            raise ValueError(f"converter must be one of {', '.join(CONVERTERS)}")
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if target_successes < 1:
+            raise ValueError("target_successes must be at least 1")
+        if max_urls_per_host is not None and max_urls_per_host < 1:
+            raise ValueError("max_urls_per_host must be at least 1")
+
         self.report: Optional[Report] = None
         self.list_manager: Optional[UrlListManager] = None
+        self.wait_until = wait_until
+        self.wait_for_selector = wait_for_selector
+        self.concurrency = concurrency
+        self.target_successes = target_successes
+        self.fetch_tier = fetch_tier
+        if request_filter is None and block_requests:
+            request_filter = RequestFilter()
+        self.request_filter = request_filter
+        self.cache = cache
+        self.search_cache = search_cache
+        self.bypass_search_cache = bypass_search_cache
+        self.converter = converter
+        self.extract_main_content = extract_main_content
+        self.search_profile = get_profile(search_profile)
+
+        # Browsers stay warm across runs; the pool binds to the loop of the
+        # first run
+        self.pool = BrowserPool(size=pool_size)
+        # Keep-alive HTTP connections for the fast fetch tier
+        self.http = HttpFetcher()
+        # Per-host rate and concurrency limits shared by searches, scrapes
+        # and crawls; binds to the loop of the first run like the pool
+        self.scheduler = scheduler or FetchScheduler()
+
+        if search_backends is None:
+            search_backends = [DuckDuckGoBrowserBackend(profile=self.search_profile)]
+        if not search_backends:
+            raise ValueError("search_backends must not be empty")
+        for backend in search_backends:
+            # Share the client's browsers, connections and scheduler
+            if backend.scheduler is None:
+                backend.scheduler = self.scheduler
+            if isinstance(backend, DuckDuckGoBrowserBackend) and backend.pool is None:
+                backend.pool = self.pool
+                if backend.request_filter is None:
+                    backend.request_filter = self.request_filter
+            elif isinstance(backend, DuckDuckGoHtmlBackend) and backend.http is None:
+                backend.http = self.http
+        self.search_backends = list(search_backends)
+        self.report_sink = report_sink
+        self.trace_hook = trace_hook
+        self.max_urls_per_host = max_urls_per_host
+        self.host_stats = host_stats
+        self.url_order = url_order
 
         # Check Firefox availability unless explicitly skipped or disabled via env var
         if not skip_browser_check and os.getenv("SCRAPION_SKIP_BROWSER_CHECK") != "1":
             ensure_firefox_available()
 
-    def run(self, user_input: str) -> Report:
+    async def __aenter__(self) -> "AsyncClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Shut down pooled browsers, HTTP connections and search backends"""
+        try:
+            for backend in self.search_backends:
+                await backend.close()
+            await self.http.close()
+        finally:
+            await self.pool.close()
+
+    async def run(self, user_input: str) -> Report:
         """
         Main orchestration flow
 
         Args:
             user_input: User input (URL or search query)
 
+        Returns:
+            Populated Report object
+        """
+        self.report = await self._process_input(user_input)
+        self.report.finish()
+        return self.report
+
+    async def run_many(self, inputs: Iterable[str], concurrency: int = 4) -> AsyncIterator[Report]:
+        """
+        Process many inputs, sharing this client's browser pool
+
+        Inputs are consumed lazily, so `inputs` may be a file object or any
+        other long iterable. Blank inputs are skipped.
+
+        Args:
+            inputs: URLs and/or search queries
+            concurrency: Maximum inputs processed at once (default: 4)
+
+        Yields:
+            One Report per input, in completion order
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        reports = self._process_many(inputs, concurrency)
+        try:
+            async for report in reports:
+                report.finish()
+                self.report = report
+                yield report
+        finally:
+            await reports.aclose()
+
+    async def run_job(self, store: JobStore, job_id: str, concurrency: int = 4) -> AsyncIterator[Report]:
+        """
+        Process the unfinished inputs of a stored job
+
+        Every finished URL attempt is saved in the job store as it
+        completes, and an input is marked done once its report has been
+        consumed. Running the same job again (after a crash or kill) only
+        processes inputs that are not done; URLs with a stored success are
+        restored instead of fetched, and search queries reuse their
+        stored result links.
+
+        Args:
+            store: JobStore holding the job (see JobStore.create_job)
+            job_id: Job ID
+            concurrency: Maximum inputs processed at once (default: 4)
+
+        Yields:
+            One Report per unfinished input, in completion order
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if await store.call(store.get_job, job_id) is None:
+            raise ValueError(f"unknown job: {job_id}")
+
+        pending = await store.call(store.unfinished, job_id)
+        print(f"[JOB] {job_id}: {len(pending)} unfinished input(s)")
+        reports = self._process_many(pending, concurrency, job=(store, job_id))
+        try:
+            async for report in reports:
+                report.finish()
+                self.report = report
+                yield report
+        finally:
+            await reports.aclose()
+
+    async def work_for(
+        self,
+        address: str,
+        capacity: int = 4,
+        roles: Iterable[str] = TASK_KINDS,
+        name: Optional[str] = None,
+        token: Optional[str] = None,
+    ) -> int:
+        """
+        Process searches and scrapes handed out by a distributed.Coordinator
+
+        Runs until the coordinator finishes or goes away. Results are sent
+        to the coordinator; this client's report sink is not used.
+
+        Args:
+            address: Coordinator "host:port"
+            capacity: Tasks processed at once (default: 4)
+            roles: Task kinds to take, "search" and/or "scrape" (default: both)
+            name: Name shown by the coordinator (default: host name)
+            token: Shared secret of the coordinator, if it has one
+
+        Returns:
+            Number of tasks received
+        """
+        return await run_worker(self, address, capacity, roles, name, token=token)
+
+    async def _process_many(
+        self,
+        inputs: Iterable,
+        concurrency: int,
+        job: Optional[tuple[JobStore, str]] = None,
+    ) -> AsyncIterator[Report]:
+        """
+        Run inputs with at most `concurrency` in flight
+
+        Args:
+            inputs: URLs and/or search queries; with `job`, (index, input)
+                pairs as returned by JobStore.unfinished()
+            concurrency: Maximum inputs processed at once
+            job: Optional (JobStore, job ID); each input's Checkpoint is
+                loaded from it when the input starts
+
+        Yields:
+            Reports in completion order; the checkpoint of an input is
+            marked done when the consumer asks for the next report
+        """
+        pending_inputs = iter(inputs)
+        in_flight = {}
+
+        async def fill() -> None:
+            while len(in_flight) < concurrency:
+                item = next(pending_inputs, None)
+                if item is None:
+                    return
+                checkpoint = None
+                if job is not None:
+                    store, job_id = job
+                    index, user_input = item
+                    checkpoint = await store.call(store.checkpoint, job_id, index)
+                else:
+                    user_input = item
+                if not user_input.strip():
+                    continue
+                task = asyncio.ensure_future(self._process_input(user_input, checkpoint))
+                in_flight[task] = (user_input, checkpoint)
+
+        await fill()
+        try:
+            while in_flight:
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    user_input, checkpoint = in_flight.pop(task)
+                    try:
+                        report = task.result()
+                    except Exception as e:
+                        # One bad input must not abort the whole batch
+                        print(f"[BATCH] Failed: {user_input.strip()} - {e}")
+                        if checkpoint is not None:
+                            await checkpoint.store.call(checkpoint.fail, e)
+                        yield self._empty_report(user_input)
+                        continue
+                    yield report
+                    if checkpoint is not None:
+                        await checkpoint.store.call(checkpoint.finish, report)
+                await fill()
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+
+    def _new_report(self, query: str, mode: str, total_urls: int) -> Report:
+        """Create a report that streams into the client's sink, if any"""
+        return Report(query=query, mode=mode, total_urls=total_urls, sink=self.report_sink)
+
+    def _empty_report(self, user_input: str) -> Report:
+        """Build an empty report for an input that could not be processed"""
+        input_type, processed_input = InputHandler.parse_input(user_input)
+        if input_type == InputType.URL:
+            return self._new_report(processed_input, "single_url", 1)
+        return self._new_report(processed_input, "multi_url", 10)
+
+    async def _process_input(self, user_input: str, checkpoint: Optional[Checkpoint] = None) -> Report:
+        """
+        Process one input from parsing to report
+
+        Args:
+            user_input: User input (URL or search query)
+            checkpoint: Optional job checkpoint restoring and saving the
+                input's attempts
+
         Returns:
             Populated Report object
         """
         # Phase 1: Input Processing
         input_type, processed_input = InputHandler.parse_input(user_input)
 
-        if input_type == InputType.URL:
-            return self._process_single_url(processed_input)
-        else:
-            return self._process_search_query(processed_input)
+        # Search steps and phase totals of this run; each scraped URL gets
+        # its own trace (see _fetch)
+        trace = Trace(processed_input, hook=self.trace_hook)
+        if checkpoint is not None:
+            await checkpoint.store.call(checkpoint.start)
+        with trace.activate(), span("total"):
+            if input_type == InputType.URL:
+                report = await self._process_single_url(processed_input, checkpoint)
+            else:
+                report = await self._process_search_query(processed_input, checkpoint)
+        report.timings = trace.timings()
+        return report
 
-    def _process_single_url(self, url: str) -> Report:
+    async def _process_single_url(self, url: str, checkpoint: Optional[Checkpoint] = None) -> Report:
         """
         Process single URL input
 
@@ -61,13 +402,13 @@ class Client:
         print(f"[PHASE 1] Single URL mode: {url}")
 
         # Initialize report and list manager
-        self.report = Report(query=url, mode="single_url", total_urls=1)
-        self.list_manager = UrlListManager.from_single_url(url)
+        report = self._new_report(url, "single_url", 1)
+        self.list_manager = list_manager = UrlListManager.from_single_url(url)
 
         # Phase 3: Scraping Loop
-        return self._scraping_loop()
+        return await self._scraping_loop(report, list_manager, checkpoint)
 
-    def _process_search_query(self, query: str) -> Report:
+    async def _process_search_query(self, query: str, checkpoint: Optional[Checkpoint] = None) -> Report:
         """
         Process search query input
 
@@ -80,27 +421,42 @@ class Client:
         print(f"[PHASE 1] Multi-URL mode: {query}")
 
         # Initialize report
-        self.report = Report(query=query, mode="multi_url", total_urls=10)
+        report = self._new_report(query, "multi_url", 10)
 
         # Phase 2: Search and List Creation
-        print("[PHASE 2] Executing search...")
-        urls = self._search_and_extract_urls(query)
+        urls = checkpoint.search_urls() if checkpoint is not None else None
+        if urls is not None:
+            print("[PHASE 2] Using result links stored in the job")
+        else:
+            print("[PHASE 2] Executing search...")
+            with span("search"):
+                urls = await self._search_and_extract_urls(query)
+            if checkpoint is not None:
+                await checkpoint.store.call(checkpoint.save_search_urls, urls)
 
         if not urls:
             print("[PHASE 2] No search results found")
-            return self.report
+            return report
 
         print(f"[PHASE 2] Found {len(urls)} URLs")
 
-        # Initialize list manager
-        self.list_manager = UrlListManager.from_urls(urls)
-        stats = self.list_manager.get_stats()
+        # Initialize list manager; links are canonicalized and deduplicated
+        # before the lists are split
+        order = self.url_order
+        if isinstance(order, AdaptiveOrdering):
+            order = await order.load(urls)
+        self.list_manager = list_manager = UrlListManager.from_urls(
+            urls, self.max_urls_per_host, order
+        )
+        stats = list_manager.get_stats()
+        if stats["dropped"]:
+            print(f"[PHASE 2] Dropped links: {stats['dropped']}")
         print(f"[PHASE 2] Main list: {stats['main_list_size']}, Backup list: {stats['backup_list_size']}")
 
         # Phase 3: Scraping Loop
-        return self._scraping_loop()
+        return await self._scraping_loop(report, list_manager, checkpoint)
 
-    def _search_and_extract_urls(self, query: str) -> list[str]:
+    async def _search_and_extract_urls(self, query: str) -> list[str]:
         """
         Execute search and extract URLs
 
@@ -108,80 +464,296 @@ class Client:
             query: Search query
 
         Returns:
-            List of URLs from search results
+            List of URLs from search results, in result order; the list
+            manager normalizes them and keeps the first 10
         """
+        print(f"[SEARCH] Starting search for: {query}")
         try:
-            results_json = search_initiate_nomarkdown(query)
-            results = json.loads(results_json)
+            results = await search_backends(
+                query,
+                self.search_backends,
+                cache=self.search_cache,
+                bypass_cache=self.bypass_search_cache,
+            )
 
             urls = []
             for result in results:
                 if isinstance(result, dict) and "link" in result:
                     urls.append(result["link"])
 
-            return urls[:10]  # Limit to 10 results
+            return urls
         except Exception as e:
             print(f"[SEARCH] Error: {e}")
             return []
 
-    def _scraping_loop(self) -> Report:
+    async def _scraping_loop(
+        self,
+        report: Report,
+        list_manager: UrlListManager,
+        checkpoint: Optional[Checkpoint] = None,
+    ) -> Report:
         """
         Phase 3: Main scraping loop following CONCEPT.md
 
+        Scrapes up to `concurrency` URLs at once until `target_successes`
+        succeed. URLs are drawn main list first; backup URLs are only started
+        once the main list is exhausted, so a failed main URL is replaced by
+        the next main URL and then by backups. With the defaults (one at a
+        time, one success) this is exactly the sequential CONCEPT.md flow.
+
+        With a checkpoint, URLs that succeeded in an earlier run of the job
+        are restored from it instead of fetched, and new attempts are saved.
+
+        Args:
+            report: Report to populate
+            list_manager: URL lists for this run
+            checkpoint: Optional job checkpoint of this input
+
         Returns:
             Populated report
         """
         print("[PHASE 3] Starting scraping loop...")
+        started = time.perf_counter()
 
-        # Get first URL
-        url = self.list_manager.get_next_from_main()
+        in_flight = set()
+        successes = 0
 
-        while url:
-            print(f"[SCRAPE] Attempting: {url}")
+        def fill() -> None:
+            nonlocal successes
+            while len(in_flight) < self.concurrency and successes < self.target_successes:
+                url, source = list_manager.get_next()
+                if not url:
+                    return
+                restored = checkpoint.restore(url) if checkpoint is not None else None
+                if restored is not None:
+                    print(f"[SCRAPE] Restored from job ({restored.status}): {url}")
+                    report.add_result(restored)
+                    successes += restored.accessible
+                    continue
+                print(f"[SCRAPE] Attempting: {url}")
+                in_flight.add(asyncio.ensure_future(self._scrape(url, source.value)))
 
-            try:
-                # Scrape content
-                content = sync_run(url)
+        fill()
+        try:
+            while in_flight and successes < self.target_successes:
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
 
-                # Mark success
-                source = UrlSource.MAIN_LIST if self.list_manager.is_main_exhausted() else UrlSource.MAIN_LIST
-                self.report.add_success(url, content, source.value)
-                print(f"[SCRAPE] Success: {url}")
+                for task in done:
+                    in_flight.discard(task)
+                    result = task.result()
+                    report.add_result(result)
+                    if checkpoint is not None:
+                        await checkpoint.store.call(checkpoint.save, result)
+                    successes += result.accessible
 
-                # Check if from main list
-                if self.list_manager.is_from_list(url):
-                    # Case A: Accessible + From List → Exit
-                    print("[PHASE 3] Content from main list, generating report")
-                    break
-                else:
-                    # Case B: Accessible + NOT From List → Try backup
-                    print("[PHASE 3] Content from backup, continuing...")
-                    url = self.list_manager.get_next_from_backup()
-                    if not url:
-                        print("[PHASE 3] Backup exhausted, generating report")
-                        break
-
-            except Exception as e:
-                print(f"[SCRAPE] Failed: {url} - {e}")
-
-                # Check if from list
-                if self.list_manager.is_from_list(url):
-                    # Case C: NOT Accessible + From List → Get next from main
-                    url = self.list_manager.get_next_from_main()
-                    if not url:
-                        # Try backup
-                        url = self.list_manager.get_next_from_backup()
-                        if not url:
-                            print("[PHASE 3] All lists exhausted, generating report")
-                            break
-                else:
-                    # Case D: NOT Accessible + NOT From List → Exit
-                    print("[PHASE 3] Single URL failed, generating report")
-                    self.report.add_failure(url, source=UrlSource.SINGLE_URL.value)
-                    break
+                fill()
+        finally:
+            # Target reached (or run cancelled): drop fetches still running
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+
+        if successes >= self.target_successes:
+            print(f"[PHASE 3] Collected {successes} successful scrape(s), generating report")
+        else:
+            print("[PHASE 3] All lists exhausted, generating report")
 
+        record("scraping", started)
         print("[PHASE 4] Report generated")
-        return self.report
+        return report
+
+    async def _scrape(self, url: str, source: str) -> ScrapeResult:
+        """
+        Fetch one URL and build its result
+
+        Args:
+            url: URL to scrape
+            source: Source of the URL (main_list, backup_list, single_url)
+
+        Returns:
+            Successful or failed ScrapeResult; fetch errors are not raised
+        """
+        trace = Trace(url, hook=self.trace_hook)
+        try:
+            page = await self._fetch(url, trace)
+        except Exception as e:
+            print(f"[SCRAPE] Failed: {url} - {e}")
+            await self._record_host(url, trace, error=e)
+            return ScrapeResult(url, "failed", False, source=source, timings=trace.timings())
+
+        await self._record_host(url, trace, page=page)
+        print(f"[SCRAPE] Success ({page.tier}): {url}")
+        return ScrapeResult(
+            url,
+            "success",
+            True,
+            content=page.markdown,
+            source=source,
+            tier=page.tier,
+            blocked_requests=page.blocked_requests,
+            cache=page.cache_status,
+            original_size=page.original_size,
+            extracted_size=page.extracted_size,
+            timings=trace.timings(),
+            pack=self.report_sink is None,
+        )
+
+    async def _record_host(self, url: str, trace: Trace, page=None, error: Optional[BaseException] = None) -> None:
+        """Record a finished fetch in the host statistics, if kept"""
+        if self.host_stats is None or (page is not None and page.cache_status == "hit"):
+            # Cache hits say nothing about the host
+            return
+        timings = trace.timings()
+        # Time spent waiting for the scheduler is ours, not the host's
+        seconds = max(0.0, timings.get("total", 0.0) - timings.get("schedule_wait", 0.0))
+        if error is not None:
+            await self.host_stats.call(self.host_stats.record, url, classify_error(error), seconds)
+        else:
+            await self.host_stats.call(self.host_stats.record, url, "success", seconds, page.tier)
+
+    async def _fetch(self, url: str, trace: Trace, collect_links: bool = False):
+        """Fetch one URL with the client's settings, timing it on `trace`"""
+        with trace.activate(), span("total"):
+            return await fetch_page(
+                url,
+                pool=self.pool,
+                http=self.http,
+                tier=self.fetch_tier,
+                wait_until=self.wait_until,
+                selector=self.wait_for_selector,
+                request_filter=self.request_filter,
+                cache=self.cache,
+                converter=self.converter,
+                extract_main=self.extract_main_content,
+                collect_links=collect_links,
+                scheduler=self.scheduler,
+            )
+
+    async def crawl(
+        self,
+        seed: str,
+        max_depth: int = 2,
+        max_pages: int = 50,
+        same_host_only: bool = True,
+        concurrency: Optional[int] = None,
+        per_host_concurrency: int = 2,
+        max_pages_per_host: Optional[int] = None,
+        priority: Optional[Priority] = None,
+    ) -> Report:
+        """
+        Crawl from a seed URL by following links of scraped pages
+
+        Pages are fetched concurrently from a priority frontier (see
+        crawler.Frontier) through the client's warm browser pool and HTTP
+        connections. Each result is added to the report, and written to
+        the client's report sink, as soon as its page is done.
+
+        Args:
+            seed: Start URL
+            max_depth: Link hops followed from the seed (default: 2)
+            max_pages: Pages fetched in total, failures included (default: 50)
+            same_host_only: Only follow links on the seed's host (default: True)
+            concurrency: Pages fetched at once (default: the client's
+                concurrency)
+            per_host_concurrency: Pages of one host fetched at once (default: 2)
+            max_pages_per_host: Pages fetched per host; unlimited when None
+            priority: Callable (url, depth) -> float ordering the frontier,
+                lower first (default: breadth-first)
+
+        Returns:
+            Report in "crawl" mode
+        """
+        input_type, seed = InputHandler.parse_input(seed)
+        if input_type != InputType.URL:
+            raise ValueError(f"crawl seed must be a URL, got {seed!r}")
+        concurrency = concurrency or self.concurrency
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        frontier = Frontier(
+            max_depth=max_depth,
+            max_pages=max_pages,
+            same_host_only=same_host_only,
+            per_host_concurrency=per_host_concurrency,
+            max_pages_per_host=max_pages_per_host,
+            priority=priority,
+        )
+        frontier.add_seed(seed)
+        report = self._new_report(seed, "crawl", max_pages)
+        print(f"[CRAWL] Seed: {seed} (depth {max_depth}, up to {max_pages} pages)")
+
+        trace = Trace(seed, hook=self.trace_hook)
+        with trace.activate(), span("total"):
+            await self._crawl_frontier(report, frontier, concurrency)
+        report.timings = trace.timings()
+
+        print(f"[CRAWL] Done: {frontier.get_stats()}")
+        report.finish()
+        self.report = report
+        return report
+
+    async def _crawl_frontier(self, report: Report, frontier: Frontier, concurrency: int) -> None:
+        """Fetch frontier URLs until it is exhausted, queuing the links found"""
+        in_flight = {}
+
+        def fill() -> None:
+            while len(in_flight) < concurrency:
+                item = frontier.pop()
+                if item is None:
+                    return
+                print(f"[CRAWL] Fetching (depth {item.depth}): {item.url}")
+                trace = Trace(item.url, hook=self.trace_hook)
+                task = asyncio.ensure_future(self._fetch(item.url, trace, collect_links=True))
+                in_flight[task] = (item, trace)
+
+        fill()
+        try:
+            while in_flight:
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    item, trace = in_flight.pop(task)
+                    frontier.release(item)
+                    await self._add_crawl_result(report, frontier, item, task, trace)
+
+                fill()
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+
+    async def _add_crawl_result(self, report: Report, frontier: Frontier, item: CrawlItem, task, trace: Trace) -> None:
+        """Record a finished crawl fetch and queue the links of its page"""
+        source = UrlSource.CRAWL_SEED if item.depth == 0 else UrlSource.CRAWL
+        try:
+            page = task.result()
+        except Exception as e:
+            print(f"[CRAWL] Failed: {item.url} - {e}")
+            await self._record_host(item.url, trace, error=e)
+            report.add_failure(item.url, source=source.value, timings=trace.timings(), depth=item.depth)
+            return
+
+        await self._record_host(item.url, trace, page=page)
+        if item.depth == 0:
+            # Links resolve against the URL after redirects, e.g. a bare
+            # domain redirecting to www. or another host
+            frontier.allow_host(page.final_url)
+        queued = frontier.add_links(page.links or [], item)
+        report.add_success(
+            item.url,
+            page.markdown,
+            source.value,
+            tier=page.tier,
+            blocked_requests=page.blocked_requests,
+            cache=page.cache_status,
+            original_size=page.original_size,
+            extracted_size=page.extracted_size,
+            timings=trace.timings(),
+            depth=item.depth,
+        )
+        print(f"[CRAWL] Success ({page.tier}): {item.url}, {queued} new link(s)")
 
     def output_report(self, report_type: str, output_path: Optional[str] = None) -> None:
         """
@@ -201,3 +773,342 @@ class Client:
             self.report.save_to_file(output_path)
         else:
             self.report.print_to_stdout()
+
+
+class Client:
+    """
+    Main scraping client following CONCEPT.md flow
+
+    Synchronous wrapper that drives an AsyncClient on a private event loop.
+    Inside a running event loop, use AsyncClient directly.
+    """
+
+    def __init__(
+        self,
+        skip_browser_check: bool = False,
+        pool_size: int = 1,
+        wait_until: str = "load",
+        wait_for_selector: Optional[str] = None,
+        concurrency: int = 1,
+        target_successes: int = 1,
+        fetch_tier: str = "auto",
+        block_requests: bool = True,
+        request_filter: Optional[RequestFilter] = None,
+        cache: Optional[PageCache] = None,
+        search_cache: Optional[SearchCache] = None,
+        bypass_search_cache: bool = False,
+        converter: str = DEFAULT_CONVERTER,
+        extract_main_content: bool = False,
+        search_profile: Union[str, SearchProfile] = DEFAULT_SEARCH_PROFILE,
+        search_backends: Optional[list[SearchBackend]] = None,
+        report_sink: Optional[NdjsonReportSink] = None,
+        trace_hook: Optional[TraceHook] = None,
+        max_urls_per_host: Optional[int] = None,
+        scheduler: Optional[FetchScheduler] = None,
+        host_stats: Optional[HostStatsStore] = None,
+        url_order: Optional[OrderingPolicy] = None,
+    ):
+        """
+        Initialize Scrapion client
+
+        Args:
+            skip_browser_check: If True, skip Firefox browser check (default: False)
+            pool_size: Number of warm browser processes shared by the
+                search and scrape phases (default: 1)
+            wait_until: Page readiness strategy: "domcontentloaded", "load",
+                "networkidle" or "selector" (default: "load")
+            wait_for_selector: CSS selector to wait for when wait_until is "selector"
+            concurrency: Maximum URLs scraped at once (default: 1)
+            target_successes: Stop scraping once this many URLs succeeded (default: 1)
+            fetch_tier: "auto" (plain HTTP first, browser when rendering is
+                needed), "http" or "browser" (default: "auto")
+            block_requests: Block images, media, fonts, stylesheets and
+                trackers in the browser (default: True)
+            request_filter: Custom RequestFilter; overrides the default
+                filter used when block_requests is True
+            cache: Optional PageCache shared by all runs of this client
+            search_cache: Optional SearchCache for search results
+            bypass_search_cache: Always search fresh (results are still cached)
+            converter: HTML to Markdown converter, "builtin" (streaming,
+                default) or "markdownify"
+            extract_main_content: Convert only each page's main content,
+                dropping navigation, sidebars and footers (default: False,
+                the whole page is converted)
+            search_profile: "stealth" (types the query with human-like
+                pauses, default), "fast" (requests the results URL
+                directly, no pauses) or a custom SearchProfile
+            search_backends: Search backends queried concurrently, their
+                results merged and deduplicated (default: the browser
+                DuckDuckGo backend with search_profile)
+            report_sink: Optional NdjsonReportSink; every result is written
+                to it as soon as it is scraped instead of being kept in the
+                Report. The caller closes the sink.
+            trace_hook: Optional callback receiving one event dictionary
+                per timed phase (see tracing.add_hook); timings are also
+                logged to the "scrapion.trace" logger at DEBUG level
+            max_urls_per_host: Keep at most this many search result links
+                per host in the main and backup lists (default: unlimited)
+            scheduler: FetchScheduler pacing every search and page request
+                per host (default: a FetchScheduler with its default limits)
+            host_stats: Optional HostStatsStore; the outcome and duration
+                of every fetch are recorded in it
+            url_order: Optional policy reordering search result links
+                before the main and backup lists are split, e.g.
+                host_stats.AdaptiveOrdering(store)
+        """
+        # Kept so worker processes can build identical clients
+        self._settings = dict(
+            skip_browser_check=skip_browser_check,
+            pool_size=pool_size,
+            wait_until=wait_until,
+            wait_for_selector=wait_for_selector,
+            concurrency=concurrency,
+            target_successes=target_successes,
+            fetch_tier=fetch_tier,
+            block_requests=block_requests,
+            request_filter=request_filter,
+            cache=cache,
+            search_cache=search_cache,
+            bypass_search_cache=bypass_search_cache,
+            converter=converter,
+            extract_main_content=extract_main_content,
+            search_profile=search_profile,
+            search_backends=search_backends,
+            report_sink=report_sink,
+            trace_hook=trace_hook,
+            max_urls_per_host=max_urls_per_host,
+            scheduler=scheduler,
+            host_stats=host_stats,
+            url_order=url_order,
+        )
+        self._client = AsyncClient(**self._settings)
+        self._loop = asyncio.new_event_loop()
+
+    @property
+    def report(self) -> Optional[Report]:
+        """Report of the most recent run"""
+        return self._client.report
+
+    @property
+    def list_manager(self) -> Optional[UrlListManager]:
+        """URL lists of the most recent run"""
+        return self._client.list_manager
+
+    @property
+    def pool(self) -> BrowserPool:
+        """Shared browser pool"""
+        return self._client.pool
+
+    @property
+    def scheduler(self) -> FetchScheduler:
+        """Shared per-host fetch scheduler"""
+        return self._client.scheduler
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down pooled browsers and the client's event loop"""
+        if self._loop.is_closed():
+            return
+        try:
+            self._loop.run_until_complete(self._client.close())
+        finally:
+            self._loop.close()
+
+    def _run(self, coro):
+        """Run a coroutine on the client's event loop"""
+        if self._loop.is_closed():
+            raise RuntimeError("Client is closed")
+        return self._loop.run_until_complete(coro)
+
+    def run(self, user_input: str) -> Report:
+        """
+        Main orchestration flow
+
+        Args:
+            user_input: User input (URL or search query)
+
+        Returns:
+            Populated Report object
+        """
+        return self._run(self._client.run(user_input))
+
+    def crawl(
+        self,
+        seed: str,
+        max_depth: int = 2,
+        max_pages: int = 50,
+        same_host_only: bool = True,
+        concurrency: Optional[int] = None,
+        per_host_concurrency: int = 2,
+        max_pages_per_host: Optional[int] = None,
+        priority: Optional[Priority] = None,
+    ) -> Report:
+        """
+        Crawl from a seed URL by following links (see AsyncClient.crawl)
+
+        Args:
+            seed: Start URL
+            max_depth: Link hops followed from the seed (default: 2)
+            max_pages: Pages fetched in total, failures included (default: 50)
+            same_host_only: Only follow links on the seed's host (default: True)
+            concurrency: Pages fetched at once (default: the client's
+                concurrency)
+            per_host_concurrency: Pages of one host fetched at once (default: 2)
+            max_pages_per_host: Pages fetched per host; unlimited when None
+            priority: Callable (url, depth) -> float ordering the frontier,
+                lower first (default: breadth-first)
+
+        Returns:
+            Report in "crawl" mode
+        """
+        return self._run(self._client.crawl(
+            seed,
+            max_depth=max_depth,
+            max_pages=max_pages,
+            same_host_only=same_host_only,
+            concurrency=concurrency,
+            per_host_concurrency=per_host_concurrency,
+            max_pages_per_host=max_pages_per_host,
+            priority=priority,
+        ))
+
+    def run_many(
+        self,
+        inputs: Iterable[str],
+        concurrency: int = 4,
+        workers: Optional[int] = None,
+    ) -> Iterator[Report]:
+        """
+        Process many inputs, sharing this client's browser pool
+
+        Inputs are consumed lazily, so `inputs` may be a file object or any
+        other long iterable. Blank inputs are skipped.
+
+        With `workers`, inputs run on that many worker processes instead
+        (see worker_pool.WorkerPool), each with its own browsers and a
+        client built from this client's settings; crashed workers are
+        restarted and their inputs retried.
+
+        Args:
+            inputs: URLs and/or search queries
+            concurrency: Maximum inputs processed at once (default: 4);
+                per worker with `workers`
+            workers: Number of worker processes (default: run in this process)
+
+        Yields:
+            One Report per input, in completion order
+        """
+        if workers is not None:
+            yield from self._run_workers(inputs, concurrency, workers)
+            return
+
+        reports = self._client.run_many(inputs, concurrency)
+        try:
+            while True:
+                try:
+                    report = self._run(reports.__anext__())
+                except StopAsyncIteration:
+                    return
+                yield report
+        finally:
+            if not self._loop.is_closed():
+                self._loop.run_until_complete(reports.aclose())
+
+    def run_job(
+        self,
+        store: JobStore,
+        job_id: str,
+        concurrency: int = 4,
+        workers: Optional[int] = None,
+    ) -> Iterator[Report]:
+        """
+        Process the unfinished inputs of a stored job (see AsyncClient.run_job)
+
+        Args:
+            store: JobStore holding the job
+            job_id: Job ID
+            concurrency: Maximum inputs processed at once (default: 4);
+                per worker with `workers`
+            workers: Number of worker processes (default: run in this process)
+
+        Yields:
+            One Report per unfinished input, in completion order
+        """
+        if workers is not None:
+            if store.get_job(job_id) is None:
+                raise ValueError(f"unknown job: {job_id}")
+            pending = store.unfinished(job_id)
+            print(f"[JOB] {job_id}: {len(pending)} unfinished input(s)")
+            yield from self._run_workers(pending, concurrency, workers, store, job_id)
+            return
+
+        reports = self._client.run_job(store, job_id, concurrency)
+        try:
+            while True:
+                try:
+                    report = self._run(reports.__anext__())
+                except StopAsyncIteration:
+                    return
+                yield report
+        finally:
+            if not self._loop.is_closed():
+                self._loop.run_until_complete(reports.aclose())
+
+    def work_for(
+        self,
+        address: str,
+        capacity: int = 4,
+        roles: Iterable[str] = TASK_KINDS,
+        name: Optional[str] = None,
+        token: Optional[str] = None,
+    ) -> int:
+        """
+        Process searches and scrapes handed out by a distributed.Coordinator
+
+        Args:
+            address: Coordinator "host:port"
+            capacity: Tasks processed at once (default: 4)
+            roles: Task kinds to take, "search" and/or "scrape" (default: both)
+            name: Name shown by the coordinator (default: host name)
+            token: Shared secret of the coordinator, if it has one
+
+        Returns:
+            Number of tasks received
+        """
+        return self._run(self._client.work_for(address, capacity, roles, name, token))
+
+    def _run_workers(
+        self,
+        inputs: Iterable,
+        concurrency: int,
+        workers: int,
+        store: Optional[JobStore] = None,
+        job_id: Optional[str] = None,
+    ) -> Iterator[Report]:
+        """Run inputs on a WorkerPool built from this client's settings"""
+        pool = WorkerPool(
+            self._settings,
+            workers=workers,
+            concurrency=concurrency,
+            report_sink=self._client.report_sink,
+            jobs=store,
+            job_id=job_id,
+        )
+        for report in pool.run(inputs):
+            self._client.report = report
+            yield report
+
+    def output_report(self, report_type: str, output_path: Optional[str] = None) -> None:
+        """
+        Output report to stdio or file
+
+        Args:
+            report_type: "stdio" or "file"
+            output_path: Path for file output (required if report_type is "file")
+        """
+        self._client.output_report(report_type, output_path)
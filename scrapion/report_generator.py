@@ -1,13 +1,44 @@
 """Report generation module"""
 
 import json
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 from typing import Optional
 from pathlib import Path
 
+from .content_store import ContentStore, default_store
+
 
 class ScrapeResult:
-    """Single scrape result"""
+    """
+    Single scrape result
+
+    Attributes live in __slots__, the timestamp is kept as a Unix time and
+    formatted on access, and content is packed by a ContentStore
+    (compressed above a few KB, spilled to disk when large). `content`
+    and to_dict() always return the original text. Results created with
+    pack=False, such as those streamed to a report sink, keep their
+    content as is.
+    """
+
+    __slots__ = (
+        "url",
+        "status",
+        "accessible",
+        "source",
+        "tier",
+        "blocked_requests",
+        "cache",
+        "original_size",
+        "extracted_size",
+        "timings",
+        "depth",
+        "created_at",
+        "_content",
+    )
+
+    # Shared by all results; replace it to change the thresholds
+    content_store = default_store
 
     def __init__(
         self,
@@ -16,13 +47,50 @@ class ScrapeResult:
         accessible: bool,
         content: Optional[str] = None,
         source: str = "unknown",
+        tier: Optional[str] = None,
+        blocked_requests: Optional[int] = None,
+        cache: Optional[str] = None,
+        original_size: Optional[int] = None,
+        extracted_size: Optional[int] = None,
+        timings: Optional[dict] = None,
+        depth: Optional[int] = None,
+        pack: bool = True,
     ):
         self.url = url
         self.status = status
         self.accessible = accessible
-        self.content = content
+        if pack:
+            self.content = content
+        else:
+            self._content = content
         self.source = source
-        self.timestamp = datetime.utcnow().isoformat()
+        self.tier = tier
+        self.blocked_requests = blocked_requests
+        self.cache = cache
+        self.original_size = original_size
+        self.extracted_size = extracted_size
+        self.timings = timings
+        self.depth = depth
+        self.created_at = time.time()
+
+    @property
+    def content(self) -> Optional[str]:
+        """Scraped content, unpacked on access"""
+        return ContentStore.unpack(self._content)
+
+    @content.setter
+    def content(self, value: Optional[str]) -> None:
+        self._content = self.content_store.pack(value)
+
+    @property
+    def content_storage(self) -> str:
+        """Content storage: none, plain, compressed or spilled"""
+        return ContentStore.kind(self._content)
+
+    @property
+    def timestamp(self) -> str:
+        """Creation time as an ISO 8601 string (UTC)"""
+        return datetime.fromtimestamp(self.created_at, timezone.utc).replace(tzinfo=None).isoformat()
 
     def to_dict(self) -> dict:
         """Convert to dictionary"""
@@ -32,14 +100,54 @@ class ScrapeResult:
             "accessible": self.accessible,
             "content": self.content,
             "source": self.source,
+            "tier": self.tier,
+            "blocked_requests": self.blocked_requests,
+            "cache": self.cache,
+            "original_size": self.original_size,
+            "extracted_size": self.extracted_size,
+            "timings": self.timings,
+            "depth": self.depth,
             "timestamp": self.timestamp,
         }
 
+    @classmethod
+    def from_dict(cls, data: dict, pack: bool = True) -> "ScrapeResult":
+        """Rebuild a result from to_dict() output; see __init__ for `pack`"""
+        result = cls(
+            url=data["url"],
+            status=data["status"],
+            accessible=data["accessible"],
+            content=data.get("content"),
+            source=data.get("source", "unknown"),
+            tier=data.get("tier"),
+            blocked_requests=data.get("blocked_requests"),
+            cache=data.get("cache"),
+            original_size=data.get("original_size"),
+            extracted_size=data.get("extracted_size"),
+            timings=data.get("timings"),
+            depth=data.get("depth"),
+            pack=pack,
+        )
+        if data.get("timestamp"):
+            created = datetime.fromisoformat(data["timestamp"])
+            result.created_at = created.replace(tzinfo=timezone.utc).timestamp()
+        return result
+
 
 class Report:
     """Scraping report"""
 
-    def __init__(self, query: str, mode: str, total_urls: int = 10):
+    def __init__(self, query: str, mode: str, total_urls: int = 10, sink=None):
+        """
+        Initialize report
+
+        Args:
+            query: Original input (URL or query)
+            mode: "single_url", "multi_url" or "crawl"
+            total_urls: Number of URLs that may be attempted
+            sink: Optional NdjsonReportSink; results are written to it as
+                they are added instead of being kept in `results`
+        """
         self.query = query
         self.mode = mode
         self.total_urls_attempted = total_urls
@@ -48,8 +156,44 @@ class Report:
         self.results = []
         self.failed_urls = []
         self.generated_at = datetime.utcnow().isoformat()
+        self.sink = sink
+        self.finished = False
+        # Seconds per phase of the whole run (see tracing.Trace.timings)
+        self.timings = {}
+
+    def _add(self, result: ScrapeResult) -> None:
+        if self.sink is not None:
+            self.sink.write_result(self.query, result)
+        else:
+            self.results.append(result)
+
+    def add_result(self, result: ScrapeResult) -> None:
+        """
+        Add an existing result, e.g. one restored from a job checkpoint
 
-    def add_success(self, url: str, content: str, source: str) -> None:
+        Args:
+            result: Successful or failed ScrapeResult
+        """
+        if result.accessible:
+            self.successful_scrapes += 1
+        else:
+            self.failed_scrapes += 1
+            self.failed_urls.append(result.url)
+        self._add(result)
+
+    def add_success(
+        self,
+        url: str,
+        content: str,
+        source: str,
+        tier: Optional[str] = None,
+        blocked_requests: Optional[int] = None,
+        cache: Optional[str] = None,
+        original_size: Optional[int] = None,
+        extracted_size: Optional[int] = None,
+        timings: Optional[dict] = None,
+        depth: Optional[int] = None,
+    ) -> ScrapeResult:
         """
         Add successful scrape result
 
@@ -57,6 +201,16 @@ class Report:
             url: URL that was scraped
             content: Scraped content
             source: Source of URL (main_list, backup_list, single_url)
+            tier: Fetch tier that served the page (http, browser)
+            blocked_requests: Requests blocked by the request filter
+            cache: Page cache outcome (hit, revalidated, miss)
+            original_size: Visible text characters of the full page
+            extracted_size: Visible text characters of the extracted main content
+            timings: Seconds per fetch phase (navigation, conversion, ...)
+            depth: Link hops from the crawl seed (crawl mode only)
+
+        Returns:
+            The added result
         """
         self.successful_scrapes += 1
         result = ScrapeResult(
@@ -65,16 +219,37 @@ class Report:
             accessible=True,
             content=content,
             source=source,
+            tier=tier,
+            blocked_requests=blocked_requests,
+            cache=cache,
+            original_size=original_size,
+            extracted_size=extracted_size,
+            timings=timings,
+            depth=depth,
+            # Content streamed to a sink is written once and never read back
+            pack=self.sink is None,
         )
-        self.results.append(result)
+        self._add(result)
+        return result
 
-    def add_failure(self, url: str, source: str = "unknown") -> None:
+    def add_failure(
+        self,
+        url: str,
+        source: str = "unknown",
+        timings: Optional[dict] = None,
+        depth: Optional[int] = None,
+    ) -> ScrapeResult:
         """
         Add failed scrape result
 
         Args:
             url: URL that failed
             source: Source of URL
+            timings: Seconds per fetch phase reached before the failure
+            depth: Link hops from the crawl seed (crawl mode only)
+
+        Returns:
+            The added result
         """
         self.failed_scrapes += 1
         self.failed_urls.append(url)
@@ -84,8 +259,17 @@ class Report:
             accessible=False,
             content=None,
             source=source,
+            timings=timings,
+            depth=depth,
         )
-        self.results.append(result)
+        self._add(result)
+        return result
+
+    def finish(self) -> None:
+        """Write the report summary to the sink once all results are added"""
+        if self.sink is not None and not self.finished:
+            self.sink.write_report(self)
+        self.finished = True
 
     def to_dict(self) -> dict:
         """Convert report to dictionary"""
@@ -97,9 +281,34 @@ class Report:
             "failed_scrapes": self.failed_scrapes,
             "results": [r.to_dict() for r in self.results],
             "failed_urls": self.failed_urls,
+            "timings": self.timings,
             "generated_at": self.generated_at,
         }
 
+    @classmethod
+    def from_dict(cls, data: dict, sink=None) -> "Report":
+        """
+        Rebuild a report from to_dict() output
+
+        Args:
+            data: Dictionary produced by to_dict()
+            sink: Optional NdjsonReportSink; the results are written to it
+        """
+        report = cls(
+            query=data["query"],
+            mode=data["mode"],
+            total_urls=data.get("total_urls_attempted", 10),
+            sink=sink,
+        )
+        for item in data.get("results", []):
+            report._add(ScrapeResult.from_dict(item, pack=sink is None))
+        report.successful_scrapes = data.get("successful_scrapes", 0)
+        report.failed_scrapes = data.get("failed_scrapes", 0)
+        report.failed_urls = list(data.get("failed_urls", []))
+        report.timings = data.get("timings") or {}
+        report.generated_at = data.get("generated_at", report.generated_at)
+        return report
+
     def to_json(self, indent: int = 2) -> str:
         """Convert report to JSON string"""
         return json.dumps(self.to_dict(), indent=indent, ensure_ascii=False)
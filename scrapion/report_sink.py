@@ -0,0 +1,249 @@
+"""Streaming NDJSON report sink module"""
+
+import gzip
+import io
+import json
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Optional
+
+
+# "auto" picks the compression from the file extension
+COMPRESSIONS = ("auto", "none", "gzip", "zstd")
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _zstandard():
+    """Import the optional zstandard package"""
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            "zstd compression requires the zstandard package (pip install scrapion[zstd])"
+        ) from None
+    return zstandard
+
+
+def _resolve_compression(path: Path, compression: str) -> str:
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"compression must be one of {', '.join(COMPRESSIONS)}, got {compression!r}")
+    if compression != "auto":
+        return compression
+    if path.suffix == ".gz":
+        return "gzip"
+    if path.suffix in (".zst", ".zstd"):
+        return "zstd"
+    return "none"
+
+
+def _utcnow() -> str:
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+
+
+class NdjsonReportSink:
+    """
+    Writes scrape results as newline-delimited JSON while a run progresses
+
+    Every line is a JSON object with a "type" key:
+
+    - "result": one ScrapeResult plus the "query" it belongs to
+    - "report": a finished Report's summary (counters, failed URLs)
+    - "trailer": the last line, with counters for the whole file
+
+    Lines are buffered and written in batches: once `batch_size` lines
+    are waiting, when a line arrives `flush_interval` seconds after the
+    last write, and whenever a report finishes. The file can be read
+    while the run is still going; results of an unfinished report may
+    not be in it yet. A file without a trailer was not closed cleanly. Opened with append=True, records go after those of earlier
+    runs, each run ending with its own trailer.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        compression: str = "auto",
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        append: bool = False,
+    ):
+        """
+        Initialize NDJSON sink
+
+        Args:
+            path: Output file; parent directories are created
+            compression: "auto" (from the extension: .gz, .zst), "none",
+                "gzip" or "zstd" (needs the zstandard package)
+            batch_size: Lines buffered before they are written
+            flush_interval: Seconds after which a partial batch is written
+                with the next line
+            append: Add to an existing file instead of replacing it
+                (compressed files get another gzip member or zstd frame)
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        self.path = Path(path)
+        self.compression = _resolve_compression(self.path, compression)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.append = append
+
+        self.reports = 0
+        self.results = 0
+        self.successful_scrapes = 0
+        self.failed_scrapes = 0
+        self.started_at = _utcnow()
+
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self._file = self._open()
+
+    def _open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        mode = "a" if self.append else "w"
+        if self.compression == "gzip":
+            return gzip.open(self.path, mode + "t", encoding="utf-8")
+        if self.compression == "zstd":
+            zstandard = _zstandard()
+            raw = open(self.path, mode + "b")
+            writer = zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+            return io.TextIOWrapper(writer, encoding="utf-8")
+        return open(self.path, mode, encoding="utf-8")
+
+    @property
+    def closed(self) -> bool:
+        return self._file is None
+
+    def _write(self, record: dict) -> None:
+        if self._file is None:
+            raise ValueError("sink is closed")
+        self._buffer.append(json.dumps(record, ensure_ascii=False))
+        if len(self._buffer) >= self.batch_size \
+                or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def write_result(self, query: str, result) -> None:
+        """
+        Write one scrape result
+
+        Args:
+            query: Query or URL of the report the result belongs to
+            result: ScrapeResult
+        """
+        self.results += 1
+        if result.status == "success":
+            self.successful_scrapes += 1
+        else:
+            self.failed_scrapes += 1
+        self._write({"type": "result", "query": query, **result.to_dict()})
+
+    def write_report(self, report) -> None:
+        """
+        Write the summary of a finished report (without its results)
+
+        Args:
+            report: Report whose results were streamed to this sink
+        """
+        self.reports += 1
+        summary = report.to_dict()
+        summary.pop("results", None)
+        self._write({"type": "report", **summary})
+        # The report is complete, so its results should not wait for the
+        # next one to arrive
+        self.flush()
+
+    def flush(self) -> None:
+        """Write buffered lines and flush them to the file"""
+        if self._file is None:
+            return
+        if self._buffer:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._buffer = []
+        self._file.flush()
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        """Write the trailer line and close the file"""
+        if self._file is None:
+            return
+        self._buffer.append(json.dumps({
+            "type": "trailer",
+            "reports": self.reports,
+            "results": self.results,
+            "successful_scrapes": self.successful_scrapes,
+            "failed_scrapes": self.failed_scrapes,
+            "started_at": self.started_at,
+            "finished_at": _utcnow(),
+        }))
+        try:
+            self.flush()
+        finally:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "NdjsonReportSink":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def _open_for_reading(path: Path):
+    """
+    Open a report file, detecting its compression
+
+    Returns:
+        (text file, exception types raised when the compressed stream
+        breaks off)
+    """
+    with open(path, "rb") as f:
+        magic = f.read(4)
+    if magic.startswith(_GZIP_MAGIC):
+        return gzip.open(path, "rt", encoding="utf-8"), (EOFError,)
+    if magic == _ZSTD_MAGIC:
+        zstandard = _zstandard()
+        reader = zstandard.ZstdDecompressor().stream_reader(
+            open(path, "rb"), closefd=True, read_across_frames=True
+        )
+        return io.TextIOWrapper(reader, encoding="utf-8"), (zstandard.ZstdError,)
+    if magic and len(magic) < 4 and (_GZIP_MAGIC.startswith(magic) or _ZSTD_MAGIC.startswith(magic)):
+        # Only the start of a compressed file's header is written yet
+        return io.StringIO(), ()
+    return open(path, "r", encoding="utf-8"), ()
+
+
+def read_ndjson(path: str, types: Optional[tuple[str, ...]] = None) -> Iterator[dict]:
+    """
+    Stream records back from an NDJSON report file
+
+    The compression is detected from the file contents. An incomplete
+    last line, or a gzip or zstd stream that breaks off, as left by a
+    writer that is still running or was killed, ends the iteration
+    instead of raising.
+
+    Args:
+        path: File written by NdjsonReportSink
+        types: Only yield records of these types ("result", "report",
+            "trailer"); all records when None
+
+    Yields:
+        One dictionary per line
+    """
+    f, truncated = _open_for_reading(Path(path))
+    with f:
+        lines = iter(f)
+        while True:
+            try:
+                line = next(lines)
+            except StopIteration:
+                return
+            except truncated:
+                return
+            if not line.endswith("\n") or not line.strip():
+                continue
+            record = json.loads(line)
+            if types is None or record.get("type") in types:
+                yield record
@@ -0,0 +1,154 @@
+"""Network request filtering module"""
+
+import re
+from typing import Iterable, Optional, Union
+from urllib.parse import urlsplit
+
+
+# Resource types a text extractor never needs
+DEFAULT_BLOCKED_RESOURCE_TYPES = ("image", "media", "font", "stylesheet")
+
+# Ad, analytics and tracking hosts (subdomains are blocked too)
+DEFAULT_BLOCKED_DOMAINS = (
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googletagservices.com",
+    "adservice.google.com",
+    "facebook.net",
+    "connect.facebook.net",
+    "scorecardresearch.com",
+    "quantserve.com",
+    "hotjar.com",
+    "segment.io",
+    "segment.com",
+    "mixpanel.com",
+    "amplitude.com",
+    "fullstory.com",
+    "newrelic.com",
+    "nr-data.net",
+    "criteo.com",
+    "taboola.com",
+    "outbrain.com",
+    "adnxs.com",
+    "amazon-adsystem.com",
+    "moatads.com",
+)
+
+
+class RouteStats:
+    """Request counters for one page"""
+
+    def __init__(self):
+        self.allowed = 0
+        self.blocked = 0
+        self.blocked_by = {}
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary"""
+        return {
+            "allowed": self.allowed,
+            "blocked": self.blocked,
+            "blocked_by": dict(self.blocked_by),
+        }
+
+
+class RequestFilter:
+    """
+    Blocks heavy and third-party requests through Playwright's page.route
+
+    Requests are blocked by resource type, by domain (including
+    subdomains), or by URL regex. The main document is never blocked.
+    """
+
+    def __init__(
+        self,
+        block_resource_types: Iterable[str] = DEFAULT_BLOCKED_RESOURCE_TYPES,
+        block_domains: Iterable[str] = DEFAULT_BLOCKED_DOMAINS,
+        block_patterns: Iterable[Union[str, "re.Pattern"]] = (),
+    ):
+        """
+        Initialize request filter
+
+        Args:
+            block_resource_types: Playwright resource types to block
+                (image, media, font, stylesheet, script, xhr, ...)
+            block_domains: Hosts to block, subdomains included
+            block_patterns: Regular expressions matched against the full URL
+        """
+        self.block_resource_types = frozenset(block_resource_types)
+        self.block_domains = tuple(d.lower().lstrip(".") for d in block_domains)
+        self.block_patterns = [re.compile(p) if isinstance(p, str) else p for p in block_patterns]
+
+    @classmethod
+    def allow_all(cls) -> "RequestFilter":
+        """Filter that blocks nothing but still counts requests"""
+        return cls(block_resource_types=(), block_domains=(), block_patterns=())
+
+    def _blocked_domain(self, host: str) -> bool:
+        """Check if host is a blocked domain or one of its subdomains"""
+        for domain in self.block_domains:
+            if host == domain or host.endswith("." + domain):
+                return True
+        return False
+
+    def should_block(self, url: str, resource_type: str) -> Optional[str]:
+        """
+        Decide whether a request should be blocked
+
+        Args:
+            url: Request URL
+            resource_type: Playwright resource type
+
+        Returns:
+            Block reason ("resource_type", "domain", "pattern") or None
+        """
+        if resource_type == "document":
+            return None
+
+        if resource_type in self.block_resource_types:
+            return "resource_type"
+
+        host = (urlsplit(url).hostname or "").lower()
+        if host and self._blocked_domain(host):
+            return "domain"
+
+        for pattern in self.block_patterns:
+            if pattern.search(url):
+                return "pattern"
+
+        return None
+
+    async def attach(self, page) -> RouteStats:
+        """
+        Install the filter on a page
+
+        Must be called before navigating.
+
+        Args:
+            page: Playwright page
+
+        Returns:
+            RouteStats updated as the page issues requests
+        """
+        stats = RouteStats()
+
+        async def handle(route):
+            request = route.request
+            reason = self.should_block(request.url, request.resource_type)
+            try:
+                if reason is None:
+                    stats.allowed += 1
+                    await route.continue_()
+                else:
+                    stats.blocked += 1
+                    stats.blocked_by[reason] = stats.blocked_by.get(reason, 0) + 1
+                    await route.abort()
+            except Exception:
+                # Page closed while the request was in flight
+                pass
+
+        await page.route("**/*", handle)
+        return stats
@@ -0,0 +1,118 @@
+"""Offline DuckDuckGo results page parser module"""
+
+from html.parser import HTMLParser
+
+
+_VOID_TAGS = frozenset((
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+))
+
+
+def _clean(text: str) -> str:
+    """Strip whitespace and drop characters that cannot be UTF-8 encoded"""
+    return text.strip().encode("utf-8", errors="ignore").decode("utf-8")
+
+
+def _classes(attrs: list) -> list[str]:
+    for name, value in attrs:
+        if name == "class" and value:
+            return value.split()
+    return []
+
+
+class _ResultsParser(HTMLParser):
+    """
+    Collects result containers from a DuckDuckGo HTML results page
+
+    Mirrors the selectors the browser extraction used: every
+    `.result__body` container, its first `h2.result__title a.result__a`
+    (title and link) and its first `a.result__snippet`.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.containers = []
+        # Open elements as (tag, role); role is "body", "title", "title_link",
+        # "snippet" or None
+        self._stack = []
+        self._container = None
+        self._capture = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _VOID_TAGS:
+            return
+
+        role = None
+        classes = _classes(attrs)
+        if self._container is None:
+            if "result__body" in classes:
+                role = "body"
+                self._container = {"title": None, "link": "", "snippet": None}
+                self.containers.append(self._container)
+        elif self._capture is None:
+            if tag == "h2" and "result__title" in classes:
+                role = "title"
+            elif tag == "a" and "result__a" in classes and self._container["title"] is None \
+                    and any(r == "title" for _, r in self._stack):
+                role = "title_link"
+                self._container["title"] = []
+                self._container["link"] = dict(attrs).get("href") or ""
+                self._capture = self._container["title"]
+            elif tag == "a" and "result__snippet" in classes and self._container["snippet"] is None:
+                role = "snippet"
+                self._container["snippet"] = []
+                self._capture = self._container["snippet"]
+
+        self._stack.append((tag, role))
+
+    def handle_endtag(self, tag):
+        if not any(t == tag for t, _ in self._stack):
+            return
+        while self._stack:
+            open_tag, role = self._stack.pop()
+            if role == "body":
+                self._container = None
+                self._capture = None
+            elif role in ("title_link", "snippet"):
+                self._capture = None
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self._capture is not None:
+            self._capture.append(data)
+
+
+def parse_results_html(html: str, page_num: int = 1) -> list[dict]:
+    """
+    Extract search results from the HTML of a DuckDuckGo results page
+
+    Works on live `page.content()` output as well as on saved pages.
+
+    Args:
+        html: HTML of a html.duckduckgo.com results page
+        page_num: Results page number recorded on every result
+
+    Returns:
+        List of dictionaries with keys: title, link, snippet, page_number,
+        position (1-based index among all result containers)
+    """
+    parser = _ResultsParser()
+    parser.feed(html)
+    parser.close()
+
+    results = []
+    for i, container in enumerate(parser.containers, 1):
+        title = _clean("".join(container["title"] or ()))
+        # Only add if we have at least a title
+        if not title:
+            continue
+        results.append({
+            "title": title,
+            "link": container["link"],
+            "snippet": _clean("".join(container["snippet"] or ())),
+            "page_number": page_num,
+            "position": i,
+        })
+    return results
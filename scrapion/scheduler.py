@@ -0,0 +1,355 @@
+"""Per-host politeness scheduler module"""
+
+import asyncio
+import random
+import time
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from .tracing import span
+from .url_utils import get_host
+
+
+# Responses that mean "slow down"; the host is paused before the next request
+BACKOFF_STATUSES = (429, 503)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Seconds to wait according to a Retry-After header
+
+    Args:
+        value: Header value, delay seconds or an HTTP date
+
+    Returns:
+        Non-negative seconds, or None when absent or unparseable
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class _HostState:
+    """Token bucket, in-flight count and backoff of one host"""
+
+    __slots__ = ("rate", "burst", "concurrency", "tokens", "updated", "active",
+                 "blocked_until", "failures", "waiters")
+
+    def __init__(self, rate: float, burst: float, concurrency: int, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.concurrency = concurrency
+        self.tokens = burst
+        self.updated = now
+        self.active = 0
+        self.blocked_until = 0.0
+        self.failures = 0
+        self.waiters = deque()
+
+    def refill(self, now: float) -> None:
+        if self.rate > 0:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        else:
+            self.tokens = self.burst
+        self.updated = now
+
+    def ready_at(self, now: float) -> float:
+        """Earliest time a request may start, ignoring the concurrency cap"""
+        start = max(now, self.blocked_until)
+        if self.tokens < 1 and self.rate > 0:
+            start = max(start, now + (1 - self.tokens) / self.rate)
+        return start
+
+
+class FetchScheduler:
+    """
+    Decides when each request to a host may start
+
+    Every host has a token bucket (`rate` requests per second, bursts of
+    up to `burst`) and a cap on requests in flight; all hosts together
+    share a global cap. Waiting requests are granted round-robin across
+    hosts, so one host with a long queue cannot starve the others.
+
+    A 429 or 503 response pauses its host for the Retry-After delay or an
+    exponential backoff, whichever is longer.
+
+    The scheduler is bound to the event loop it is first used on.
+    """
+
+    def __init__(
+        self,
+        rate: float = 2.0,
+        burst: float = 4.0,
+        per_host_concurrency: int = 2,
+        global_concurrency: int = 16,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        max_retries: int = 2,
+    ):
+        """
+        Initialize fetch scheduler
+
+        Args:
+            rate: Requests per second per host; 0 disables rate limiting
+            burst: Requests a host may receive back to back after idling
+            per_host_concurrency: Requests in flight per host
+            global_concurrency: Requests in flight across all hosts
+            backoff_base: First backoff after a 429/503, in seconds; doubles
+                with every further one
+            backoff_max: Longest backoff in seconds (Retry-After may be longer)
+            max_retries: Times a fetch retries a 429/503 response
+        """
+        if rate < 0:
+            raise ValueError("rate must not be negative")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        if per_host_concurrency < 1 or global_concurrency < 1:
+            raise ValueError("concurrency limits must be at least 1")
+        if max_retries < 0:
+            raise ValueError("max_retries must not be negative")
+
+        self.rate = rate
+        self.burst = burst
+        self.per_host_concurrency = per_host_concurrency
+        self.global_concurrency = global_concurrency
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_retries = max_retries
+
+        self.active = 0
+        self._hosts = {}
+        self._overrides = {}
+        # Hosts with waiting requests, in round-robin order
+        self._ring = deque()
+        self._timer = None
+        self._loop = None
+
+    def __getstate__(self) -> dict:
+        # A copy in another process starts with the same limits and no
+        # hosts, waiters or timer
+        state = self.__dict__.copy()
+        state.update(active=0, _hosts={}, _ring=deque(), _timer=None, _loop=None)
+        return state
+
+    def split(self, parts: int) -> "FetchScheduler":
+        """
+        Scheduler for one of `parts` processes sharing these limits
+
+        Per-host rates, bursts and concurrency (overrides included) are
+        divided by `parts`. Together the processes keep to this
+        scheduler's per-host rate; bursts and concurrency do not go below
+        1, so they only keep to those limits while `parts` is at most
+        the burst and per-host concurrency. Beyond that a host can see
+        one request per process in flight. Backoff state is not shared:
+        each process pauses a host on its own 429/503 responses.
+
+        Returns:
+            A new scheduler with no hosts, waiters or timer
+        """
+        if parts < 1:
+            raise ValueError("parts must be at least 1")
+
+        def share(rate, burst, concurrency):
+            return rate / parts, max(1.0, burst / parts), max(1, concurrency // parts)
+
+        scheduler = FetchScheduler(
+            *share(self.rate, self.burst, self.per_host_concurrency),
+            global_concurrency=self.global_concurrency,
+            backoff_base=self.backoff_base,
+            backoff_max=self.backoff_max,
+            max_retries=self.max_retries,
+        )
+        scheduler._overrides = {host: share(*limits) for host, limits in self._overrides.items()}
+        return scheduler
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            rate, burst, concurrency = self._overrides.get(
+                host, (self.rate, self.burst, self.per_host_concurrency)
+            )
+            state = self._hosts[host] = _HostState(rate, burst, concurrency, time.monotonic())
+        return state
+
+    def set_host_limits(
+        self,
+        host: str,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        concurrency: Optional[int] = None,
+    ) -> None:
+        """
+        Override the limits of one host
+
+        Args:
+            host: Host name as returned by url_utils.get_host
+            rate: Requests per second (default: the scheduler's rate)
+            burst: Bucket size (default: the scheduler's burst)
+            concurrency: Requests in flight (default: per_host_concurrency)
+        """
+        limits = (
+            self.rate if rate is None else rate,
+            self.burst if burst is None else burst,
+            self.per_host_concurrency if concurrency is None else concurrency,
+        )
+        self._overrides[host] = limits
+        state = self._hosts.get(host)
+        if state is not None:
+            state.rate, state.burst, state.concurrency = limits
+            state.tokens = min(state.tokens, state.burst)
+            self._dispatch()
+
+    async def acquire(self, url: str) -> str:
+        """
+        Wait until a request to the URL's host may start
+
+        Returns:
+            The host, to be passed to release()
+        """
+        host = get_host(url)
+        state = self._state(host)
+        self._loop = asyncio.get_running_loop()
+        waiter = self._loop.create_future()
+        state.waiters.append(waiter)
+        if host not in self._ring:
+            self._ring.append(host)
+        self._dispatch()
+
+        if not waiter.done():
+            with span("schedule_wait", host=host):
+                try:
+                    await waiter
+                except asyncio.CancelledError:
+                    if waiter.done() and not waiter.cancelled():
+                        # Granted just before the cancellation
+                        self.release(host)
+                    else:
+                        try:
+                            state.waiters.remove(waiter)
+                        except ValueError:
+                            pass
+                    raise
+        return host
+
+    def release(self, host: str) -> None:
+        """Mark a request to `host` as finished"""
+        state = self._hosts[host]
+        state.active -= 1
+        self.active -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """
+        Hold a request slot for the URL's host while the block runs
+
+        Yields:
+            The host
+        """
+        host = await self.acquire(url)
+        try:
+            yield host
+        finally:
+            self.release(host)
+
+    def feedback(self, url: str, status: Optional[int], retry_after: Optional[str] = None) -> Optional[float]:
+        """
+        Adjust a host's pacing after a response
+
+        Args:
+            url: Requested URL
+            status: HTTP status code (None when the request failed)
+            retry_after: Retry-After header value, if any
+
+        Returns:
+            Seconds the host is paused, or None if it is not
+        """
+        if status is None:
+            return None
+        state = self._state(get_host(url))
+        if status not in BACKOFF_STATUSES:
+            state.failures = 0
+            return None
+
+        backoff = min(self.backoff_max, self.backoff_base * 2 ** state.failures)
+        backoff *= random.uniform(0.8, 1.2)
+        delay = max(backoff, parse_retry_after(retry_after) or 0.0)
+        state.failures += 1
+        state.tokens = 0.0
+        state.blocked_until = max(state.blocked_until, time.monotonic() + delay)
+        return delay
+
+    def _dispatch(self) -> None:
+        """Grant waiting requests round-robin while limits allow"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        now = time.monotonic()
+        wake = None
+        granted = True
+        while granted and self._ring and self.active < self.global_concurrency:
+            granted = False
+            for _ in range(len(self._ring)):
+                host = self._ring[0]
+                self._ring.rotate(-1)
+                state = self._hosts[host]
+                while state.waiters and state.waiters[0].done():
+                    state.waiters.popleft()
+                if not state.waiters:
+                    self._ring.remove(host)
+                    continue
+
+                state.refill(now)
+                if state.active >= state.concurrency:
+                    continue
+                ready = state.ready_at(now)
+                if ready > now:
+                    wake = ready if wake is None else min(wake, ready)
+                    continue
+
+                state.tokens -= 1
+                state.active += 1
+                self.active += 1
+                state.waiters.popleft().set_result(None)
+                granted = True
+                if self.active >= self.global_concurrency:
+                    break
+
+        if wake is not None:
+            self._timer = self._loop.call_later(wake - now, self._dispatch)
+
+    def get_stats(self) -> dict:
+        """Scheduler counters"""
+        now = time.monotonic()
+        return {
+            "active": self.active,
+            "waiting": sum(len(state.waiters) for state in self._hosts.values()),
+            "hosts": len(self._hosts),
+            "paused_hosts": sorted(host for host, state in self._hosts.items() if state.blocked_until > now),
+        }
+
+
+_default_schedulers = weakref.WeakKeyDictionary()
+
+
+def default_scheduler() -> FetchScheduler:
+    """Scheduler shared by fetches on the running event loop without their own"""
+    loop = asyncio.get_running_loop()
+    scheduler = _default_schedulers.get(loop)
+    if scheduler is None:
+        scheduler = _default_schedulers[loop] = FetchScheduler()
+    return scheduler
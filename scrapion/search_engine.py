@@ -2,14 +2,45 @@ import asyncio
 import random
 import os
 import gc
+from abc import ABC, abstractmethod
+from typing import Optional, Union
+from urllib.parse import urlencode
 from pyvirtualdisplay import Display
 from playwright.async_api import async_playwright
 from fake_useragent import UserAgent
 
-async def search_duckduckgo(query: str, pages_to_navigate: int = 1, markdowned=True):
+from .browser_pool import BrowserPool
+from .cache import SearchCache
+from .request_filter import RequestFilter
+from .result_parser import parse_results_html
+from .scheduler import BACKOFF_STATUSES, FetchScheduler, default_scheduler
+from .search_profile import DUCKDUCKGO_RESULTS_URL, SearchProfile, get_profile
+from .tracing import span
+from .url_utils import normalize_url, unwrap_redirect
+
+async def search_duckduckgo(
+    query: str,
+    pages_to_navigate: int = 1,
+    markdowned=True,
+    pool: Optional[BrowserPool] = None,
+    request_filter: Optional[RequestFilter] = None,
+    profile: Union[str, SearchProfile, None] = None,
+    scheduler: Optional[FetchScheduler] = None,
+):
     """
     Simplified DuckDuckGo search without proxies - most reliable approach
+
+    When `pool` is given, the search runs on a warm browser from the shared
+    BrowserPool instead of launching a dedicated one. `request_filter`
+    blocks images, fonts, trackers etc. on the results pages. `profile`
+    ("stealth" by default, or "fast") decides whether the query is typed
+    like a human or requested directly. Every results-page navigation
+    takes a request slot of the DuckDuckGo host from `scheduler`; the
+    pauses between them do not, so concurrent searches are not starved.
     """
+    profile = get_profile(profile)
+    if scheduler is None:
+        scheduler = default_scheduler()
     # display = Display(
     #     visible=False, 
     #     size=(480, 320),  # Smaller resolution
@@ -23,167 +54,42 @@ async def search_duckduckgo(query: str, pages_to_navigate: int = 1, markdowned=T
     os.makedirs("screenshots", exist_ok=True)
     ua = UserAgent(browsers=['firefox'])
     all_results = []
-    screenshot_counter = 1
-    
-    async with async_playwright() as p:
-        # Simple, reliable browser configuration
-        browser = await p.firefox.launch(
-            headless=True,  # Set to True for server
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--disable-dev-shm-usage',
-                '--no-sandbox',
-                '--start-maximized'
-            ]
-        )
-        
+
+    if pool is not None:
         try:
-            page = await browser.new_page(no_viewport=True)
-            
-            # Basic stealth setup
-            await page.set_extra_http_headers({
-                'User-Agent': ua.random,
-                'Accept-Language': 'en-US,en;q=0.9'
-            })
-        
-            # Remove webdriver property (simple stealth)
-            await page.add_init_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            
+            async with pool.page(no_viewport=True) as page:
+                await _search_on_page(
+                    page, query, pages_to_navigate, ua, all_results, request_filter, profile, scheduler
+                )
+        except Exception as e:
+            print(f"Error during search: {e}")
+    else:
+        async with async_playwright() as p:
+            # Simple, reliable browser configuration
+            browser = await p.firefox.launch(
+                headless=True,  # Set to True for server
+                args=[
+                    '--disable-blink-features=AutomationControlled',
+                    '--disable-dev-shm-usage',
+                    '--no-sandbox',
+                    '--start-maximized'
+                ]
+            )
+
             try:
-                print(f"Navigating to DuckDuckGo HTML interface...")
-                random_fbid = random.randint(1000000000, 9999999999)
-                await page.goto("https://html.duckduckgo.com/html?fbid=" + str(random_fbid), timeout=90000)
-                
-                
-                # Screenshot 1: Initial page load
-                # await page.screenshot(path=f"screenshots/duckduck_{screenshot_counter:02d}_initial_page_load.png")
-                print(f"Screenshot {screenshot_counter}: Initial page loaded")
-                screenshot_counter += 1
-                
-                # Wait for the search input to be available
-                await page.wait_for_selector("#search_form_input_homepage")
-                
-                print(f"Searching for: {query}")
-                
-                # Screenshot 2: Before typing
-                # await page.screenshot(path=f"screenshots/duckduck_{screenshot_counter:02d}_before_typing.png")
-                print(f"Screenshot {screenshot_counter}: Before typing query")
-                screenshot_counter += 1
-                
-                # Human-like typing with delays
-                search_input = await page.query_selector("#search_form_input_homepage")
-                await search_input.click()
-                await asyncio.sleep(random.uniform(0.5, 1))
-                
-                # Type with human-like delays between characters
-                for char in query:
-                    await page.keyboard.type(char)
-                    await asyncio.sleep(random.uniform(0.005, 0.07))
-                
-                # Screenshot 3: After typing
-                # await page.screenshot(path=f"screenshots/duckduck_{screenshot_counter:02d}_after_typing.png")
-                print(f"Screenshot {screenshot_counter}: After typing '{query}'")
-                screenshot_counter += 1
-                
-                # Random delay before pressing Enter
-                await asyncio.sleep(random.uniform(0.5, 1.5))
-                
-                # Submit the search
-                await page.keyboard.press("Enter")
-                
-                # Wait for results to load
-                await page.wait_for_load_state("networkidle")
-                await asyncio.sleep(random.uniform(0.5, 1))
-                
-                # Screenshot 4: Search results loaded
-                # await page.screenshot(path=f"screenshots/duckduck_{screenshot_counter:02d}_search_results_loaded.png")
-                print(f"Screenshot {screenshot_counter}: Search results loaded")
-                screenshot_counter += 1
-                
-                print("Search results loaded")
-                
-                # Extract and print some results from first page
-                page_results = await extract_results(page, 1)
-                all_results.extend(page_results)
-                
-                # Navigate through additional pages
-                for i in range(pages_to_navigate-1):
-                    try:
-                        print(f"\nNavigating to page {i + 2}...")
-                        
-                        # Human-like delay before navigation
-                        await asyncio.sleep(random.uniform(2, 4))
-                        
-                        # Screenshot: Before looking for next button
-                        # await page.screenshot(path=f"screenshots/duckduck_{screenshot_counter:02d}_before_next_page_{i+2}.png")
-                        print(f"Screenshot {screenshot_counter}: Before looking for next page button")
-                        screenshot_counter += 1
-                        
-                        # Look for nav-link with submit input (next page button)
-                        nav_links = await page.query_selector_all(".nav-link")
-                        next_button = None
-                        
-                        for link in nav_links:
-                            submit_input = await link.query_selector("input[type='submit']")
-                            if submit_input:
-                                # Check if it's likely a "Next" button
-                                value = await submit_input.get_attribute("value")
-                                if value and ("next" in value.lower() or ">" in value):
-                                    next_button = submit_input
-                                    break
-                        
-                        if next_button:
-                            # Highlight the next button for visibility
-                            await page.evaluate("(element) => element.style.border = '3px solid red'", next_button)
-                            
-                            # Screenshot: Next button found and highlighted
-                            # await page.screenshot(path=f"screenshots/duckduck_{screenshot_counter:02d}_next_button_found_{i+2}.png")
-                            print(f"Screenshot {screenshot_counter}: Next button found and highlighted")
-                            screenshot_counter += 1
-                            
-                            # Human-like delay before clicking
-                            await asyncio.sleep(random.uniform(0.5, 1.5))
-                            
-                            await next_button.click()
-                            await page.wait_for_load_state("networkidle")
-                            
-                            # Human-like delay after page load
-                            await asyncio.sleep(random.uniform(0.02, 0.3))
-                            
-                            # Screenshot: After clicking next page
-                            # await page.screenshot(path=f"screenshots/duckduck_{screenshot_counter:02d}_page_{i+2}_loaded.png")
-                            print(f"Screenshot {screenshot_counter}: Page {i+2} loaded")
-                            screenshot_counter += 1
-                            
-                            page_results = await extract_results(page, i + 2)
-                            all_results.extend(page_results)
-                        else:
-                            # Screenshot: No next button found
-                            # await page.screenshot(path=f"screenshots/duckduck_{screenshot_counter:02d}_no_more_pages.png")
-                            print(f"Screenshot {screenshot_counter}: No more pages available")
-                            screenshot_counter += 1
-                            print("No more pages available")
-                            break
-                            
-                    except Exception as e:
-                        # Screenshot: Error occurred
-                        # await page.screenshot(path=f"screenshots/duckduck_{screenshot_counter:02d}_error_page_{i+2}.png")
-                        print(f"Screenshot {screenshot_counter}: Error occurred")
-                        screenshot_counter += 1
-                        print(f"Error navigating to page {i + 2}: {e}")
-                        break
-                        
+                page = await browser.new_page(no_viewport=True)
+                await _search_on_page(
+                    page, query, pages_to_navigate, ua, all_results, request_filter, profile, scheduler
+                )
+
             except Exception as e:
                 print(f"Error during search: {e}")
-            
-        except Exception as e:
-            print(f"Error during search: {e}")
 
-        finally:
-            await browser.close()
-            # display.stop()
-            gc.collect()  # Force garbage collection
-    
+            finally:
+                await browser.close()
+                # display.stop()
+                gc.collect()  # Force garbage collection
+
     # Format results as markdown string instead of returning list
     if not all_results:
         return "No search results found."
@@ -205,9 +111,217 @@ async def search_duckduckgo(query: str, pages_to_navigate: int = 1, markdowned=T
     
     return all_results
 
+
+async def _search_on_page(
+    page,
+    query: str,
+    pages_to_navigate: int,
+    ua,
+    all_results: list,
+    request_filter: Optional[RequestFilter] = None,
+    profile: Optional[SearchProfile] = None,
+    scheduler: Optional[FetchScheduler] = None,
+):
+    """
+    Drive a DuckDuckGo search on an already-open page
+
+    Results are appended to `all_results` as they are extracted, so pages
+    collected before an error are kept. Each navigation holds a slot of
+    `scheduler` (default: the loop's shared scheduler).
+    """
+    profile = get_profile(profile)
+    if scheduler is None:
+        scheduler = default_scheduler()
+
+    # Basic stealth setup
+    await page.set_extra_http_headers({
+        'User-Agent': ua.random,
+        'Accept-Language': 'en-US,en;q=0.9'
+    })
+
+    # Remove webdriver property (simple stealth)
+    await page.add_init_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+
+    route_stats = await request_filter.attach(page) if request_filter is not None else None
+    
+    try:
+        if profile.direct_url:
+            print(f"[SEARCH] Requesting results directly ({profile.name} profile): {query}")
+            async with scheduler.slot(DUCKDUCKGO_RESULTS_URL):
+                with span("search_navigation", direct=True):
+                    response = await page.goto(profile.results_url(query), timeout=90000)
+            _feedback(scheduler, response)
+        else:
+            await _submit_query(page, query, profile, scheduler)
+
+        await _collect_pages(page, pages_to_navigate, all_results, profile, scheduler)
+
+    except Exception as e:
+        print(f"Error during search: {e}")
+
+    if route_stats is not None:
+        print(f"[SEARCH] Blocked {route_stats.blocked} of {route_stats.blocked + route_stats.allowed} requests")
+
+
+def _feedback(scheduler: FetchScheduler, response) -> None:
+    """Tell the scheduler about a results-page navigation's status"""
+    if response is not None:
+        scheduler.feedback(DUCKDUCKGO_RESULTS_URL, response.status, response.headers.get("retry-after"))
+
+
+async def _submit_query(page, query: str, profile: SearchProfile, scheduler: FetchScheduler):
+    """Open the search homepage and type the query like a human"""
+    screenshot_counter = 1
+
+    print(f"Navigating to DuckDuckGo HTML interface...")
+    random_fbid = random.randint(1000000000, 9999999999)
+    async with scheduler.slot(DUCKDUCKGO_RESULTS_URL):
+        with span("search_navigation", direct=False):
+            response = await page.goto("https://html.duckduckgo.com/html?fbid=" + str(random_fbid), timeout=90000)
+    _feedback(scheduler, response)
+    
+    
+    # Screenshot 1: Initial page load
+    # await page.screenshot(path=f"screenshots/duckduck_{screenshot_counter:02d}_initial_page_load.png")
+    print(f"Screenshot {screenshot_counter}: Initial page loaded")
+    screenshot_counter += 1
+    
+    # Wait for the search input to be available
+    with span("search_input_ready"):
+        await page.wait_for_selector("#search_form_input_homepage")
+    
+    print(f"Searching for: {query}")
+    
+    # Screenshot 2: Before typing
+    # await page.screenshot(path=f"screenshots/duckduck_{screenshot_counter:02d}_before_typing.png")
+    print(f"Screenshot {screenshot_counter}: Before typing query")
+    screenshot_counter += 1
+    
+    # Human-like typing with delays
+    search_input = await page.query_selector("#search_form_input_homepage")
+    await search_input.click()
+    await profile.sleep("before_typing")
+    
+    # Type with human-like delays between characters
+    with span("search_typing", characters=len(query)):
+        for char in query:
+            await page.keyboard.type(char)
+            await profile.sleep("keystroke")
+    
+    # Screenshot 3: After typing
+    # await page.screenshot(path=f"screenshots/duckduck_{screenshot_counter:02d}_after_typing.png")
+    print(f"Screenshot {screenshot_counter}: After typing '{query}'")
+    screenshot_counter += 1
+    
+    # Random delay before pressing Enter
+    await profile.sleep("before_submit")
+    
+    # Submit the search and wait for results to load
+    async with scheduler.slot(DUCKDUCKGO_RESULTS_URL):
+        with span("search_submit"):
+            await page.keyboard.press("Enter")
+            await page.wait_for_load_state("networkidle")
+    await profile.sleep("after_results")
+    
+    # Screenshot 4: Search results loaded
+    # await page.screenshot(path=f"screenshots/duckduck_{screenshot_counter:02d}_search_results_loaded.png")
+    print(f"Screenshot {screenshot_counter}: Search results loaded")
+    screenshot_counter += 1
+    
+    print("Search results loaded")
+
+
+async def _collect_pages(
+    page,
+    pages_to_navigate: int,
+    all_results: list,
+    profile: SearchProfile,
+    scheduler: FetchScheduler,
+):
+    """Extract results from the loaded results page and the pages after it"""
+    screenshot_counter = 5
+    # Extract and print some results from first page
+    await profile.sleep("settle")
+    page_results = await extract_results(page, 1)
+    all_results.extend(page_results)
+    
+    # Navigate through additional pages
+    for i in range(pages_to_navigate-1):
+        try:
+            print(f"\nNavigating to page {i + 2}...")
+            
+            # Human-like delay before navigation
+            await profile.sleep("before_next_page")
+            
+            # Screenshot: Before looking for next button
+            # await page.screenshot(path=f"screenshots/duckduck_{screenshot_counter:02d}_before_next_page_{i+2}.png")
+            print(f"Screenshot {screenshot_counter}: Before looking for next page button")
+            screenshot_counter += 1
+            
+            # Look for nav-link with submit input (next page button)
+            nav_links = await page.query_selector_all(".nav-link")
+            next_button = None
+            
+            for link in nav_links:
+                submit_input = await link.query_selector("input[type='submit']")
+                if submit_input:
+                    # Check if it's likely a "Next" button
+                    value = await submit_input.get_attribute("value")
+                    if value and ("next" in value.lower() or ">" in value):
+                        next_button = submit_input
+                        break
+            
+            if next_button:
+                # Highlight the next button for visibility
+                await page.evaluate("(element) => element.style.border = '3px solid red'", next_button)
+                
+                # Screenshot: Next button found and highlighted
+                # await page.screenshot(path=f"screenshots/duckduck_{screenshot_counter:02d}_next_button_found_{i+2}.png")
+                print(f"Screenshot {screenshot_counter}: Next button found and highlighted")
+                screenshot_counter += 1
+                
+                # Human-like delay before clicking
+                await profile.sleep("before_next_click")
+                
+                async with scheduler.slot(DUCKDUCKGO_RESULTS_URL):
+                    with span("search_next_page", page=i + 2):
+                        await next_button.click()
+                        await page.wait_for_load_state("networkidle")
+                
+                # Human-like delay after page load
+                await profile.sleep("after_next_page")
+                
+                # Screenshot: After clicking next page
+                # await page.screenshot(path=f"screenshots/duckduck_{screenshot_counter:02d}_page_{i+2}_loaded.png")
+                print(f"Screenshot {screenshot_counter}: Page {i+2} loaded")
+                screenshot_counter += 1
+                
+                await profile.sleep("settle")
+                page_results = await extract_results(page, i + 2)
+                all_results.extend(page_results)
+            else:
+                # Screenshot: No next button found
+                # await page.screenshot(path=f"screenshots/duckduck_{screenshot_counter:02d}_no_more_pages.png")
+                print(f"Screenshot {screenshot_counter}: No more pages available")
+                screenshot_counter += 1
+                print("No more pages available")
+                break
+                
+        except Exception as e:
+            # Screenshot: Error occurred
+            # await page.screenshot(path=f"screenshots/duckduck_{screenshot_counter:02d}_error_page_{i+2}.png")
+            print(f"Screenshot {screenshot_counter}: Error occurred")
+            screenshot_counter += 1
+            print(f"Error navigating to page {i + 2}: {e}")
+            break
+
+
 async def extract_results(page, page_num: int):
     """
     Extract search results with title, link, and snippet from current page
+
+    The page HTML is read with a single page.content() call and parsed
+    offline (see result_parser.parse_results_html).
     
     Returns:
         List of dictionaries with keys: title, link, snippet, page_number, position
@@ -215,55 +329,16 @@ async def extract_results(page, page_num: int):
     results = []
     
     try:
-        # Wait a bit for content to stabilize
-        await asyncio.sleep(1)
-        
-        # Find all result containers - using the main result body containers
-        result_containers = await page.query_selector_all(".result__body")
-        
-        # print(f"\n--- Page {page_num} Results ---")
-        
-        for i, container in enumerate(result_containers, 1):
-            try:
-                # Extract title and main link
-                title_element = await container.query_selector("h2.result__title a.result__a")
-                title = ""
-                main_link = ""
-                
-                if title_element:
-                    title = await title_element.text_content()
-                    main_link = await title_element.get_attribute("href")
-                    title = title.strip().encode('utf-8', errors='ignore').decode('utf-8') if title else ""
-                
-                # Extract snippet
-                snippet_element = await container.query_selector("a.result__snippet")
-                snippet = ""
-                
-                if snippet_element:
-                    snippet = await snippet_element.text_content()
-                    snippet = snippet.strip().encode('utf-8', errors='ignore').decode('utf-8') if snippet else ""
-                
-                # Only add if we have at least a title
-                if title:
-                    result_data = {
-                        "title": title,
-                        "link": main_link,
-                        "snippet": snippet,
-                        "page_number": page_num,
-                        "position": i
-                    }
-                    
-                    results.append(result_data)
-                    
-                    # Print result for immediate feedback
-                    print(f"{i}. {title.encode('utf-8', errors='ignore').decode('utf-8')}")
-                    print(f"   URL: {main_link}")
-                    print(f"   Snippet: {snippet[:100].encode('utf-8', errors='ignore').decode('utf-8')}{'...' if len(snippet) > 100 else ''}")
-                    print()
-                    
-            except Exception as e:
-                print(f"Error extracting result {i}: {e}")
-                continue
+        with span("search_results_read", page=page_num):
+            results = parse_results_html(await page.content(), page_num)
+
+        for result in results:
+            snippet = result["snippet"]
+            # Print result for immediate feedback
+            print(f"{result['position']}. {result['title']}")
+            print(f"   URL: {result['link']}")
+            print(f"   Snippet: {snippet[:100]}{'...' if len(snippet) > 100 else ''}")
+            print()
         
         print(f"Successfully extracted {len(results)} results from page {page_num}")
         
@@ -272,6 +347,357 @@ async def extract_results(page, page_num: int):
     
     return results
 
+async def search_async(
+    query: str,
+    pages_to_navigate: int = 1,
+    pool: Optional[BrowserPool] = None,
+    request_filter: Optional[RequestFilter] = None,
+    cache: Optional[SearchCache] = None,
+    bypass_cache: bool = False,
+    profile: Union[str, SearchProfile, None] = None,
+) -> list[dict]:
+    """
+    Run a DuckDuckGo search on the caller's event loop
+
+    Async counterpart of search_initiate_nomarkdown for code that already
+    runs inside an event loop.
+
+    Args:
+        query: Search query
+        pages_to_navigate: Number of result pages to collect
+        pool: Optional shared BrowserPool
+        request_filter: Optional filter for the results pages' requests
+        cache: Optional SearchCache consulted before searching
+        bypass_cache: Skip the cache lookup (fresh results are still stored)
+        profile: Search profile, "stealth" (default), "fast" or a
+            SearchProfile
+
+    Returns:
+        List of result dictionaries (title, link, snippet, page_number,
+        position); empty if nothing was found
+    """
+    variant = _browser_variant(DuckDuckGoBrowserBackend.name, profile)
+    if cache is not None and not bypass_cache:
+        cached = await cache.call(cache.get, query, pages_to_navigate, variant)
+        if cached is not None:
+            print(f"[SEARCH] Cache hit for: {query}")
+            return cached
+
+    results = await search_duckduckgo(
+        query, pages_to_navigate, False, pool=pool, request_filter=request_filter, profile=profile
+    )
+    if not isinstance(results, list):
+        # "No search results found." message
+        return []
+
+    await _remember(cache, query, pages_to_navigate, results, variant)
+    return results
+
+
+async def _remember(cache: Optional[SearchCache], query: str, pages: int, results, variant: str) -> None:
+    """Store non-empty search results"""
+    if cache is not None and isinstance(results, list) and results:
+        await cache.call(cache.put, query, pages, results, variant=variant)
+
+
+def _browser_variant(name: str, profile: Union[str, SearchProfile, None]) -> str:
+    """Search cache variant of a browser search: backend and profile"""
+    return f"{name}/{get_profile(profile).name}"
+
+
+class SearchBackend(ABC):
+    """
+    Source of search results
+
+    Subclasses implement search(); results are dictionaries with title,
+    link, snippet, page_number and position keys. A backend that does not
+    answer within `timeout` seconds is left out of a merged search.
+    """
+
+    name = "backend"
+
+    def __init__(self, timeout: float = 60.0, name: Optional[str] = None):
+        """
+        Initialize search backend
+
+        Args:
+            timeout: Seconds a merged search waits for this backend
+            name: Name recorded on merged results (default: the class name)
+        """
+        self.timeout = timeout
+        if name:
+            self.name = name
+        # FetchScheduler pacing the backend's requests; a Client fills in
+        # its own, the event loop's default scheduler is used otherwise
+        self.scheduler: Optional[FetchScheduler] = None
+
+    def __getstate__(self) -> dict:
+        # Browser pools, HTTP clients and schedulers belong to one process
+        # and event loop; a copy (e.g. in a worker process) gets its
+        # client's own
+        state = self.__dict__.copy()
+        for name in ("pool", "http", "scheduler"):
+            if name in state:
+                state[name] = None
+        if "_owns_http" in state:
+            state["_owns_http"] = False
+        return state
+
+    @abstractmethod
+    async def search(self, query: str, pages_to_navigate: int = 1) -> list[dict]:
+        """
+        Run a search
+
+        Args:
+            query: Search query
+            pages_to_navigate: Number of result pages to collect
+
+        Returns:
+            List of result dictionaries, best first
+        """
+
+    @property
+    def cache_variant(self) -> str:
+        """What sets this backend's results apart in the SearchCache"""
+        return self.name
+
+    async def close(self) -> None:
+        """Release resources held by the backend"""
+
+
+class DuckDuckGoBrowserBackend(SearchBackend):
+    """DuckDuckGo driven through Playwright (search_duckduckgo)"""
+
+    name = "duckduckgo_browser"
+
+    def __init__(
+        self,
+        pool: Optional[BrowserPool] = None,
+        request_filter: Optional[RequestFilter] = None,
+        profile: Union[str, SearchProfile, None] = None,
+        timeout: float = 120.0,
+        name: Optional[str] = None,
+    ):
+        """
+        Initialize browser backend
+
+        Args:
+            pool: Optional shared BrowserPool; a Client fills in its own
+                pool when this is None
+            request_filter: Optional filter for the results pages' requests
+            profile: Search profile, "stealth" (default), "fast" or a
+                SearchProfile
+            timeout: Seconds a merged search waits for this backend
+            name: Name recorded on merged results
+        """
+        super().__init__(timeout, name)
+        self.pool = pool
+        self.request_filter = request_filter
+        self.profile = get_profile(profile)
+
+    @property
+    def cache_variant(self) -> str:
+        return _browser_variant(self.name, self.profile)
+
+    async def search(self, query: str, pages_to_navigate: int = 1) -> list[dict]:
+        results = await search_duckduckgo(
+            query, pages_to_navigate, False,
+            pool=self.pool, request_filter=self.request_filter, profile=self.profile,
+            scheduler=self.scheduler,
+        )
+        # search_duckduckgo returns a message string when nothing was found
+        return results if isinstance(results, list) else []
+
+
+class DuckDuckGoHtmlBackend(SearchBackend):
+    """
+    DuckDuckGo HTML results fetched over plain HTTP
+
+    No browser is involved: the results page is requested with the query
+    as a parameter and parsed with parse_results_html. `endpoint` can
+    point at any server that returns the same markup.
+    """
+
+    name = "duckduckgo_html"
+
+    def __init__(
+        self,
+        endpoint: str = DUCKDUCKGO_RESULTS_URL,
+        http=None,
+        timeout: float = 20.0,
+        name: Optional[str] = None,
+    ):
+        """
+        Initialize HTML backend
+
+        Args:
+            endpoint: Results URL; the query is sent as the `q` parameter
+            http: Optional shared web_access.HttpFetcher; a private one is
+                created on first use otherwise
+            timeout: Seconds a merged search waits for this backend
+            name: Name recorded on merged results
+        """
+        super().__init__(timeout, name)
+        self.endpoint = endpoint
+        self.http = http
+        self._owns_http = False
+
+    async def search(self, query: str, pages_to_navigate: int = 1) -> list[dict]:
+        if self.http is None:
+            # Imported here: web_access pulls in the conversion stack
+            from .web_access import HttpFetcher
+            self.http = HttpFetcher(timeout=self.timeout)
+            self._owns_http = True
+        scheduler = self.scheduler or default_scheduler()
+
+        results = []
+        for page_num in range(1, pages_to_navigate + 1):
+            params = {"q": query}
+            if page_num > 1:
+                # Offset of the first result on the page
+                params["s"] = str(len(results))
+            separator = "&" if "?" in self.endpoint else "?"
+            url = f"{self.endpoint}{separator}{urlencode(params)}"
+            for attempt in range(scheduler.max_retries + 1):
+                async with scheduler.slot(url):
+                    response = await self.http.get(url)
+                scheduler.feedback(url, response.status_code, response.headers.get("retry-after"))
+                if response.status_code not in BACKOFF_STATUSES:
+                    break
+            response.raise_for_status()
+
+            page_results = parse_results_html(response.text, page_num)
+            if not page_results:
+                break
+            results.extend(page_results)
+
+        print(f"[SEARCH] {self.name}: {len(results)} results")
+        return results
+
+    async def close(self) -> None:
+        if self._owns_http and self.http is not None:
+            await self.http.close()
+            self.http = None
+            self._owns_http = False
+
+
+# Rank-fusion constant: a result's merged score is the sum of
+# 1 / (RANK_FUSION_K + rank) over the backends that returned it
+RANK_FUSION_K = 60
+
+
+def merge_results(result_lists: list[list[dict]], backend_names: Optional[list[str]] = None) -> list[dict]:
+    """
+    Merge ranked result lists into one, dropping duplicates
+
+    Results are deduplicated on their normalized target URL (search
+    redirect links are unwrapped) and ordered by reciprocal rank fusion,
+    so a link ranked well by several backends comes first. Ties keep the
+    order of the backends.
+
+    Args:
+        result_lists: One ranked result list per backend
+        backend_names: Backend names recorded in each result's "backends"
+
+    Returns:
+        Merged result dictionaries with positions renumbered from 1
+    """
+    merged = {}
+    for index, results in enumerate(result_lists):
+        name = backend_names[index] if backend_names else str(index)
+        for rank, result in enumerate(results, 1):
+            link = result.get("link") if isinstance(result, dict) else None
+            if not link:
+                continue
+            key = normalize_url(unwrap_redirect(link))
+            entry = merged.get(key)
+            if entry is None:
+                entry = merged[key] = {"result": dict(result), "score": 0.0, "backends": []}
+                entry["result"]["link"] = unwrap_redirect(link)
+            entry["score"] += 1.0 / (RANK_FUSION_K + rank)
+            if name not in entry["backends"]:
+                entry["backends"].append(name)
+
+    # sorted() is stable, so equal scores keep first-seen order
+    ranked = sorted(merged.values(), key=lambda entry: -entry["score"])
+    output = []
+    for position, entry in enumerate(ranked, 1):
+        result = entry["result"]
+        result["position"] = position
+        result["backends"] = entry["backends"]
+        output.append(result)
+    return output
+
+
+async def _run_backend(backend: SearchBackend, query: str, pages_to_navigate: int) -> list[dict]:
+    """Run one backend under its timeout; failures yield no results"""
+    with span("search_backend", backend=backend.name) as fields:
+        try:
+            results = await asyncio.wait_for(backend.search(query, pages_to_navigate), backend.timeout)
+            fields["results"] = len(results)
+            return results
+        except asyncio.TimeoutError:
+            fields["error"] = "timeout"
+            print(f"[SEARCH] {backend.name} timed out after {backend.timeout}s; dropped from merge")
+        except Exception as e:
+            fields["error"] = e.__class__.__name__
+            print(f"[SEARCH] {backend.name} failed: {e}")
+    return []
+
+
+async def search_backends(
+    query: str,
+    backends: list[SearchBackend],
+    pages_to_navigate: int = 1,
+    cache: Optional[SearchCache] = None,
+    bypass_cache: bool = False,
+) -> list[dict]:
+    """
+    Query several backends concurrently and merge their results
+
+    Each backend runs under its own timeout; slow or failing backends are
+    left out of the merge instead of delaying or failing the search.
+
+    Args:
+        query: Search query
+        backends: Backends to query
+        pages_to_navigate: Number of result pages per backend
+        cache: Optional SearchCache holding merged results
+        bypass_cache: Skip the cache lookup (fresh results are still stored)
+
+    Returns:
+        Merged result dictionaries (see merge_results); empty if no
+        backend returned anything
+    """
+    if not backends:
+        raise ValueError("at least one search backend is required")
+
+    # Results of another backend set or profile are not interchangeable
+    variant = "+".join(sorted(backend.cache_variant for backend in backends))
+    if cache is not None and not bypass_cache:
+        with span("search_cache_lookup"):
+            cached = await cache.call(cache.get, query, pages_to_navigate, variant)
+        if cached is not None:
+            print(f"[SEARCH] Cache hit for: {query}")
+            return cached
+
+    result_lists = await asyncio.gather(
+        *(_run_backend(backend, query, pages_to_navigate) for backend in backends)
+    )
+    with span("search_merge"):
+        results = merge_results(list(result_lists), [backend.name for backend in backends])
+
+    await _remember(cache, query, pages_to_navigate, results, variant)
+    return results
+
+
+async def _search_nomarkdown(query: str, cache: Optional[SearchCache]):
+    """Run a one-page search and store its results"""
+    results = await search_duckduckgo(query, 1, False)
+    await _remember(cache, query, 1, results, _browser_variant(DuckDuckGoBrowserBackend.name, None))
+    return results
+
+
 def search_initiate(query: str):
     """
     Initiates the DuckDuckGo search process
@@ -322,18 +748,29 @@ def search_initiate(query: str):
                 return f"Search failed: {str(e3)}"
             
 
-def search_initiate_nomarkdown(query: str):
+def search_initiate_nomarkdown(query: str, cache: Optional[SearchCache] = None, bypass_cache: bool = False):
     """
     Initiates the DuckDuckGo search process
     Returns non-markdown formatted search results as JSON string
+
+    With a SearchCache, fresh cached results are returned without a
+    browser session unless bypass_cache is set.
+
+    Inside a running event loop, await search_async instead.
     """
     import json
     print(f"[SEARCH] Starting search for: {query}")
+
+    if cache is not None and not bypass_cache:
+        cached = cache.get(query, 1, _browser_variant(DuckDuckGoBrowserBackend.name, None))
+        if cached is not None:
+            print("[SEARCH] Cache hit")
+            return json.dumps(cached, ensure_ascii=False)
     
     try:
         # Always use asyncio.run to avoid event loop conflicts
         print("[SEARCH] Using asyncio.run for clean event loop")
-        results = asyncio.run(search_duckduckgo(query, 1, False))
+        results = asyncio.run(_search_nomarkdown(query, cache))
         return json.dumps(results, ensure_ascii=False)
     except Exception as e:
         print(f"[SEARCH] asyncio.run failed: {e}")
@@ -344,7 +781,7 @@ def search_initiate_nomarkdown(query: str):
             new_loop = asyncio.new_event_loop()
             asyncio.set_event_loop(new_loop)
             try:
-                result = new_loop.run_until_complete(search_duckduckgo(query, 1, False))
+                result = new_loop.run_until_complete(_search_nomarkdown(query, cache))
                 return json.dumps(result, ensure_ascii=False)
             finally:
                 new_loop.close()
@@ -362,7 +799,7 @@ def search_initiate_nomarkdown(query: str):
                     thread_loop = asyncio.new_event_loop()
                     asyncio.set_event_loop(thread_loop)
                     try:
-                        return thread_loop.run_until_complete(search_duckduckgo(query, 1, False))
+                        return thread_loop.run_until_complete(_search_nomarkdown(query, cache))
                     finally:
                         thread_loop.close()
                 
@@ -0,0 +1,134 @@
+"""Search behaviour profiles module"""
+
+import asyncio
+import random
+from typing import Callable, Optional, Union
+from urllib.parse import urlencode
+
+from .tracing import span
+
+
+# A delay is a fixed number of seconds, a (low, high) range sampled
+# uniformly, or a callable returning seconds
+Delay = Union[float, tuple[float, float], Callable[[], float]]
+
+# Direct results URL of the DuckDuckGo HTML interface
+DUCKDUCKGO_RESULTS_URL = "https://html.duckduckgo.com/html/"
+
+# Pauses a profile can configure, in the order a search goes through them
+DELAY_NAMES = (
+    "before_typing",     # after focusing the search box
+    "keystroke",         # between typed characters
+    "before_submit",     # before pressing Enter
+    "after_results",     # after the results page loaded
+    "before_next_page",  # before looking for the next-page button
+    "before_next_click", # before clicking it
+    "after_next_page",   # after the next page loaded
+    "settle",            # before reading results from a page
+)
+
+
+class SearchProfile:
+    """
+    How a browser search is driven
+
+    The "stealth" profile opens the search homepage, types the query one
+    character at a time and pauses like a human between steps. The "fast"
+    profile loads the results URL with the query as a parameter and never
+    sleeps.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        direct_url: bool = False,
+        delays: Optional[dict[str, Delay]] = None,
+    ):
+        """
+        Initialize search profile
+
+        Args:
+            name: Profile name, used in log messages
+            direct_url: Request the results URL directly instead of typing
+                the query into the homepage
+            delays: Pause per step (see DELAY_NAMES); missing steps do not
+                pause
+        """
+        delays = dict(delays or {})
+        unknown = set(delays) - set(DELAY_NAMES)
+        if unknown:
+            raise ValueError(f"unknown delay(s): {', '.join(sorted(unknown))}")
+        for key, delay in delays.items():
+            if isinstance(delay, tuple) and (len(delay) != 2 or delay[0] > delay[1] or delay[0] < 0):
+                raise ValueError(f"delay {key!r} must be a (low, high) range with 0 <= low <= high")
+
+        self.name = name
+        self.direct_url = direct_url
+        self.delays = delays
+
+    def sample(self, step: str) -> float:
+        """Draw the pause in seconds for a step"""
+        delay = self.delays.get(step)
+        if delay is None:
+            return 0.0
+        if callable(delay):
+            return max(0.0, float(delay()))
+        if isinstance(delay, tuple):
+            return random.uniform(*delay)
+        return float(delay)
+
+    async def sleep(self, step: str) -> None:
+        """Pause for a step; returns immediately when it has no delay"""
+        seconds = self.sample(step)
+        if seconds > 0:
+            with span("search_delay", step=step):
+                await asyncio.sleep(seconds)
+
+    def results_url(self, query: str) -> str:
+        """DuckDuckGo results URL for a query"""
+        return f"{DUCKDUCKGO_RESULTS_URL}?{urlencode({'q': query})}"
+
+    def with_delays(self, **delays: Delay) -> "SearchProfile":
+        """Copy of the profile with some delays replaced"""
+        return SearchProfile(self.name, self.direct_url, {**self.delays, **delays})
+
+
+STEALTH = SearchProfile(
+    "stealth",
+    delays={
+        "before_typing": (0.5, 1.0),
+        "keystroke": (0.005, 0.07),
+        "before_submit": (0.5, 1.5),
+        "after_results": (0.5, 1.0),
+        "before_next_page": (2.0, 4.0),
+        "before_next_click": (0.5, 1.5),
+        "after_next_page": (0.02, 0.3),
+    },
+)
+
+FAST = SearchProfile("fast", direct_url=True)
+
+SEARCH_PROFILES = {profile.name: profile for profile in (STEALTH, FAST)}
+DEFAULT_SEARCH_PROFILE = "stealth"
+
+
+def get_profile(profile: Union[str, SearchProfile, None]) -> SearchProfile:
+    """
+    Resolve a profile name or instance
+
+    Args:
+        profile: "stealth", "fast", a SearchProfile, or None for the default
+
+    Returns:
+        SearchProfile
+    """
+    if isinstance(profile, SearchProfile):
+        return profile
+    if profile is None:
+        profile = DEFAULT_SEARCH_PROFILE
+    try:
+        return SEARCH_PROFILES[profile]
+    except KeyError:
+        raise ValueError(
+            f"search profile must be one of {', '.join(SEARCH_PROFILES)}, got {profile!r}"
+        ) from None
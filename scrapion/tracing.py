@@ -0,0 +1,152 @@
+"""Per-phase timing trace module"""
+
+import contextvars
+import logging
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+
+logger = logging.getLogger("scrapion.trace")
+
+# Called with one event dictionary per finished span
+TraceHook = Callable[[dict], None]
+
+_hooks: list[TraceHook] = []
+_current: contextvars.ContextVar = contextvars.ContextVar("scrapion_trace", default=None)
+
+
+def add_hook(hook: TraceHook) -> None:
+    """
+    Register a callback for every finished span of every trace
+
+    Args:
+        hook: Callable taking an event dictionary with keys trace, span,
+            start (seconds since the trace began), seconds and any extra
+            fields of the span
+    """
+    _hooks.append(hook)
+
+
+def remove_hook(hook: TraceHook) -> None:
+    """Unregister a callback added with add_hook()"""
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+class Trace:
+    """
+    Timings of the phases of one scrape or one report
+
+    Spans are recorded by span() while the trace is active. Spans may
+    nest (browser_launch happens inside browser_acquire); timings() sums
+    repeated span names.
+    """
+
+    def __init__(self, name: str, hook: Optional[TraceHook] = None):
+        """
+        Initialize trace
+
+        Args:
+            name: What is traced, usually a URL or query
+            hook: Optional callback for this trace's spans, in addition to
+                the global hooks
+        """
+        self.name = name
+        self.hook = hook
+        self.started = time.perf_counter()
+        self.spans = []
+
+    def record(self, name: str, start: float, seconds: float, **fields) -> None:
+        """
+        Add a finished span and emit it to hooks and logging
+
+        Args:
+            name: Span name
+            start: perf_counter() value when the span began
+            seconds: Span duration
+            **fields: Extra event data (e.g. status, backend)
+        """
+        event = {
+            "trace": self.name,
+            "span": name,
+            "start": round(start - self.started, 6),
+            "seconds": round(seconds, 6),
+            **fields,
+        }
+        self.spans.append(event)
+
+        logger.debug("%s %s %.3fs", self.name, name, seconds)
+        hooks = [self.hook] if self.hook is not None else []
+        for hook in hooks + _hooks:
+            try:
+                hook(event)
+            except Exception:
+                logger.exception("trace hook failed")
+
+    def timings(self) -> dict:
+        """Seconds per span name, repeated spans summed"""
+        totals = {}
+        for event in self.spans:
+            totals[event["span"]] = round(totals.get(event["span"], 0.0) + event["seconds"], 6)
+        return totals
+
+    @contextmanager
+    def activate(self) -> Iterator["Trace"]:
+        """Make this the current trace for span() in this task"""
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+
+def current_trace() -> Optional[Trace]:
+    """The active trace of the running task, if any"""
+    return _current.get()
+
+
+def record(name: str, start: float, **fields) -> None:
+    """
+    Record a span that started at `start` and ends now on the current trace
+
+    For phases that do not fit a with block, e.g. across a yield.
+
+    Args:
+        name: Span name
+        start: time.perf_counter() value when the phase began
+        **fields: Extra event data
+    """
+    trace = _current.get()
+    if trace is not None:
+        trace.record(name, start, time.perf_counter() - start, **fields)
+
+
+@contextmanager
+def span(name: str, **fields) -> Iterator[dict]:
+    """
+    Time a block and record it on the current trace
+
+    Without an active trace the block runs untimed. The yielded dictionary
+    can be filled with extra fields while the block runs.
+
+    Args:
+        name: Span name, e.g. "navigation"
+        **fields: Extra event data
+
+    Yields:
+        Dictionary of extra fields
+    """
+    trace = _current.get()
+    if trace is None:
+        yield fields
+        return
+
+    start = time.perf_counter()
+    try:
+        yield fields
+    except BaseException as e:
+        fields.setdefault("error", e.__class__.__name__)
+        raise
+    finally:
+        trace.record(name, start, time.perf_counter() - start, **fields)
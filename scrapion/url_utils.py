@@ -0,0 +1,167 @@
+"""URL normalization helpers"""
+
+from urllib.parse import parse_qsl, unquote_plus, urlencode, urlsplit, urlunsplit
+
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def _netloc(parts, scheme: str) -> str:
+    """
+    Lowercased netloc of split URL parts without a default port
+
+    Keeps userinfo and the brackets around IPv6 literals.
+    """
+    host = (parts.hostname or "").lower()
+    if ":" in host:
+        host = f"[{host}]"
+    port = parts.port
+    if port and DEFAULT_PORTS.get(scheme) != port:
+        host = f"{host}:{port}"
+    userinfo, at, _ = parts.netloc.rpartition("@")
+    return f"{userinfo}@{host}" if at else host
+
+
+def remove_dot_segments(path: str) -> str:
+    """
+    Resolve "." and ".." path segments (RFC 3986, section 5.2.4)
+
+    Other segments, empty ones included, are kept, so "a//b" stays a
+    different path from "a/b".
+    """
+    output = []
+    while path:
+        if path.startswith("../"):
+            path = path[3:]
+        elif path.startswith("./"):
+            path = path[2:]
+        elif path.startswith("/./"):
+            path = path[2:]
+        elif path == "/.":
+            path = "/"
+        elif path.startswith("/../"):
+            path = path[3:]
+            if output:
+                output.pop()
+        elif path == "/..":
+            path = "/"
+            if output:
+                output.pop()
+        elif path in (".", ".."):
+            path = ""
+        else:
+            end = path.find("/", 1)
+            if end == -1:
+                end = len(path)
+            output.append(path[:end])
+            path = path[end:]
+    return "".join(output)
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonicalize a URL so equivalent spellings compare equal
+
+    Lowercases scheme and host, drops default ports and the fragment,
+    turns an empty path into "/" and sorts query parameters. Userinfo and
+    the brackets of IPv6 literals are kept.
+
+    Args:
+        url: URL to normalize
+
+    Returns:
+        Normalized URL
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = _netloc(parts, scheme)
+
+    path = parts.path or "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def get_host(url: str) -> str:
+    """Return the lowercased host of a URL ("" if it has none)"""
+    return (urlsplit(url).hostname or "").lower()
+
+
+# Redirect wrappers search engines put around result links, as
+# (host suffix, path, parameter holding the target URL)
+REDIRECT_WRAPPERS = (
+    ("duckduckgo.com", "/l/", "uddg"),
+)
+
+
+def unwrap_redirect(url: str) -> str:
+    """
+    Return the target of a search-engine redirect link
+
+    `//duckduckgo.com/l/?uddg=https%3A%2F%2Fexample.com%2F&rut=...` becomes
+    `https://example.com/`. Other URLs are returned unchanged.
+
+    Args:
+        url: Possibly wrapped URL
+
+    Returns:
+        Target URL
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    for suffix, path, param in REDIRECT_WRAPPERS:
+        if (host == suffix or host.endswith("." + suffix)) and parts.path == path:
+            for name, value in parse_qsl(parts.query):
+                if name == param and value:
+                    return value
+    return url
+
+
+# Query parameters that only identify campaigns, clicks or referrers;
+# names ending in "_" are prefixes
+TRACKING_PARAMS = frozenset((
+    "utm_", "gclid", "gclsrc", "dclid", "gbraid", "wbraid", "fbclid", "msclkid",
+    "yclid", "twclid", "igshid", "mc_cid", "mc_eid", "_hsenc", "_hsmi", "mkt_tok",
+    "ref_src", "ref_url", "spm", "vero_id", "oly_anon_id", "oly_enc_id", "rb_clickid",
+))
+
+
+def is_tracking_param(name: str) -> bool:
+    """Check if a query parameter name is a known tracking parameter"""
+    name = name.lower()
+    if name in TRACKING_PARAMS:
+        return True
+    return any(prefix.endswith("_") and name.startswith(prefix) for prefix in TRACKING_PARAMS)
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Turn a result link into the URL worth fetching
+
+    Unwraps search-engine redirects, gives protocol-relative links
+    "https:", lowercases scheme and host, drops default ports, resolves
+    "." and ".." path segments (keeping empty ones), removes tracking
+    parameters and the fragment. Unlike normalize_url() the remaining query keeps its order,
+    so the result is still the page the link pointed to.
+
+    Args:
+        url: Link as found in search results
+
+    Returns:
+        Canonical URL
+    """
+    url = unwrap_redirect(url.strip())
+    if url.startswith("//"):
+        url = "https:" + url
+
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = _netloc(parts, scheme)
+    path = remove_dot_segments(parts.path) or "/"
+
+    # Filter the raw pairs so the rest of the query keeps its encoding
+    query = "&".join(
+        pair for pair in parts.query.split("&")
+        if pair and not is_tracking_param(unquote_plus(pair.split("=", 1)[0]))
+    )
+    return urlunsplit((scheme, host, path, query, ""))
@@ -2,68 +2,727 @@
 import asyncio
 from pyvirtualdisplay import Display
 from playwright.async_api import async_playwright
-from markdownify import markdownify as md
 import gc
+import re
+import time
+from typing import Optional
 
-async def get_web_content_as_markdown(url: str) -> str:
-        # Use smaller display for better performance
-    # display = Display(
-    #     visible=False, 
-    #     size=(1024, 768),  # Smaller resolution
-    #     color_depth=16,    # Reduced color depth
-    #     extra_args=['-nocursor']  # Disable cursor for performance
-    # )
-    # display.start()
-        
+import httpx
+from fake_useragent import UserAgent
+
+from .browser_pool import BrowserPool
+from .cache import CacheEntry, PageCache
+from .content_extractor import find_main_content
+from .link_extractor import DOM_LINKS_SCRIPT, clean_links, extract_links
+from .markdown_converter import html_to_markdown as _builtin_markdown
+from .request_filter import RequestFilter, RouteStats
+from .scheduler import BACKOFF_STATUSES, FetchScheduler, default_scheduler
+from .tracing import span
+
+# Readiness strategies accepted by the fetch functions. "selector" waits for
+# DOM content and then for a caller-supplied CSS selector.
+READINESS_STRATEGIES = ("domcontentloaded", "load", "networkidle", "selector")
+
+DEFAULT_TIMEOUT = 30000  # milliseconds
+
+# Fetch tiers: "auto" tries plain HTTP and escalates to the browser only
+# when the response looks like it needs rendering
+FETCH_TIERS = ("auto", "http", "browser")
+
+# HTML to Markdown converters: "builtin" is the streaming converter in
+# markdown_converter, "markdownify" the original BeautifulSoup-based one.
+# The converter name is stored with cached Markdown; entries produced by
+# another converter are re-converted from their stored HTML.
+CONVERTERS = ("builtin", "markdownify")
+DEFAULT_CONVERTER = "builtin"
+
+# Suffix of the cache variant for Markdown produced from the extracted main
+# content rather than the full page
+MAIN_CONTENT_VARIANT = "+main"
+
+# Pages with less visible text than this are treated as empty/JS shells
+MIN_VISIBLE_TEXT = 200
+
+_TEXT_CONTENT_TYPES = ("text/", "application/json", "application/xml", "application/xhtml+xml")
+
+_CHALLENGE_MARKERS = (
+    "cf-browser-verification",
+    "challenge-platform",
+    "_cf_chl_opt",
+    "<title>just a moment...</title>",
+    "checking your browser before accessing",
+    "ddos-guard",
+    "px-captcha",
+    "g-recaptcha",
+    "h-captcha",
+)
+
+# A rendered page with a challenge marker and less visible text than this
+# is still the challenge, not content behind it
+_CHALLENGE_MAX_TEXT = 2000
+
+_JS_SHELL_MARKERS = (
+    "enable javascript",
+    "javascript is required",
+    "javascript is disabled",
+    'id="root"></div>',
+    'id="app"></div>',
+    'id="__next"></div>',
+)
+
+_SCRIPT_STYLE_RE = re.compile(r"<(script|style|noscript|template)\b.*?</\1\s*>", re.I | re.S)
+_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+
+
+class FetchedPage:
+    """Content of a fetched page and how it was obtained"""
+
+    def __init__(
+        self,
+        url: str,
+        html: str,
+        markdown: str,
+        tier: str,
+        status_code: Optional[int] = None,
+        escalation_reason: Optional[str] = None,
+        blocked_requests: Optional[int] = None,
+        cache_status: Optional[str] = None,
+        original_size: Optional[int] = None,
+        extracted_size: Optional[int] = None,
+        links: Optional[list[str]] = None,
+        final_url: Optional[str] = None,
+    ):
+        self.url = url
+        self.html = html
+        self.markdown = markdown
+        self.tier = tier
+        self.status_code = status_code
+        self.escalation_reason = escalation_reason
+        self.blocked_requests = blocked_requests
+        # "hit", "revalidated", "miss", or None when no cache is used
+        self.cache_status = cache_status
+        # Visible text characters of the page and of its extracted main
+        # content; None when extraction is off, found nothing or the
+        # Markdown came from the cache
+        self.original_size = original_size
+        self.extracted_size = extracted_size
+        # Absolute http(s) link targets, only collected on request
+        self.links = links
+        # URL after redirects; the requested URL when unknown (cache hits)
+        self.final_url = final_url or url
+
+
+class HttpFetcher:
     """
-    Fetches the content of a URL using a stealth-configured headless browser
-    and converts the main content to Markdown.
+    Pooled plain-HTTP client for the fast fetch tier
+
+    Connections are kept alive and reused per host across fetches.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 15.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        user_agent: Optional[str] = None,
+    ):
+        """
+        Initialize HTTP fetcher
+
+        Args:
+            timeout: Request timeout in seconds
+            max_connections: Total open connections across hosts
+            max_keepalive_connections: Idle connections kept for reuse
+            user_agent: User-Agent header; a random Firefox UA by default
+        """
+        if user_agent is None:
+            user_agent = UserAgent(browsers=['firefox']).random
+
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+            headers={
+                "User-Agent": user_agent,
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+                "Accept-Language": "en-US,en;q=0.9",
+            },
+        )
+
+    async def get(self, url: str, headers: Optional[dict] = None) -> httpx.Response:
+        """GET a URL on a pooled connection"""
+        return await self._client.get(url, headers=headers)
+
+    async def close(self) -> None:
+        """Close pooled connections"""
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "HttpFetcher":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+
+def visible_text_length(html: str) -> int:
+    """Rough length of the text a reader would see in `html`"""
+    text = _SCRIPT_STYLE_RE.sub(" ", html)
+    text = _TAG_RE.sub(" ", text)
+    return len(_WS_RE.sub(" ", text).strip())
+
+
+def needs_browser(response: httpx.Response) -> Optional[str]:
+    """
+    Decide whether a plain-HTTP response must be re-fetched in the browser
 
     Args:
-        url: The URL of the webpage to read.
+        response: Response from the HTTP tier
 
     Returns:
-        The content of the webpage as a Markdown string.
-        Returns an error message if navigation fails.
+        Reason for escalation ("status_403", "empty", "js_shell",
+        "challenge", "content_type"), or None if the response is usable
     """
-    try:
-        async with async_playwright() as p:
-            # Launch a browser. 
-            # IMPORTANT: Changed headless=True to headless=False.
-            # This opens a visible browser window, which is much less likely
-            # to be detected as a bot by services like Cloudflare.
-            browser = await p.firefox.launch(headless=True, args=['--no-sandbox', '--disable-setuid-sandbox'])
-            page = await browser.new_page()
+    if not 200 <= response.status_code < 300:
+        return f"status_{response.status_code}"
+
+    content_type = response.headers.get("content-type", "text/html").lower()
+    if not content_type.startswith(_TEXT_CONTENT_TYPES):
+        return "content_type"
+
+    body = response.text
+    if not body.strip():
+        return "empty"
+
+    if "html" not in content_type:
+        # Plain text, JSON, XML: nothing to render
+        return None
+
+    lowered = body.lower()
+    if any(marker in lowered for marker in _CHALLENGE_MARKERS):
+        return "challenge"
+
+    if visible_text_length(body) < MIN_VISIBLE_TEXT:
+        if "<script" in lowered or any(marker in lowered for marker in _JS_SHELL_MARKERS):
+            return "js_shell"
+        return "empty"
+
+    return None
+
+
+def is_challenge_page(html: str) -> bool:
+    """Check if rendered HTML is a bot challenge rather than the page itself"""
+    lowered = html.lower()
+    return (
+        any(marker in lowered for marker in _CHALLENGE_MARKERS)
+        and visible_text_length(html) < _CHALLENGE_MAX_TEXT
+    )
+
+
+def html_to_markdown(html: str, converter: str = DEFAULT_CONVERTER) -> str:
+    """
+    Convert HTML to Markdown with ATX headings
+
+    Args:
+        html: HTML document
+        converter: "builtin" or "markdownify"
+
+    Returns:
+        Markdown string
+    """
+    if converter == "builtin":
+        return _builtin_markdown(html)
+    if converter == "markdownify":
+        # Imported on first use; BeautifulSoup is slow to import
+        from markdownify import markdownify
+        return markdownify(html, heading_style="ATX")
+    raise ValueError(f"converter must be one of {', '.join(CONVERTERS)}, got {converter!r}")
+
+
+def convert_page(
+    html: str,
+    converter: str = DEFAULT_CONVERTER,
+    extract_main: bool = False,
+) -> tuple[str, Optional[int], Optional[int]]:
+    """
+    Convert a page to Markdown, optionally keeping only its main content
+
+    Args:
+        html: HTML document
+        converter: "builtin" or "markdownify"
+        extract_main: Drop navigation, sidebars, footers and other
+            boilerplate first; the full page is converted when no main
+            content is found (default: False)
+
+    Returns:
+        Tuple of (Markdown, original size, extracted size); the sizes are
+        visible text characters, or None when nothing was extracted
+    """
+    main = None
+    if extract_main:
+        with span("extraction"):
+            main = find_main_content(html)
+
+    with span("conversion", converter=converter):
+        if main is None:
+            return html_to_markdown(html, converter), None, None
+
+        # The built-in converter consumes the parsed tree directly
+        if converter == "builtin":
+            markdown = main.to_markdown()
+        else:
+            markdown = html_to_markdown(main.to_html(), converter)
+    return markdown, main.original_size, main.extracted_size
+
+
+def _variant(converter: str, extract_main: bool) -> str:
+    """Cache variant naming the settings Markdown was produced with"""
+    return converter + MAIN_CONTENT_VARIANT if extract_main else converter
 
-            # Navigate to the URL with a longer timeout to allow for challenges
-            await page.goto(url, timeout=90000)
 
-            # Wait for the page to load completely
-            await page.wait_for_load_state('networkidle')
+def _new_page(
+    url: str,
+    html: str,
+    converter: str,
+    extract_main: bool,
+    content_type: str = "text/html",
+    **kwargs,
+) -> FetchedPage:
+    """Convert freshly fetched HTML into a FetchedPage"""
+    if "html" not in content_type.lower():
+        return FetchedPage(url=url, html=html, markdown=html, **kwargs)
 
-            # wait for 0.5 seconds to ensure the page is fully loaded
-            await asyncio.sleep(0.2)
+    markdown, original_size, extracted_size = convert_page(html, converter, extract_main)
+    return FetchedPage(
+        url=url,
+        html=html,
+        markdown=markdown,
+        original_size=original_size,
+        extracted_size=extracted_size,
+        **kwargs,
+    )
 
-            await page.goto(url.replace("view-source:",""), timeout=30000, wait_until='networkidle')
 
-            # Get the full HTML content of the page
-            html_content = await page.content()
+def _check_readiness(wait_until: str, selector: Optional[str]) -> None:
+    """Validate a readiness strategy"""
+    if wait_until not in READINESS_STRATEGIES:
+        raise ValueError(
+            f"wait_until must be one of {', '.join(READINESS_STRATEGIES)}, got {wait_until!r}"
+        )
+    if wait_until == "selector" and not selector:
+        raise ValueError("selector is required when wait_until is 'selector'")
 
+
+def _remaining_ms(deadline: float) -> int:
+    """Milliseconds left until a time.monotonic() deadline (at least 1)"""
+    return max(1, int((deadline - time.monotonic()) * 1000))
+
+
+async def _load_html(
+    page,
+    url: str,
+    wait_until: str = "load",
+    selector: Optional[str] = None,
+    timeout: int = DEFAULT_TIMEOUT,
+    request_filter: Optional[RequestFilter] = None,
+    collect_links: bool = False,
+    scheduler: Optional[FetchScheduler] = None,
+) -> tuple[str, Optional[RouteStats], Optional[list[str]], str]:
+    """
+    Navigate a page to the URL once and return its HTML
+
+    Args:
+        page: Playwright page to drive
+        url: The URL of the webpage to read
+        wait_until: Readiness strategy (see READINESS_STRATEGIES)
+        selector: CSS selector to wait for when wait_until is "selector"
+        timeout: Navigation/readiness timeout in milliseconds
+        request_filter: Optional filter for the page's network requests
+        collect_links: Also read the link targets from the loaded DOM
+        scheduler: Optional FetchScheduler told about the navigation's status
+
+    Returns:
+        Tuple of (HTML content, request counters or None without a
+        filter, links or None when not collected, URL after redirects)
+
+    Raises:
+        RuntimeError: The navigation got a non-2xx status ("status_403")
+            or the page is a bot challenge ("challenge"); the reason is
+            in the message, as for the HTTP tier
+    """
+    # Older callers prefixed the URL with view-source:, which only caused
+    # a second navigation
+    if url.startswith("view-source:"):
+        url = url[len("view-source:"):]
+
+    stats = await request_filter.attach(page) if request_filter is not None else None
+
+    # Navigation ends when the response starts arriving; the readiness wait
+    # is timed separately but shares the same timeout
+    deadline = time.monotonic() + timeout / 1000
+    with span("navigation") as fields:
+        response = await page.goto(url, timeout=timeout, wait_until="commit")
+        if response is not None:
+            fields["status"] = response.status
+            if scheduler is not None:
+                scheduler.feedback(url, response.status, response.headers.get("retry-after"))
+    if response is not None and not 200 <= response.status < 300:
+        raise RuntimeError(f"Browser tier could not serve {url} (status_{response.status})")
+
+    with span("readiness", wait_until=wait_until):
+        if wait_until == "selector":
+            await page.wait_for_load_state("domcontentloaded", timeout=_remaining_ms(deadline))
+            await page.wait_for_selector(selector, timeout=_remaining_ms(deadline))
+        else:
+            await page.wait_for_load_state(wait_until, timeout=_remaining_ms(deadline))
+
+    # Get the full HTML content of the page
+    with span("content_read"):
+        html = await page.content()
+    if is_challenge_page(html):
+        raise RuntimeError(f"Browser tier could not serve {url} (challenge)")
+
+    links = None
+    if collect_links:
+        # The DOM already resolved every href against the final URL and <base>
+        with span("link_extraction", source="dom"):
+            links = clean_links(await page.eval_on_selector_all("a[href], area[href]", DOM_LINKS_SCRIPT))
+    return html, stats, links, page.url
+
+
+async def _browser_html(
+    url: str,
+    pool: Optional[BrowserPool],
+    wait_until: str,
+    selector: Optional[str],
+    timeout: int,
+    request_filter: Optional[RequestFilter] = None,
+    collect_links: bool = False,
+    scheduler: Optional[FetchScheduler] = None,
+) -> tuple[str, Optional[RouteStats], Optional[list[str]], str]:
+    """Load a URL in a pooled or one-off browser and return its HTML (see _load_html)"""
+    if pool is not None:
+        async with pool.page() as page:
+            return await _load_html(
+                page, url, wait_until, selector, timeout, request_filter, collect_links, scheduler
+            )
+
+    async with async_playwright() as p:
+        # Launch a browser. 
+        # IMPORTANT: Changed headless=True to headless=False.
+        # This opens a visible browser window, which is much less likely
+        # to be detected as a bot by services like Cloudflare.
+        with span("browser_launch", pooled=False):
+            browser = await p.firefox.launch(headless=True, args=['--no-sandbox', '--disable-setuid-sandbox'])
+        try:
+            page = await browser.new_page()
+            return await _load_html(
+                page, url, wait_until, selector, timeout, request_filter, collect_links, scheduler
+            )
+        finally:
             # Close the browser
             await browser.close()
+            gc.collect()  # Force garbage collection
+
+
+async def fetch_page(
+    url: str,
+    pool: Optional[BrowserPool] = None,
+    http: Optional[HttpFetcher] = None,
+    tier: str = "auto",
+    wait_until: str = "load",
+    selector: Optional[str] = None,
+    timeout: int = DEFAULT_TIMEOUT,
+    request_filter: Optional[RequestFilter] = None,
+    cache: Optional[PageCache] = None,
+    converter: str = DEFAULT_CONVERTER,
+    extract_main: bool = False,
+    collect_links: bool = False,
+    scheduler: Optional[FetchScheduler] = None,
+) -> FetchedPage:
+    """
+    Fetch a URL through the cheapest tier that yields usable content
+
+    With tier "auto" a plain HTTP GET is tried first and the page is only
+    loaded in the browser when needs_browser() says rendering is required.
+
+    With a cache, fresh entries are returned without any network access;
+    stale entries carrying ETag/Last-Modified are revalidated with a
+    conditional GET unless tier is "browser".
+
+    Every network request waits for a slot from the scheduler. A 429 or
+    503 HTTP response pauses the host and is retried (up to the
+    scheduler's max_retries) before it counts as a reason to escalate.
+
+    Args:
+        url: The URL of the webpage to read
+        pool: Optional shared BrowserPool; a one-off browser is launched otherwise
+        http: Optional shared HttpFetcher; a one-off client is used otherwise
+        tier: "auto", "http" (never launch a browser) or "browser"
+        wait_until: Browser readiness strategy: "domcontentloaded", "load",
+            "networkidle" or "selector"
+        selector: CSS selector to wait for when wait_until is "selector"
+        timeout: Request/navigation timeout in milliseconds
+        request_filter: Optional filter for browser network requests
+        cache: Optional PageCache consulted before fetching
+        converter: HTML to Markdown converter, "builtin" or "markdownify"
+        extract_main: Convert only the page's main content (see
+            convert_page; default: False)
+        collect_links: Fill FetchedPage.links; browser pages read them from
+            the loaded DOM, other pages from their HTML
+        scheduler: FetchScheduler pacing requests per host (default: one
+            shared by all fetches on the running event loop)
+
+    Returns:
+        FetchedPage recording the content and the tier that served it
+    """
+    if tier not in FETCH_TIERS:
+        raise ValueError(f"tier must be one of {', '.join(FETCH_TIERS)}, got {tier!r}")
+    if converter not in CONVERTERS:
+        raise ValueError(f"converter must be one of {', '.join(CONVERTERS)}, got {converter!r}")
+    _check_readiness(wait_until, selector)
+    variant = _variant(converter, extract_main)
+
+    cached = None
+    if cache is not None:
+        with span("cache_lookup") as fields:
+            cached = await cache.call(cache.get, url)
+            fields["found"] = cached is not None
+    if cached is not None and cached.fresh:
+        return _with_links(_page_from_cache(cached, "hit", converter, extract_main), url, collect_links)
+
+    # A stale entry with validators can be revalidated by the HTTP tier
+    validation = None
+    if cached is not None and cached.revalidatable and tier != "browser":
+        validation = cached.validation_headers()
+
+    if scheduler is None:
+        scheduler = default_scheduler()
 
-            # Convert HTML to Markdown
-            markdown_content = md(html_content, heading_style="ATX")
+    escalation = None
+    if tier in ("auto", "http"):
+        owned = http is None
+        if owned:
+            http = HttpFetcher(timeout=timeout / 1000)
+        try:
+            for attempt in range(scheduler.max_retries + 1):
+                async with scheduler.slot(url):
+                    with span("http_fetch", attempt=attempt) as fields:
+                        response = await http.get(url, headers=validation)
+                        fields["status"] = response.status_code
+                delay = scheduler.feedback(url, response.status_code, response.headers.get("retry-after"))
+                if response.status_code not in BACKOFF_STATUSES or attempt == scheduler.max_retries:
+                    break
+                print(f"[FETCH] {response.status_code} from {url}, retrying in {delay:.1f}s")
+            if response.status_code == 304 and validation:
+                await cache.call(cache.refresh, url)
+                page = _page_from_cache(cached, "revalidated", converter, extract_main)
+                return _with_links(page, url, collect_links)
 
-            return markdown_content
+            escalation = needs_browser(response)
+            if escalation is None:
+                page = _new_page(
+                    url,
+                    response.text,
+                    converter,
+                    extract_main,
+                    content_type=response.headers.get("content-type", "text/html"),
+                    tier="http",
+                    status_code=response.status_code,
+                    final_url=str(response.url),
+                )
+                await _store(
+                    cache, page, variant,
+                    response.headers.get("etag"), response.headers.get("last-modified"),
+                )
+                # Relative links resolve against the URL after redirects
+                return _with_links(page, str(response.url), collect_links)
+        except httpx.HTTPError as e:
+            escalation = f"http_error: {e.__class__.__name__}"
+        finally:
+            if owned:
+                await http.close()
 
+        if tier == "http":
+            raise RuntimeError(f"HTTP tier could not serve {url} ({escalation})")
+        print(f"[FETCH] Escalating to browser: {url} ({escalation})")
+
+    async with scheduler.slot(url):
+        html_content, stats, links, final_url = await _browser_html(
+            url, pool, wait_until, selector, timeout, request_filter, collect_links, scheduler
+        )
+
+    # Convert HTML to Markdown
+    page = _new_page(
+        url,
+        html_content,
+        converter,
+        extract_main,
+        tier="browser",
+        escalation_reason=escalation,
+        blocked_requests=stats.blocked if stats is not None else None,
+        links=links,
+        final_url=final_url,
+    )
+    await _store(cache, page, variant)
+    return page
+
+
+def _with_links(page: FetchedPage, base_url: str, collect_links: bool) -> FetchedPage:
+    """Parse the page's links from its HTML when requested"""
+    if collect_links and page.links is None:
+        with span("link_extraction", source="html"):
+            page.links = extract_links(page.html, base_url)
+    return page
+
+
+def _page_from_cache(
+    entry: CacheEntry,
+    cache_status: str,
+    converter: str,
+    extract_main: bool,
+) -> FetchedPage:
+    """Build a FetchedPage from a cache entry"""
+    # The full HTML is cached, so Markdown produced with other settings is
+    # simply converted again
+    if entry.markdown is None or entry.variant != _variant(converter, extract_main):
+        return _new_page(
+            entry.url, entry.html, converter, extract_main,
+            tier=entry.tier, cache_status=cache_status,
+        )
+
+    return FetchedPage(
+        url=entry.url,
+        html=entry.html,
+        markdown=entry.markdown,
+        tier=entry.tier,
+        cache_status=cache_status,
+    )
+
+
+async def _store(
+    cache: Optional[PageCache],
+    page: FetchedPage,
+    variant: str,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+) -> None:
+    """Store a freshly fetched page and mark it as a cache miss"""
+    if cache is None:
+        return
+    with span("cache_store"):
+        await cache.call(
+            cache.put,
+            page.url,
+            page.html,
+            page.markdown,
+            variant=variant,
+            tier=page.tier,
+            etag=etag,
+            last_modified=last_modified,
+        )
+    page.cache_status = "miss"
+
+
+async def fetch_markdown(
+    url: str,
+    pool: Optional[BrowserPool] = None,
+    wait_until: str = "load",
+    selector: Optional[str] = None,
+    timeout: int = DEFAULT_TIMEOUT,
+    http: Optional[HttpFetcher] = None,
+    tier: str = "auto",
+    request_filter: Optional[RequestFilter] = None,
+    cache: Optional[PageCache] = None,
+    converter: str = DEFAULT_CONVERTER,
+    extract_main: bool = False,
+) -> str:
+    """
+    Fetch a URL with a single navigation and convert it to Markdown
+
+    Unlike get_web_content_as_markdown, errors are raised rather than
+    returned as text, so callers can tell failures from content.
+
+    Args:
+        url: The URL of the webpage to read
+        pool: Optional shared BrowserPool; a one-off browser is launched otherwise
+        wait_until: Readiness strategy: "domcontentloaded", "load",
+            "networkidle" or "selector"
+        selector: CSS selector to wait for when wait_until is "selector"
+        timeout: Navigation/readiness timeout in milliseconds
+        http: Optional shared HttpFetcher for the plain-HTTP tier
+        tier: "auto" (HTTP first, browser if needed), "http" or "browser"
+        request_filter: Optional filter for browser network requests
+        cache: Optional PageCache consulted before fetching
+        converter: HTML to Markdown converter, "builtin" or "markdownify"
+        extract_main: Convert only the page's main content (default:
+            False, the full page is converted)
+
+    Returns:
+        The content of the webpage as a Markdown string
+    """
+    page = await fetch_page(
+        url,
+        pool=pool,
+        http=http,
+        tier=tier,
+        wait_until=wait_until,
+        selector=selector,
+        timeout=timeout,
+        request_filter=request_filter,
+        cache=cache,
+        converter=converter,
+        extract_main=extract_main,
+    )
+    return page.markdown
+
+
+async def get_web_content_as_markdown(
+    url: str,
+    pool: Optional[BrowserPool] = None,
+    wait_until: str = "load",
+    selector: Optional[str] = None,
+    tier: str = "auto",
+    cache: Optional[PageCache] = None,
+    converter: str = DEFAULT_CONVERTER,
+    extract_main: bool = False,
+) -> str:
+    """
+    Fetches the content of a URL using a stealth-configured headless browser
+    and converts the main content to Markdown.
+
+    Static pages are served over plain HTTP when tier is "auto"; pass
+    tier="browser" to always render.
+
+    Args:
+        url: The URL of the webpage to read.
+        pool: Optional shared BrowserPool. When given, the page is served
+            from a warm browser instead of launching a new one.
+        wait_until: Readiness strategy: "domcontentloaded", "load",
+            "networkidle" or "selector"
+        selector: CSS selector to wait for when wait_until is "selector"
+        tier: "auto", "http" or "browser"
+        cache: Optional PageCache consulted before fetching
+        converter: HTML to Markdown converter, "builtin" or "markdownify"
+        extract_main: Convert only the page's main content (default:
+            False, the full page is converted)
+
+    Returns:
+        The content of the webpage as a Markdown string.
+        Returns an error message if navigation fails.
+    """
+    try:
+        return await fetch_markdown(
+            url, pool=pool, wait_until=wait_until, selector=selector, tier=tier, cache=cache,
+            converter=converter, extract_main=extract_main,
+        )
     except Exception as e:
         error_message = f"An error occurred: {e}"
         print(str(error_message)[:100])
         return error_message
-    finally:
-        await browser.close()
-        gc.collect()  # Force garbage collection
 
 
 async def test():
@@ -72,7 +731,7 @@ async def test():
     """
 
     # Get the content and print it
-    markdown_output = await get_web_content_as_markdown("view-source:https://google.com")
+    markdown_output = await get_web_content_as_markdown("https://google.com")
 
     # Optionally, save to a file
     save_to_file = input("Do you want to save this to a file? (y/n): ").lower()
@@ -82,6 +741,19 @@ async def test():
         with open(filename, 'w', encoding='utf-8') as f:
             f.write(markdown_output)
 
-def sync_run(uri):
-    initial_uri = "view-source:"+uri
-    return asyncio.run(get_web_content_as_markdown(initial_uri))
\ No newline at end of file
+def sync_run(
+    uri,
+    wait_until: str = "load",
+    selector: Optional[str] = None,
+    tier: str = "auto",
+    cache: Optional[PageCache] = None,
+    converter: str = DEFAULT_CONVERTER,
+    extract_main: bool = False,
+):
+    """Blocking fetch; inside a running event loop, await fetch_markdown instead"""
+    return asyncio.run(
+        get_web_content_as_markdown(
+            uri, wait_until=wait_until, selector=selector, tier=tier, cache=cache, converter=converter,
+            extract_main=extract_main,
+        )
+    )
@@ -0,0 +1,309 @@
+"""Multi-process worker pool module"""
+
+import asyncio
+import itertools
+import multiprocessing
+import queue
+import sys
+from collections import deque
+from typing import Iterable, Iterator, Optional
+
+from .input_handler import InputHandler, InputType
+from .job_store import JobStore
+from .report_generator import Report
+from .scheduler import FetchScheduler
+
+
+# Seconds between checks for crashed workers while waiting for results
+_POLL_INTERVAL = 0.5
+
+
+def _worker_main(worker_id: int, settings: dict, concurrency: int, tasks, results, jobs: Optional[JobStore]) -> None:
+    """Entry point of a worker process"""
+    # Progress messages go to stderr; the parent owns stdout
+    sys.stdout = sys.stderr
+    asyncio.run(_worker_loop(worker_id, settings, concurrency, tasks, results, jobs))
+
+
+async def _worker_loop(worker_id: int, settings: dict, concurrency: int, tasks, results, jobs: Optional[JobStore]) -> None:
+    """Run tasks from `tasks` on one AsyncClient, `concurrency` at a time"""
+    # Imported here so the parent does not need the orchestrator loaded
+    from .orchestrator import AsyncClient
+
+    settings = dict(settings)
+    job_id = settings.pop("job_id", None)
+    client = AsyncClient(**settings)
+
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(concurrency)
+    running = set()
+
+    async def process(task_id: int, user_input: str, job_index: Optional[int]) -> None:
+        try:
+            checkpoint = None
+            if job_index is not None:
+                checkpoint = await jobs.call(jobs.checkpoint, job_id, job_index)
+            report = await client._process_input(user_input, checkpoint)
+            results.put(("done", worker_id, task_id, report.to_dict()))
+        except Exception as e:
+            results.put(("error", worker_id, task_id, f"{e.__class__.__name__}: {e}"))
+        finally:
+            slots.release()
+
+    try:
+        while True:
+            await slots.acquire()
+            task = await loop.run_in_executor(None, tasks.get)
+            if task is None:
+                break
+            running.add(asyncio.ensure_future(process(*task)))
+            running = {t for t in running if not t.done()}
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+    finally:
+        await client.close()
+
+
+class _Worker:
+    """A worker process and the tasks assigned to it"""
+
+    def __init__(self, worker_id: int, process, tasks):
+        self.worker_id = worker_id
+        self.process = process
+        self.tasks = tasks
+        self.assigned = set()
+
+
+class WorkerPool:
+    """
+    Runs inputs on several worker processes, each with its own browsers
+
+    The parent holds one queue of pending inputs and hands each worker up
+    to `concurrency` of them at a time; every worker drives its own
+    AsyncClient (browser pool, HTTP connections, scheduler) built from
+    the same settings and sends finished reports back, which the parent
+    rebuilds into Report objects. A worker that dies is replaced, and the
+    inputs it held are queued again; an input that brings down
+    `max_attempts` workers is given up and reported as empty.
+
+    Every worker gets the settings' FetchScheduler split `workers` ways
+    (see FetchScheduler.split), so the per-host rate holds for all
+    workers together. Per-host concurrency and bursts are only kept
+    while `workers` does not exceed them; with more workers a host can
+    see one request per worker in flight. `trace_hook` and `report_sink`
+    are not passed on: hooks do not cross process boundaries (timings
+    still arrive with every result) and the parent writes the sink.
+    """
+
+    def __init__(
+        self,
+        settings: dict,
+        workers: int = 2,
+        concurrency: int = 1,
+        max_attempts: int = 2,
+        report_sink=None,
+        jobs: Optional[JobStore] = None,
+        job_id: Optional[str] = None,
+    ):
+        """
+        Initialize worker pool
+
+        Args:
+            settings: AsyncClient keyword arguments; must be picklable
+                (caches and stores are reopened by path in each worker).
+                The scheduler is split between the workers.
+            workers: Number of worker processes
+            concurrency: Inputs each worker processes at once
+            max_attempts: Workers an input may crash before it is given up
+            report_sink: Optional NdjsonReportSink the parent writes every
+                result to
+            jobs: Optional JobStore; workers save attempts to its
+                checkpoints and the parent marks inputs done
+            job_id: Job the inputs belong to (with `jobs`)
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+
+        if settings.get("trace_hook") is not None:
+            print("[WORKERS] trace_hook is not called in worker processes; timings are kept in the results")
+        # Workers pace each host with a share of the limits, so together
+        # they are as polite as one client
+        scheduler = settings.get("scheduler") or FetchScheduler()
+        if workers > scheduler.per_host_concurrency:
+            print(
+                f"[WORKERS] {workers} workers exceed per_host_concurrency={scheduler.per_host_concurrency}; "
+                "a host can see one request per worker in flight"
+            )
+        self.settings = dict(
+            settings,
+            scheduler=scheduler.split(workers),
+            report_sink=None,
+            trace_hook=None,
+            skip_browser_check=True,
+        )
+        if job_id is not None:
+            self.settings["job_id"] = job_id
+        self.workers = workers
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.report_sink = report_sink
+        self.jobs = jobs
+        self.job_id = job_id
+        self.restarts = 0
+
+        # Spawned workers start clean: no inherited event loops, browsers
+        # or driver threads
+        self._context = multiprocessing.get_context("spawn")
+        self._results = None
+        self._workers = {}
+        self._ids = itertools.count()
+
+    def _start_worker(self) -> _Worker:
+        worker_id = next(self._ids)
+        tasks = self._context.Queue()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(worker_id, self.settings, self.concurrency, tasks, self._results, self.jobs),
+            name=f"scrapion-worker-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        worker = self._workers[worker_id] = _Worker(worker_id, process, tasks)
+        return worker
+
+    def run(self, inputs: Iterable) -> Iterator[Report]:
+        """
+        Process inputs on the workers
+
+        Args:
+            inputs: URLs and/or search queries, or (job index, input)
+                pairs when the pool has a job
+
+        Yields:
+            One Report per input, in completion order
+        """
+        pending_inputs = iter(inputs)
+        retry = deque()
+        tasks = {}
+        attempts = {}
+        task_ids = itertools.count()
+
+        self._results = self._context.Queue()
+        for _ in range(self.workers):
+            self._start_worker()
+
+        def next_task():
+            if retry:
+                return retry.popleft()
+            for item in pending_inputs:
+                job_index, user_input = item if isinstance(item, tuple) else (None, item)
+                if user_input.strip():
+                    task_id = next(task_ids)
+                    tasks[task_id] = (user_input, job_index)
+                    attempts[task_id] = 0
+                    return task_id
+            return None
+
+        def fill() -> None:
+            for worker in self._workers.values():
+                while len(worker.assigned) < self.concurrency:
+                    task_id = next_task()
+                    if task_id is None:
+                        return
+                    attempts[task_id] += 1
+                    worker.assigned.add(task_id)
+                    worker.tasks.put((task_id, *tasks[task_id]))
+
+        try:
+            fill()
+            while tasks:
+                try:
+                    message = self._results.get(timeout=_POLL_INTERVAL)
+                except queue.Empty:
+                    message = None
+
+                if message is not None:
+                    kind, worker_id, task_id, payload = message
+                    worker = self._workers.get(worker_id)
+                    if worker is not None:
+                        worker.assigned.discard(task_id)
+                    # Inputs given up on after a crash may still finish
+                    if task_id in tasks:
+                        user_input, job_index = tasks.pop(task_id)
+                        if kind == "done":
+                            report = Report.from_dict(payload, sink=self.report_sink)
+                        else:
+                            print(f"[WORKERS] Failed: {user_input} - {payload}")
+                            if self.jobs is not None:
+                                self.jobs.fail_input(self.job_id, job_index, payload)
+                            report = self._empty_report(user_input)
+                        report.finish()
+                        yield report
+                        if kind == "done" and self.jobs is not None:
+                            self.jobs.finish_input(self.job_id, job_index, report)
+
+                for report in self._replace_dead_workers(tasks, attempts, retry):
+                    yield report
+                fill()
+        finally:
+            # Abandoned inputs (consumer stopped early) are not waited for
+            self.close(wait=not tasks)
+
+    def _replace_dead_workers(self, tasks: dict, attempts: dict, retry: deque) -> Iterator[Report]:
+        """Restart crashed workers, requeueing their inputs or giving them up"""
+        for worker in list(self._workers.values()):
+            if worker.process.is_alive():
+                continue
+            del self._workers[worker.worker_id]
+            self.restarts += 1
+            print(
+                f"[WORKERS] Worker {worker.worker_id} exited with code {worker.process.exitcode}, "
+                f"requeueing {len(worker.assigned)} input(s)"
+            )
+            for task_id in sorted(worker.assigned):
+                if attempts[task_id] < self.max_attempts:
+                    retry.append(task_id)
+                    continue
+                user_input, job_index = tasks.pop(task_id)
+                print(f"[WORKERS] Giving up on {user_input} after {attempts[task_id]} crashed attempt(s)")
+                if self.jobs is not None:
+                    self.jobs.fail_input(self.job_id, job_index, "worker crashed")
+                report = self._empty_report(user_input)
+                report.finish()
+                yield report
+            self._start_worker()
+
+    def _empty_report(self, user_input: str) -> Report:
+        """Build an empty report for an input that could not be processed"""
+        input_type, processed_input = InputHandler.parse_input(user_input)
+        if input_type == InputType.URL:
+            return Report(processed_input, "single_url", 1, sink=self.report_sink)
+        return Report(processed_input, "multi_url", 10, sink=self.report_sink)
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Stop the workers
+
+        Args:
+            wait: Let workers finish their inputs (killing any that do not
+                exit within 10 seconds); False kills them right away
+        """
+        for worker in self._workers.values():
+            if worker.process.is_alive():
+                worker.tasks.put(None)
+        for worker in self._workers.values():
+            worker.process.join(timeout=10 if wait else 0)
+            if worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join()
+        self._workers = {}
+
+    def __enter__(self) -> "WorkerPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -32,9 +32,13 @@ setup(
         "playwright>=1.40.0",
         "fake-useragent>=1.4.0",
         "markdownify>=0.11.0",
+        "httpx>=0.24.0",
         "pyvirtualdisplay>=3.0",
     ],
     extras_require={
+        "zstd": [
+            "zstandard>=0.21",
+        ],
         "dev": [
             "pytest>=7.0",
             "black>=23.0",
@@ -0,0 +1,90 @@
+"""Shared test fixtures"""
+
+import contextlib
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+
+class LocalSite:
+    """
+    Local HTTP server answering from a route table
+
+    `routes` maps a path to (status, body) or (status, body, headers);
+    unknown paths get a 404. `hits` counts requests per path.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.hits = Counter()
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                site.hits[self.path] += 1
+                status, body, *rest = site.routes.get(self.path, (404, "missing"))
+                headers = {"Content-Type": "text/html", **(rest[0] if rest else {})}
+                data = body.encode()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def url(self, path: str) -> str:
+        return self.base + path
+
+
+class _FakePage:
+    """Browser page stand-in that loads URLs over plain HTTP"""
+
+    url = None
+    _html = ""
+
+    async def goto(self, url, **kwargs):
+        async with httpx.AsyncClient() as http:
+            response = await http.get(url)
+        self.url, self._html = url, response.text
+        response.status = response.status_code
+        return response
+
+    async def wait_for_load_state(self, *args, **kwargs):
+        pass
+
+    async def content(self):
+        return self._html
+
+
+class FakeBrowserPool:
+    """BrowserPool stand-in for machines without Playwright's Firefox"""
+
+    def __init__(self):
+        self.pages = 0
+
+    @contextlib.asynccontextmanager
+    async def page(self):
+        self.pages += 1
+        yield _FakePage()
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def local_site():
+    site = LocalSite()
+    thread = threading.Thread(target=site.server.serve_forever, daemon=True)
+    thread.start()
+    yield site
+    site.server.shutdown()
+    site.server.server_close()
@@ -0,0 +1,30 @@
+"""SQLite store regression tests"""
+
+import asyncio
+import pickle
+import threading
+
+from scrapion.cache import PageCache
+
+
+def test_call_runs_off_the_event_loop_thread(tmp_path):
+    cache = PageCache(tmp_path / "cache.db")
+
+    async def roundtrip():
+        await cache.call(cache.put, "https://e.com/", "<p>hi</p>", "hi")
+        thread = await cache.call(threading.get_ident)
+        return await cache.call(cache.get, "https://e.com/"), thread
+
+    entry, thread = asyncio.run(roundtrip())
+    assert entry.markdown == "hi"
+    assert thread != threading.get_ident()
+    cache.close()
+
+
+def test_pickled_store_gets_its_own_thread(tmp_path):
+    cache = PageCache(tmp_path / "cache.db")
+    cache.put("https://e.com/", "<p>hi</p>", "hi")
+    copy = pickle.loads(pickle.dumps(cache))
+    assert asyncio.run(copy.call(copy.get, "https://e.com/")).html == "<p>hi</p>"
+    copy.close()
+    cache.close()
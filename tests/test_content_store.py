@@ -0,0 +1,52 @@
+"""Content store regression tests"""
+
+import gc
+import os
+
+from scrapion.content_store import ContentStore
+from scrapion.report_generator import Report, ScrapeResult
+
+
+def _text(n: int) -> str:
+    # Incompressible enough to exceed a small spill threshold
+    return os.urandom(n).hex()
+
+
+def test_spill_file_is_truncated_when_results_are_released():
+    store = ContentStore(compress_threshold=10, spill_threshold=100)
+    packed = [store.pack(_text(1000)) for _ in range(5)]
+    spill = packed[0].spill
+    assert ContentStore.unpack(packed[3]) and spill.size > 0
+    del packed
+    gc.collect()
+    assert spill.size == 0 and store.spilled_bytes == 0
+
+
+def test_spill_file_rotates_and_retired_file_closes():
+    store = ContentStore(compress_threshold=10, spill_threshold=100, rotate_bytes=1500)
+    first = store.pack(_text(1000))
+    second = store.pack(_text(1000))
+    assert first.spill is not second.spill
+    old = first.spill
+    assert ContentStore.unpack(first)
+    del first
+    gc.collect()
+    assert old.retired and old._file.closed
+
+
+def test_results_streamed_to_a_sink_are_not_packed():
+    class Sink:
+        def write_result(self, query, result):
+            self.storage = result.content_storage
+
+    sink = Sink()
+    Report("q", "single_url", sink=sink).add_success("https://e.com/", "x" * 100000, "single_url")
+    assert sink.storage == "plain"
+    assert ScrapeResult("https://e.com/", "success", True, content="x" * 100000).content_storage != "plain"
+
+
+def test_timestamp_is_naive_utc_and_survives_a_round_trip():
+    result = ScrapeResult("https://e.com/", "success", True)
+    result.created_at = 0.0
+    assert result.timestamp == "1970-01-01T00:00:00"
+    assert ScrapeResult.from_dict(result.to_dict()).created_at == 0.0
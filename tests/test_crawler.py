@@ -0,0 +1,17 @@
+"""Crawl frontier regression tests"""
+
+from scrapion.crawler import Frontier
+
+
+def test_www_prefix_counts_as_seed_host():
+    frontier = Frontier()
+    frontier.add_seed("https://example.com/")
+    assert frontier.add("https://www.example.com/docs", 1)
+
+
+def test_redirect_target_host_is_allowed():
+    frontier = Frontier()
+    frontier.add_seed("https://example.com/")
+    assert not frontier.add("https://example.org/a", 1)
+    frontier.allow_host("https://example.org/")
+    assert frontier.add("https://example.org/a", 1)
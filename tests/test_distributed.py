@@ -0,0 +1,124 @@
+"""Coordinator protocol regression tests"""
+
+import asyncio
+import json
+
+from scrapion import AsyncClient
+from scrapion.distributed import Coordinator, run_worker
+
+
+async def _exchange(port: int, *messages: dict):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for message in messages:
+        writer.write((json.dumps(message) + "\n").encode())
+    await writer.drain()
+    return reader, writer
+
+
+async def _read(reader: asyncio.StreamReader) -> dict:
+    return json.loads(await asyncio.wait_for(reader.readline(), 5))
+
+
+def _result(task: dict) -> bytes:
+    return (json.dumps({
+        "type": "result",
+        "id": task["id"],
+        "result": {"url": task["url"], "status": "Success", "accessible": True},
+    }) + "\n").encode()
+
+
+async def _run_coordinator(worker, inputs=("https://example.com/",), **options) -> list:
+    coordinator = Coordinator("127.0.0.1", 0, token="secret", **options)
+    reports = []
+
+    async def collect():
+        async for report in coordinator.run(inputs):
+            reports.append(report)
+
+    collector = asyncio.ensure_future(collect())
+    while coordinator.port == 0:
+        await asyncio.sleep(0.01)
+    await worker(coordinator.port)
+    await asyncio.wait_for(collector, 5)
+    return reports
+
+
+def test_wrong_token_is_denied():
+    async def worker(port):
+        reader, writer = await _exchange(port, {"type": "hello", "token": "nope"})
+        assert (await _read(reader))["type"] == "denied"
+        writer.close()
+        reader, writer = await _exchange(port, {"type": "hello", "token": "secret"})
+        assert (await _read(reader))["type"] == "welcome"
+        task = await _read(reader)
+        writer.write(_result(task))
+
+    assert len(asyncio.run(_run_coordinator(worker))) == 1
+
+
+def test_malformed_messages_are_answered_and_task_retried():
+    async def worker(port):
+        reader, writer = await _exchange(port, {"type": "hello", "token": "secret", "capacity": 1})
+        assert (await _read(reader))["type"] == "welcome"
+        task = await _read(reader)
+
+        writer.write(b"not json\n")
+        assert (await _read(reader))["type"] == "invalid"
+        writer.write(b'{"type": "result"}\n')
+        assert (await _read(reader))["type"] == "invalid"
+
+        # A partial result is rejected and the task handed out again
+        writer.write((json.dumps({"type": "result", "id": task["id"], "result": {"url": 1}}) + "\n").encode())
+        assert (await _read(reader))["type"] == "invalid"
+        retried = await _read(reader)
+        assert retried["type"] == "task" and retried["url"] == task["url"]
+
+        writer.write(_result(retried))
+
+    reports = asyncio.run(_run_coordinator(worker))
+    assert reports[0].successful_scrapes == 1
+
+
+def test_expired_lease_moves_task_to_another_worker():
+    async def worker(port):
+        silent, silent_writer = await _exchange(port, {"type": "hello", "token": "secret", "name": "silent"})
+        assert (await _read(silent))["type"] == "welcome"
+        task = await _read(silent)
+
+        other, other_writer = await _exchange(port, {"type": "hello", "token": "secret", "name": "other"})
+        assert (await _read(other))["type"] == "welcome"
+        assert await _read(silent) == {"type": "cancel", "id": task["id"]}
+        retried = await _read(other)
+        assert retried["url"] == task["url"] and retried["id"] == task["id"]
+        other_writer.write(_result(retried))
+
+    reports = asyncio.run(_run_coordinator(worker, lease_seconds=0.4))
+    assert reports[0].successful_scrapes == 1
+
+
+def test_heartbeats_renew_the_lease():
+    async def worker(port):
+        reader, writer = await _exchange(port, {"type": "hello", "token": "secret"})
+        assert (await _read(reader))["type"] == "welcome"
+        task = await _read(reader)
+        for _ in range(8):
+            await asyncio.sleep(0.1)
+            writer.write(b'{"type": "heartbeat"}\n')
+        writer.write(_result(task))
+        assert (await _read(reader))["type"] == "shutdown"
+
+    reports = asyncio.run(_run_coordinator(worker, lease_seconds=0.4))
+    assert reports[0].successful_scrapes == 1
+
+
+def test_run_worker_scrapes_with_the_token(local_site):
+    local_site.routes["/page"] = (200, "<html><body><p>" + "Readable text. " * 40 + "</p></body></html>")
+
+    async def worker(port):
+        assert await run_worker(None, f"127.0.0.1:{port}", token="wrong") == 0
+        async with AsyncClient(skip_browser_check=True, fetch_tier="http") as client:
+            assert await run_worker(client, f"127.0.0.1:{port}", token="secret") == 1
+
+    reports = asyncio.run(_run_coordinator(worker, inputs=[local_site.url("/page")]))
+    assert reports[0].successful_scrapes == 1
+    assert local_site.hits["/page"] == 1
@@ -0,0 +1,53 @@
+"""Host statistics and adaptive ordering regression tests"""
+
+import asyncio
+
+from scrapion import AsyncClient
+from scrapion.host_stats import AdaptiveOrdering, HostStatsStore
+
+from conftest import FakeBrowserPool
+
+CHALLENGE = "<html><head><title>Just a moment...</title></head><body>Checking</body></html>"
+
+
+def _attempts_and_blocks(store, site, path):
+    site.routes.update({
+        "/blocked": (403, "<html><body>Forbidden</body></html>"),
+        "/challenge": (200, CHALLENGE),
+    })
+
+    async def run():
+        async with AsyncClient(skip_browser_check=True, block_requests=False, host_stats=store) as client:
+            client.pool = FakeBrowserPool()
+            return await client.run(site.url(path))
+
+    report = asyncio.run(run())
+    assert report.successful_scrapes == 0
+    stat = store.get("127.0.0.1")
+    return stat.attempts, stat.blocked
+
+
+def test_browser_tier_403_is_recorded_as_blocked(local_site, tmp_path):
+    store = HostStatsStore(tmp_path / "stats.db")
+    assert _attempts_and_blocks(store, local_site, "/blocked") == (1, 1)
+    store.close()
+
+
+def test_browser_tier_challenge_page_is_recorded_as_blocked(local_site, tmp_path):
+    store = HostStatsStore(tmp_path / "stats.db")
+    assert _attempts_and_blocks(store, local_site, "/challenge") == (1, 1)
+    store.close()
+
+
+def test_loaded_ordering_matches_direct_ordering(tmp_path):
+    store = HostStatsStore(tmp_path / "stats.db")
+    for _ in range(3):
+        store.record("https://blocky.com/", "blocked", 1.0)
+        store.record("https://fine.com/", "success", 1.0)
+    urls = ["https://blocky.com/a", "https://new.com/b", "https://fine.com/c"]
+    ordering = AdaptiveOrdering(store)
+
+    loaded = asyncio.run(ordering.load(urls))
+    assert loaded(urls) == ordering(urls)
+    assert loaded(urls)[-1] == "https://blocky.com/a"
+    store.close()
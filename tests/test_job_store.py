@@ -0,0 +1,45 @@
+"""Job store and resume regression tests"""
+
+import asyncio
+
+from scrapion import AsyncClient, JobStore
+from scrapion.report_generator import ScrapeResult
+
+PAGE = "<html><body><h1>Page</h1><p>" + "Readable text. " * 40 + "</p></body></html>"
+
+
+def test_only_successes_are_restored(tmp_path):
+    jobs = JobStore(tmp_path / "jobs.db")
+    job_id = jobs.create_job(["query"])
+    checkpoint = jobs.checkpoint(job_id, 0)
+    checkpoint.save(ScrapeResult("https://e.com/bad", "timeout", False))
+    checkpoint.save(ScrapeResult("https://e.com/good", "success", True, content="hi"))
+
+    reloaded = jobs.checkpoint(job_id, 0)
+    assert reloaded.restore("https://e.com/bad") is None
+    assert reloaded.restore("https://e.com/good").content == "hi"
+    jobs.close()
+
+
+def test_resume_refetches_failed_urls(local_site, tmp_path):
+    local_site.routes["/page"] = (200, PAGE)
+    url = local_site.url("/page")
+    jobs = JobStore(tmp_path / "jobs.db")
+    job_id = jobs.create_job([url])
+    jobs.checkpoint(job_id, 0).save(ScrapeResult(url, "failed", False))
+
+    async def run():
+        async with AsyncClient(skip_browser_check=True, fetch_tier="http") as client:
+            return [report async for report in client.run_job(jobs, job_id)]
+
+    reports = asyncio.run(run())
+    assert reports[0].successful_scrapes == 1
+    assert local_site.hits["/page"] == 1
+    assert jobs.get_job(job_id)["inputs"]["done"] == 1
+
+    # A stored success is restored, not fetched again
+    jobs._set_state(job_id, 0, "pending")
+    reports = asyncio.run(run())
+    assert reports[0].successful_scrapes == 1
+    assert local_site.hits["/page"] == 1
+    jobs.close()
@@ -0,0 +1,17 @@
+"""Link extraction regression tests"""
+
+from scrapion.link_extractor import clean_links, extract_links
+
+
+def test_malformed_href_is_skipped():
+    html = '<a href="http://[oops/x">x</a><a href="/ok">ok</a>'
+    assert extract_links(html, "https://e.com/") == ["https://e.com/ok"]
+
+
+def test_malformed_base_href_falls_back_to_page_url():
+    html = '<base href="http://[bad"><a href="/ok">ok</a>'
+    assert extract_links(html, "https://e.com/") == ["https://e.com/ok"]
+
+
+def test_clean_links_skips_malformed_urls():
+    assert clean_links(["http://[oops/x", "https://e.com/a#top"]) == ["https://e.com/a"]
@@ -0,0 +1,41 @@
+"""NDJSON report sink regression tests"""
+
+import pytest
+
+from scrapion.report_generator import Report, ScrapeResult
+from scrapion.report_sink import NdjsonReportSink, read_ndjson
+
+
+def _write_run(path, results=50):
+    with NdjsonReportSink(path, batch_size=7) as sink:
+        for i in range(results):
+            sink.write_result("query", ScrapeResult(f"https://e.com/{i}", "success", True, content="x" * i))
+
+
+def test_finished_report_is_flushed(tmp_path):
+    path = tmp_path / "results.ndjson"
+    sink = NdjsonReportSink(path, batch_size=100, flush_interval=3600)
+    report = Report("https://e.com/", "single_url", 1, sink=sink)
+    report.add_result(ScrapeResult("https://e.com/", "success", True, content="hi"))
+    assert list(read_ndjson(path)) == []
+
+    report.finish()
+    assert [record["type"] for record in read_ndjson(path)] == ["result", "report"]
+    sink.close()
+
+
+@pytest.mark.parametrize("suffix", [".gz", ".zst"])
+def test_truncated_compressed_file_is_read_up_to_the_cut(tmp_path, suffix):
+    if suffix == ".zst":
+        pytest.importorskip("zstandard")
+    path = tmp_path / f"results.ndjson{suffix}"
+    _write_run(path)
+    data = path.read_bytes()
+    assert len(list(read_ndjson(path))) == 51
+
+    cut = tmp_path / f"cut.ndjson{suffix}"
+    for size in range(1, len(data)):
+        cut.write_bytes(data[:size])
+        records = list(read_ndjson(cut))
+        assert len(records) <= 51
+        assert all(record["type"] == "result" for record in records[:50])
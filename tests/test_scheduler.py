@@ -0,0 +1,97 @@
+"""Fetch scheduler regression tests"""
+
+import asyncio
+import time
+
+import pytest
+
+from scrapion.scheduler import FetchScheduler, parse_retry_after
+from scrapion.web_access import fetch_page
+
+
+def test_token_bucket_allows_burst_then_paces():
+    scheduler = FetchScheduler(rate=20, burst=2, per_host_concurrency=10)
+
+    async def run():
+        start = time.monotonic()
+
+        async def fetch():
+            async with scheduler.slot("https://a.example/"):
+                return time.monotonic() - start
+
+        return sorted(await asyncio.gather(*(fetch() for _ in range(4))))
+
+    waits = asyncio.run(run())
+    assert waits[1] < 0.03
+    assert waits[2] >= 0.04
+    assert waits[3] >= 0.09
+
+
+def test_waiting_hosts_are_served_round_robin():
+    scheduler = FetchScheduler(rate=0, global_concurrency=1)
+    order = []
+
+    async def fetch(url):
+        async with scheduler.slot(url) as host:
+            order.append(host)
+
+    async def run():
+        blocker = await scheduler.acquire("https://c.example/")
+        urls = ["https://a.example/1", "https://a.example/2", "https://a.example/3", "https://b.example/"]
+        tasks = [asyncio.create_task(fetch(url)) for url in urls]
+        await asyncio.sleep(0)
+        scheduler.release(blocker)
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+    assert order == ["a.example", "b.example", "a.example", "a.example"]
+
+
+def test_retry_after_pauses_host():
+    scheduler = FetchScheduler(backoff_base=0.01)
+    assert scheduler.feedback("https://a.example/", 429, "1") >= 1
+    assert scheduler.get_stats()["paused_hosts"] == ["a.example"]
+
+    async def acquire(url):
+        return await asyncio.wait_for(scheduler.acquire(url), 0.2)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(acquire("https://a.example/"))
+    assert asyncio.run(acquire("https://b.example/")) == "b.example"
+
+
+def test_backoff_doubles_and_resets_on_success():
+    scheduler = FetchScheduler(backoff_base=0.1)
+    first = scheduler.feedback("https://a.example/", 503)
+    second = scheduler.feedback("https://a.example/", 503)
+    assert 0.08 <= first <= 0.12
+    assert 0.16 <= second <= 0.24
+    assert scheduler.feedback("https://a.example/", 200) is None
+    assert scheduler.feedback("https://a.example/", 503) <= 0.12
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("7") == 7
+    assert parse_retry_after("Thu, 01 Jan 1970 00:00:00 GMT") == 0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_fetch_retries_backoff_statuses(local_site):
+    local_site.routes["/busy"] = (503, "<html><body>Busy</body></html>", {"Retry-After": "0"})
+    scheduler = FetchScheduler(backoff_base=0.05, max_retries=2)
+    with pytest.raises(RuntimeError, match="status_503"):
+        asyncio.run(fetch_page(local_site.url("/busy"), tier="http", scheduler=scheduler))
+    assert local_site.hits["/busy"] == 3
+
+
+def test_split_divides_per_host_limits():
+    scheduler = FetchScheduler(rate=2, burst=4, per_host_concurrency=4)
+    scheduler.set_host_limits("slow.example", rate=1, burst=2, concurrency=2)
+    part = scheduler.split(2)
+    assert (part.rate, part.burst, part.per_host_concurrency) == (1, 2, 2)
+    assert part._overrides["slow.example"] == (0.5, 1, 1)
+
+    # Shares never drop below one slot, even with more parts than slots
+    part = scheduler.split(8)
+    assert (part.rate, part.burst, part.per_host_concurrency) == (0.25, 1, 1)
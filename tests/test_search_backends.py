@@ -0,0 +1,86 @@
+"""Search backend merge regression tests"""
+
+import asyncio
+import time
+
+import pytest
+
+from scrapion.cache import SearchCache
+from scrapion.search_engine import SearchBackend, merge_results, search_backends
+
+
+def _result(link, position=1):
+    return {"title": link, "link": link, "snippet": "", "page_number": 1, "position": position}
+
+
+class FakeBackend(SearchBackend):
+    def __init__(self, links=(), delay=0.0, error=None, **kwargs):
+        super().__init__(**kwargs)
+        self.links = list(links)
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def search(self, query, pages_to_navigate=1):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return [_result(link, i) for i, link in enumerate(self.links, 1)]
+
+
+def test_merge_deduplicates_and_ranks_shared_links_first():
+    merged = merge_results(
+        [
+            [_result("https://a.com/"), _result("https://b.com/")],
+            [
+                _result("https://duckduckgo.com/l/?uddg=https%3A%2F%2Fb.com%2F&rut=x"),
+                _result("https://c.com/"),
+            ],
+        ],
+        ["one", "two"],
+    )
+    assert [r["link"] for r in merged] == ["https://b.com/", "https://a.com/", "https://c.com/"]
+    assert merged[0]["backends"] == ["one", "two"]
+    assert [r["position"] for r in merged] == [1, 2, 3]
+
+
+def test_slow_and_failing_backends_are_dropped():
+    backends = [
+        FakeBackend(["https://a.com/"], name="good"),
+        FakeBackend(["https://slow.com/"], delay=5, timeout=0.1, name="slow"),
+        FakeBackend(error=RuntimeError("boom"), name="broken"),
+    ]
+    start = time.monotonic()
+    merged = asyncio.run(search_backends("query", backends))
+    assert time.monotonic() - start < 2
+    assert [r["link"] for r in merged] == ["https://a.com/"]
+    assert merged[0]["backends"] == ["good"]
+
+
+def test_all_backends_failing_yields_no_results():
+    merged = asyncio.run(search_backends("query", [FakeBackend(error=ValueError("x"))]))
+    assert merged == []
+
+
+def test_cache_is_kept_per_backend_set(tmp_path):
+    cache = SearchCache(tmp_path / "cache.db")
+    first = FakeBackend(["https://a.com/"], name="first")
+    second = FakeBackend(["https://b.com/"], name="second")
+
+    async def search(backends):
+        return [r["link"] for r in await search_backends("query", backends, cache=cache)]
+
+    assert asyncio.run(search([first])) == ["https://a.com/"]
+    assert asyncio.run(search([second])) == ["https://b.com/"]
+    assert asyncio.run(search([first])) == ["https://a.com/"]
+    assert first.calls == 1 and second.calls == 1
+    cache.close()
+
+
+def test_backend_without_search_cannot_be_created():
+    class Incomplete(SearchBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
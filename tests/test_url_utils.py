@@ -0,0 +1,26 @@
+"""URL normalization regression tests"""
+
+from urllib.parse import urlsplit
+
+from scrapion.url_utils import canonicalize_url, normalize_url, remove_dot_segments
+
+
+def test_ipv6_literal_keeps_brackets():
+    assert normalize_url("http://[::1]:8080/a") == "http://[::1]:8080/a"
+    assert canonicalize_url("http://[::1]:80/a") == "http://[::1]/a"
+    assert urlsplit(canonicalize_url("http://[::1]:8080/a")).port == 8080
+
+
+def test_userinfo_is_kept():
+    assert canonicalize_url("https://user:pw@Example.com:443/a") == "https://user:pw@example.com/a"
+
+
+def test_empty_segments_are_kept():
+    assert canonicalize_url("https://example.com/a//b") == "https://example.com/a//b"
+
+
+def test_dot_segments_are_resolved():
+    assert canonicalize_url("https://example.com/a/./b/../c/") == "https://example.com/a/c/"
+    assert remove_dot_segments("/a/b/c/./../../g") == "/a/g"
+    assert remove_dot_segments("mid/content=5/../6") == "mid/6"
+    assert remove_dot_segments("/../a") == "/a"
@@ -0,0 +1,72 @@
+"""Fetch tier regression tests"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from scrapion.web_access import fetch_page, needs_browser
+
+from conftest import FakeBrowserPool
+
+ARTICLE = "<html><body><h1>Article</h1><p>" + "Readable text. " * 40 + "</p></body></html>"
+JS_SHELL = '<html><body><div id="root"></div><script src="/app.js"></script></body></html>'
+CHALLENGE = "<html><head><title>Just a moment...</title></head><body>" + "x " * 200 + "</body></html>"
+
+
+def _response(status=200, body=ARTICLE, content_type="text/html"):
+    return httpx.Response(status, text=body, headers={"content-type": content_type})
+
+
+@pytest.mark.parametrize("response, reason", [
+    (_response(), None),
+    (_response(body="plain text", content_type="text/plain"), None),
+    (_response(403), "status_403"),
+    (_response(503), "status_503"),
+    (_response(body="   "), "empty"),
+    (_response(body="<html><body><p>Hi</p></body></html>"), "empty"),
+    (_response(body=JS_SHELL), "js_shell"),
+    (_response(body=CHALLENGE), "challenge"),
+    (_response(content_type="image/png"), "content_type"),
+])
+def test_needs_browser(response, reason):
+    assert needs_browser(response) == reason
+
+
+def _fetch(url, **kwargs):
+    return asyncio.run(fetch_page(url, **kwargs))
+
+
+def test_static_page_is_served_over_http(local_site):
+    local_site.routes["/article"] = (200, ARTICLE)
+    pool = FakeBrowserPool()
+    page = _fetch(local_site.url("/article"), pool=pool)
+    assert page.tier == "http"
+    assert page.status_code == 200
+    assert "Readable text." in page.markdown
+    assert pool.pages == 0
+
+
+def test_js_shell_escalates_to_browser(local_site):
+    local_site.routes["/app"] = (200, JS_SHELL)
+    pool = FakeBrowserPool()
+    page = _fetch(local_site.url("/app"), pool=pool)
+    assert page.tier == "browser"
+    assert page.escalation_reason == "js_shell"
+    assert pool.pages == 1
+
+
+def test_http_tier_does_not_escalate(local_site):
+    local_site.routes["/forbidden"] = (403, ARTICLE)
+    pool = FakeBrowserPool()
+    with pytest.raises(RuntimeError, match="status_403"):
+        _fetch(local_site.url("/forbidden"), pool=pool, tier="http")
+    assert pool.pages == 0
+
+
+def test_browser_tier_skips_http(local_site):
+    local_site.routes["/article"] = (200, ARTICLE)
+    pool = FakeBrowserPool()
+    page = _fetch(local_site.url("/article"), pool=pool, tier="browser")
+    assert page.tier == "browser"
+    assert local_site.hits["/article"] == 1